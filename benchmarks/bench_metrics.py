@@ -0,0 +1,57 @@
+# Throughput of each color matching metric on a synthetic 2048x2048 photo-like image
+# Usage: python benchmarks/bench_metrics.py [--size 2048] [--shade] [--repeat 3]
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pixelart import base_colors, extended_colors, quantize_image  # noqa: E402
+from pixelart.lut import load_lut  # noqa: E402
+from pixelart.quantize import METRICS, get_matcher  # noqa: E402
+
+
+# Smooth gradients plus noise: many distinct colors, like a photo
+def photo_like(size, seed=0):
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size] / size
+    rgb = np.stack([np.sin(x * 6) * 0.5 + 0.5, y, (x + y) / 2], axis=-1) * 255
+    rgb += rng.normal(0, 12, rgb.shape)
+    rgba = np.empty((size, size, 4), dtype=np.uint8)
+    rgba[..., :3] = np.clip(rgb, 0, 255)
+    rgba[..., 3] = 255
+    return rgba
+
+
+def best_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the color matching metrics")
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--shade", action="store_true", help="use extended_colors instead of base_colors")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    palette = extended_colors if args.shade else base_colors
+    img = photo_like(args.size)
+    pixels = args.size * args.size
+    print(f"{args.size}x{args.size}, {len(palette)} colors, best of {args.repeat}")
+    print(f"{'metric':<10} {'direct s':>9} {'Mpx/s':>7} {'lut s':>7} {'Mpx/s':>7}")
+    for metric in METRICS:
+        get_matcher(palette, metric)  # Palette conversion is a one-off, not part of the measurement
+        direct = best_time(lambda: quantize_image(img, palette, metric=metric), args.repeat)
+        lut = load_lut(palette, metric=metric)  # Built on first use, not timed
+        gather = best_time(lambda: quantize_image(img, palette, lut=lut), args.repeat)
+        print(f"{metric:<10} {direct:>9.3f} {pixels / direct / 1e6:>7.1f} {gather:>7.3f} {pixels / gather / 1e6:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
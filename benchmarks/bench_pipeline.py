@@ -0,0 +1,174 @@
+# Per-stage time and peak memory of the conversion pipeline on deterministic synthetic images
+# Usage: python benchmarks/bench_pipeline.py [--sizes 64,256,1024,4096] [--inputs photo,noise] [--repeat 3]
+#                                             [--output results.json] [--baseline old.json --threshold 0.2]
+# Sizes are output sizes; every source image is 1.5x larger so the resize stage does real work.
+# Exits with status 1 when a stage is slower (or needs more memory) than the baseline by more than
+# the threshold.
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pixelart import base_colors, extended_colors  # noqa: E402
+from pixelart.convert import ConvertResult, fill_transparent, open_rgba, resize_image, save_outputs  # noqa: E402
+from pixelart.lut import load_lut  # noqa: E402
+from pixelart.quantize import quantize_image  # noqa: E402
+from pixelart.schematic import create_schematic_from_idx_matrix  # noqa: E402
+
+INPUTS = ("gradient", "noise", "photo", "pixelart", "transparent")
+SIZES = (64, 256, 1024, 4096)
+STAGES = ("decode", "resize", "fill", "quantize_base", "quantize_extended", "png", "schematic")
+MIN_SECONDS = 0.005  # Differences below this are timer noise, never reported as regressions
+MIN_BYTES = 1 << 20  # Same for peak memory
+
+
+# Deterministic synthetic source image of the given kind, as (size, size, 4) uint8 RGBA
+def synthetic_image(kind, size, seed=0):
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size] / size
+    rgba = np.empty((size, size, 4), dtype=np.uint8)
+    rgba[..., 3] = 255
+    if kind == "gradient":
+        rgb = np.stack([x, y, 1 - x], axis=-1) * 255
+    elif kind == "noise":
+        rgb = rng.integers(0, 256, (size, size, 3))
+    elif kind in ("photo", "transparent"):
+        rgb = np.stack([np.sin(x * 6) * 0.5 + 0.5, y, (x + y) / 2], axis=-1) * 255
+        rgb = rgb + rng.normal(0, 12, rgb.shape)
+    elif kind == "pixelart":
+        colors = rng.integers(0, 256, (8, 3))  # Flat 8-color blocks
+        cells = rng.integers(0, 8, (-(-size // 16), -(-size // 16)))
+        rgb = colors[np.kron(cells, np.ones((16, 16), dtype=np.int64))[:size, :size]]
+    else:
+        raise ValueError(f"Unknown input kind {kind!r}")
+    rgba[..., :3] = np.clip(rgb, 0, 255)
+    if kind == "transparent":
+        rgba[..., 3] = np.where(np.hypot(x - 0.5, y - 0.5) < 0.35, 255, 0)  # Opaque disc, 60% transparent
+    return rgba
+
+
+# PNG-encoded source for one benchmark case (decoding it is the first stage)
+def encode_png(rgba):
+    buffer = io.BytesIO()
+    Image.fromarray(rgba, 'RGBA').save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+# Stage functions for one input, each taking the previous stage's output
+def make_stages(png_bytes, size, output_dir):
+    luts = {id(base_colors): load_lut(base_colors), id(extended_colors): load_lut(extended_colors)}
+    png_path = os.path.join(output_dir, "bench.png")
+    return [
+        ("decode", lambda _: open_rgba(Image.open(io.BytesIO(png_bytes))).copy()),  # copy() forces the decode
+        ("resize", lambda img: resize_image(img, size, size, crop=False)),
+        ("fill", lambda img: fill_transparent(img, "#ffffff")),
+        ("quantize_base", lambda img: (img, quantize_image(img, base_colors, lut=luts[id(base_colors)]))),
+        ("quantize_extended", lambda prev: (prev[0], prev[1],
+                                            quantize_image(prev[0], extended_colors, lut=luts[id(extended_colors)]))),
+        ("png", lambda prev: save_outputs(ConvertResult(idx=prev[2], palette=extended_colors), png_path).idx),
+        ("schematic", lambda idx: create_schematic_from_idx_matrix(idx, png_path, "bench", palette=extended_colors)),
+    ]
+
+
+# Run every stage once, returning per-stage seconds (and tracemalloc peaks when trace is set)
+def run_once(stages, trace=False):
+    seconds, peaks = {}, {}
+    value = None
+    for name, fn in stages:
+        if trace:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        value = fn(value)
+        seconds[name] = time.perf_counter() - start
+        if trace:
+            peaks[name] = tracemalloc.get_traced_memory()[1] - before
+    return seconds, peaks
+
+
+# Best-of-repeat timings, then one traced run for peak memory (tracing slows the code down, so it is
+# never part of the timed runs). NumPy reports its buffers to tracemalloc; PIL's do not, so PIL-only
+# stages show only their NumPy/Python allocations.
+def bench_case(kind, size, repeat, output_dir):
+    png_bytes = encode_png(synthetic_image(kind, size * 3 // 2))
+    stages = make_stages(png_bytes, size, output_dir)
+    best = {}
+    for _ in range(repeat):
+        seconds, _ = run_once(stages)
+        for name, value in seconds.items():
+            best[name] = min(best.get(name, value), value)
+    tracemalloc.start()
+    try:
+        _, peaks = run_once(stages, trace=True)
+    finally:
+        tracemalloc.stop()
+    return {name: {"seconds": best[name], "peak_bytes": peaks[name]} for name in best}
+
+
+# Stages of results that regressed against baseline: [(key, metric, old, new)]
+def compare(results, baseline, threshold):
+    regressions = []
+    for key, stage in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        for metric, floor in (("seconds", MIN_SECONDS), ("peak_bytes", MIN_BYTES)):
+            if stage[metric] > old[metric] * (1 + threshold) and stage[metric] - old[metric] > floor:
+                regressions.append((key, metric, old[metric], stage[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the conversion pipeline")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated output sizes")
+    parser.add_argument("--inputs", default=",".join(INPUTS), help="comma-separated synthetic input kinds")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    parser.add_argument("--output", help="write the JSON results to this file (default: stdout)")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%% (default)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for size in map(int, args.sizes.split(",")):
+            for kind in args.inputs.split(","):
+                for stage, values in bench_case(kind, size, args.repeat, output_dir).items():
+                    results[f"{kind}/{size}/{stage}"] = values
+                print(f"{kind} {size}x{size}: " + ", ".join(
+                    f"{stage} {results[f'{kind}/{size}/{stage}']['seconds'] * 1000:.1f}ms" for stage in STAGES),
+                    file=sys.stderr)
+
+    report = {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+                 "platform": platform.platform(), "repeat": args.repeat},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for key, metric, old, new in regressions:
+            print(f"REGRESSION {key} {metric}: {old:.4g} -> {new:.4g} ({new / old - 1:+.0%})", file=sys.stderr)
+        print(f"{len(regressions)} regression(s) against {args.baseline} (threshold {args.threshold:.0%})",
+              file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
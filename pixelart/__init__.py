@@ -0,0 +1,39 @@
+# Minecraft pixel art conversion engine shared by the English and Korean front ends (it imports nothing GUI-related)
+import importlib  # For importing the lazily exported modules
+from .palettes import base_colors, extended_colors
+from .blocks import get_block_mapping
+from .compiled import CompiledPalette, compile_palette
+from .quantize import METRICS, quantize_image
+from .dither import DITHER_METHODS, dither_image
+from .schematic import create_schematic_from_idx_matrix
+from .convert import ConversionCancelled, ConvertOptions, ConvertResult, convert, output_names
+from .filters import BLOCK_CATEGORIES, filter_palette
+
+# Names imported from their module on first access (PEP 562), so a plain conversion never loads the
+# tiling, world, animation, cache, server or watch code
+_LAZY_EXPORTS = {
+    "convert_streaming": "streaming",
+    "TiledResult": "tiles",
+    "convert_tiled": "tiles",
+    "WorldStats": "anvil",
+    "write_to_world": "anvil",
+    "AnimationResult": "animation",
+    "convert_animation": "animation",
+    "ResultCache": "resultcache",
+    "ConversionServer": "server",
+    "watch_folder": "watch",
+    "ImageCache": "imagecache",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # Later accesses skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
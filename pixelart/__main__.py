@@ -0,0 +1,5 @@
+# Command-line entry point: python -m pixelart <images or folders> -o <output folder>
+import sys
+from .cli import main
+
+sys.exit(main())
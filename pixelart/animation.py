@@ -0,0 +1,165 @@
+import os  # OS-related functions (path handling, etc.)
+from dataclasses import dataclass, field
+import numpy as np  # Import NumPy for array and numerical calculations
+from PIL import Image, ImageSequence  # Import library for image processing (and animation frames)
+from .atomic import atomic_path
+from .commands import create_mcfunction_from_idx_matrix
+from .convert import (ConvertOptions, fill_transparent, open_rgba, options_palette, render_image, resize_image,
+                      target_size)
+from .dither import DIFFUSION_KERNELS, dither_image, dither_pixels
+from .instrument import span
+from .lut import load_lut
+from .schematic import create_schematic_from_idx_matrix
+from .tiles import write_manifest
+
+ANIMATION_VERSION = 1  # Version of the animation manifest
+
+
+# Output of an animation conversion
+@dataclass
+class AnimationResult:
+    manifest_path: str  # JSON manifest listing every frame
+    frames: list  # Manifest entries, one per frame
+    palette: list  # Palette the frames' indices refer to
+    schematic_path: str = None  # All frames stacked as layers (layered=True), if written
+    pixels: int = 0  # Pixels of all frames together
+    requantized: int = 0  # Pixels that had to be quantized (the first frame and every changed pixel)
+    timings: dict = field(default_factory=dict)  # Seconds spent per stage
+
+
+# File name stem of one frame
+def frame_name(name, number):
+    return f"{name}_f{number:04d}"
+
+
+# Frames of an animated image file or PIL image (GIF, APNG, animated WebP), or of a list of still images
+# or paths, as (RGBA image, duration in milliseconds or None) pairs
+def iter_frames(source):
+    if isinstance(source, (list, tuple)):
+        for item in source:
+            img = open_rgba(item)
+            yield img, img.info.get("duration")
+        return
+    img = source if isinstance(source, Image.Image) else Image.open(source)
+    for frame in ImageSequence.Iterator(img):
+        yield frame.convert("RGBA"), frame.info.get("duration")
+
+
+# Number of frames iter_frames(source) yields
+def frame_count(source):
+    if isinstance(source, (list, tuple)):
+        return len(source)
+    if isinstance(source, Image.Image):
+        return getattr(source, "n_frames", 1)
+    with Image.open(source) as img:
+        return getattr(img, "n_frames", 1)
+
+
+# Convert every frame of an animation into {name}_f0000.png, {name}_f0001.png, ... (with a schematic and
+# .mcfunction per frame, as options ask) plus {name}_animation.json listing the frames and their durations.
+# Each frame after the first only re-quantizes the pixels that changed from the previous frame (error
+# diffusion spreads changes over the whole frame, so with it every frame is quantized in full), and its
+# .mcfunction only sets the blocks that changed, so running the functions in order plays the animation.
+# layered=True writes one {name}_frames.schem with frame n in layer y=n instead of a schematic per frame.
+# progress(fraction), if given, is called after every frame. If a frame fails or progress raises (to cancel),
+# the files written so far are removed again, so no frames are left without a manifest listing them.
+def convert_animation(source, width, height, options=None, output_dir=".", name=None, layered=False,
+                      progress=None):
+    options = options or ConvertOptions()
+    os.makedirs(output_dir, exist_ok=True)
+    count = frame_count(source)
+    palette = options_palette(options)
+    lut = load_lut(palette, metric=options.metric) if options.use_lut else None
+    incremental = options.dither not in DIFFUSION_KERNELS
+    timings = {}
+    frames = []
+    result = AnimationResult(manifest_path=None, frames=frames, palette=palette, timings=timings)
+    layers = []
+    previous_rgba = previous_idx = None
+
+    written = []  # Files written so far, removed again if the conversion stops partway
+    try:
+        with span("animation", timings, frames=count, dither=options.dither) as run:
+            for number, (img, duration) in enumerate(iter_frames(source)):
+                if number == 0:
+                    width, height = target_size(img.size, width, height)
+                    if name is None:
+                        file_name = ("animation" if isinstance(source, (Image.Image, list, tuple))
+                                     else os.path.splitext(os.path.basename(source))[0])
+                        name = f"{file_name}_{width}x{height}_pixelart"
+                with span("resize", timings, pixels=width * height):
+                    img = resize_image(img, width, height, options.crop)
+                    if options.fill_color is not None:
+                        img = fill_transparent(img, options.fill_color)
+                    rgba = np.asarray(img, dtype=np.uint8)
+
+                with span("quantize", timings) as stage:
+                    if previous_idx is None or not incremental:
+                        idx = dither_image(rgba, palette, options.dither, lut=lut, metric=options.metric)
+                        changed = width * height
+                    else:
+                        # Compare whole RGBA pixels as 32-bit words; transparent pixels are air whatever their
+                        # color, so changes between two transparent pixels are dropped
+                        ys, xs = np.nonzero(rgba.view(np.uint32)[..., 0] != previous_rgba.view(np.uint32)[..., 0])
+                        visible = (rgba[ys, xs, 3] != 0) | (previous_rgba[ys, xs, 3] != 0)
+                        ys, xs = ys[visible], xs[visible]
+                        idx = previous_idx.copy()
+                        idx[ys, xs] = dither_pixels(rgba[ys, xs], ys, xs, palette, options.dither, lut=lut,
+                                                    metric=options.metric)
+                        changed = len(ys)
+                    stage.update(pixels=changed)
+                result.pixels += width * height
+                result.requantized += changed
+
+                stem = frame_name(name, number)
+                png_path = os.path.join(output_dir, stem + ".png")
+                with span("png", timings, pixels=width * height):
+                    with atomic_path(png_path) as temp_path:
+                        render_image(idx, palette).save(temp_path)
+                written.append(png_path)
+                entry = {"frame": number, "duration": duration, "changed": changed, "png": os.path.basename(png_path),
+                         "schematic": None, "mcfunction": None}
+                if options.schematic and not layered:
+                    with span("schematic", timings, blocks=width * height):
+                        schematic_path = create_schematic_from_idx_matrix(idx, png_path, stem,
+                                                                          options.schematic_writer, palette=palette)
+                    written.append(schematic_path)
+                    entry["schematic"] = os.path.basename(schematic_path)
+                if options.mcfunction:
+                    with span("commands", timings, blocks=changed):
+                        function_path, _ = create_mcfunction_from_idx_matrix(idx, png_path, stem, palette,
+                                                                             previous=previous_idx)
+                    written.append(function_path)
+                    entry["mcfunction"] = os.path.basename(function_path)
+                if layered:
+                    layers.append(idx)
+                frames.append(entry)
+                previous_rgba, previous_idx = rgba, idx
+                if progress is not None:
+                    progress((number + 1) / count)
+
+            if options.schematic and layered and layers:
+                with span("schematic", timings, blocks=len(layers) * width * height, layers=len(layers)):
+                    result.schematic_path = create_schematic_from_idx_matrix(
+                        np.stack(layers), os.path.join(output_dir, name + ".png"), name + "_frames", palette=palette)
+                written.append(result.schematic_path)
+            run.update(width=width, height=height, pixels=result.pixels, requantized=result.requantized)
+
+        result.manifest_path = os.path.join(output_dir, name + "_animation.json")
+        write_manifest(result.manifest_path, {
+            "version": ANIMATION_VERSION,
+            "source": None if isinstance(source, (Image.Image, list, tuple)) else os.path.abspath(source),
+            "width": width,
+            "height": height,
+            "palette": "extended_colors" if options.shade else "base_colors",
+            "metric": options.metric,
+            "dither": options.dither,
+            "schematic": result.schematic_path and os.path.basename(result.schematic_path),  # Layered schematic
+            "frames": frames,  # duration: milliseconds to show the frame (None for still images)
+        })
+    except BaseException:
+        for path in written:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    return result
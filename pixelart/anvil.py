@@ -0,0 +1,301 @@
+import gzip  # For reading level.dat
+import io
+import os  # OS-related functions (path handling, etc.)
+import struct  # For the region file header
+import time  # For chunk timestamps
+import zlib  # For chunk compression
+from dataclasses import dataclass
+import numpy as np  # Import NumPy for array and numerical calculations
+from .atomic import atomic_path
+from .compiled import compile_palette
+from .memory import release_pages
+from .nbt import (NBTWriter, TAG_BYTE, TAG_COMPOUND, TAG_INT, TAG_LIST, TAG_LONG, TAG_LONG_ARRAY, TAG_STRING,
+                  read_nbt)
+from .palettes import base_colors
+
+SECTOR_BYTES = 4096  # Region files are allocated in 4 KiB sectors
+REGION_CHUNKS = 32  # A region file holds 32 x 32 chunks
+SECTION_SIZE = 16  # Chunk sections are 16 x 16 x 16 blocks
+MIN_Y, MAX_Y = -64, 319  # Overworld build height since 1.18
+MIN_DATA_VERSION = 2860  # 1.18: first chunk format with top-level "sections" and "block_states"
+DEFAULT_DATA_VERSION = 3465  # 1.20.1, for new chunks when the world has no level.dat or chunks to copy it from
+DEFAULT_BIOME = "minecraft:plains"  # Biome of sections created from scratch
+COMPRESSION_GZIP, COMPRESSION_ZLIB, COMPRESSION_NONE = 1, 2, 3
+EXTERNAL_CHUNK = 128  # Compression flag of chunks stored in a separate .mcc file
+
+
+# What a world write changed
+@dataclass
+class WorldStats:
+    regions: int = 0  # Region files rewritten
+    chunks: int = 0  # Chunks changed (including created ones)
+    created_chunks: int = 0  # Chunks that did not exist yet
+    sections: int = 0  # 16x16x16 sections changed
+    blocks: int = 0  # Blocks placed
+
+
+# Raw chunk records of a region file (4-byte length, compression byte, data; None for absent chunks)
+# and their timestamps. A missing file reads as an empty region.
+def read_region(path):
+    chunks = [None] * REGION_CHUNKS * REGION_CHUNKS
+    timestamps = np.zeros(REGION_CHUNKS * REGION_CHUNKS, dtype=">u4")
+    if not os.path.exists(path):
+        return chunks, timestamps
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < 2 * SECTOR_BYTES:
+        return chunks, timestamps
+    locations = np.frombuffer(data, dtype=">u4", count=len(chunks))
+    timestamps[:] = np.frombuffer(data, dtype=">u4", count=len(chunks), offset=SECTOR_BYTES)
+    for i, location in enumerate(locations):
+        offset = int(location) >> 8
+        if offset >= 2 and location & 0xFF:
+            start = offset * SECTOR_BYTES
+            length, = struct.unpack_from(">I", data, start)
+            chunks[i] = data[start:start + 4 + length]
+    return chunks, timestamps
+
+
+# Write a region file from raw chunk records (as read_region returns them), packing chunks into sectors
+def write_region(path, chunks, timestamps):
+    locations = np.zeros(len(chunks), dtype=">u4")
+    sector = 2  # After the location and timestamp tables
+    with atomic_path(path) as temp_path:
+        with open(temp_path, "wb") as f:
+            f.seek(2 * SECTOR_BYTES)
+            for i, record in enumerate(chunks):
+                if record is None:
+                    continue
+                count = -(-len(record) // SECTOR_BYTES)
+                if count > 0xFF:
+                    raise ValueError(f"Chunk {i} of {path} is {len(record)} bytes, too large for a region sector run")
+                f.write(record + b"\0" * (count * SECTOR_BYTES - len(record)))
+                locations[i] = sector << 8 | count
+                sector += count
+            f.seek(0)
+            f.write(locations.tobytes() + np.asarray(timestamps, dtype=">u4").tobytes())
+
+
+# Chunk NBT root compound from a raw chunk record
+def decode_chunk(record):
+    length, compression = struct.unpack_from(">IB", record)
+    payload = record[5:4 + length]
+    if compression & EXTERNAL_CHUNK:
+        raise ValueError("Chunks stored in external .mcc files are not supported")
+    if compression == COMPRESSION_ZLIB:
+        payload = zlib.decompress(payload)
+    elif compression == COMPRESSION_GZIP:
+        payload = gzip.decompress(payload)
+    elif compression != COMPRESSION_NONE:
+        raise ValueError(f"Unsupported chunk compression {compression}")
+    return read_nbt(payload)[1]
+
+
+# Raw zlib-compressed chunk record from a chunk NBT root compound
+def encode_chunk(root):
+    buffer = io.BytesIO()
+    NBTWriter(buffer).tag("", TAG_COMPOUND, root)
+    data = zlib.compress(buffer.getvalue())
+    return struct.pack(">IB", len(data) + 1, COMPRESSION_ZLIB) + data
+
+
+# Entries packed per 64-bit long for a palette of size entries (entries never straddle longs since 1.16)
+def state_bits(size):
+    return max(4, (size - 1).bit_length())
+
+
+# Palette indices of a section's 4096 blocks (y, z, x order) from its packed long array
+def unpack_states(data, size):
+    if size <= 1 or data is None:
+        return np.zeros(SECTION_SIZE ** 3, dtype=np.int64)
+    bits = state_bits(size)
+    shifts = np.arange(64 // bits, dtype=np.uint64) * np.uint64(bits)
+    words = np.asarray(data, dtype=np.int64).view(np.uint64)
+    values = (words[:, None] >> shifts) & np.uint64((1 << bits) - 1)
+    return values.ravel()[:SECTION_SIZE ** 3].astype(np.int64)
+
+
+# Packed long array of palette indices (None when the palette has a single entry)
+def pack_states(values, size):
+    if size <= 1:
+        return None
+    bits = state_bits(size)
+    per_long = 64 // bits
+    padded = np.zeros(-(-len(values) // per_long) * per_long, dtype=np.uint64)
+    padded[:len(values)] = values
+    shifts = np.arange(per_long, dtype=np.uint64) * np.uint64(bits)
+    words = np.bitwise_or.reduce(padded.reshape(-1, per_long) << shifts, axis=1)
+    return words.view(np.int64).astype(">i8")
+
+
+# Block state compound for a block id, with properties written as "minecraft:name[key=value,...]"
+def block_state(block_id):
+    name, _, properties = block_id.partition("[")
+    state = {"Name": (TAG_STRING, name)}
+    if properties:
+        state["Properties"] = (TAG_COMPOUND, {key: (TAG_STRING, value) for key, value in
+                                              (item.split("=", 1) for item in properties.rstrip("]").split(","))})
+    return state
+
+
+def _state_key(state):
+    properties = state.get("Properties", (TAG_COMPOUND, {}))[1]
+    return state["Name"][1], tuple(sorted((key, value) for key, (_, value) in properties.items()))
+
+
+# Empty (all air) section at section height section_y
+def new_section(section_y):
+    return {
+        "Y": (TAG_BYTE, section_y),
+        "block_states": (TAG_COMPOUND, {"palette": (TAG_LIST, (TAG_COMPOUND, [block_state("minecraft:air")]))}),
+        "biomes": (TAG_COMPOUND, {"palette": (TAG_LIST, (TAG_STRING, [DEFAULT_BIOME]))}),
+    }
+
+
+# Chunk with no blocks, already fully generated (the game will not add terrain to it)
+def new_chunk(cx, cz, data_version):
+    return {
+        "DataVersion": (TAG_INT, data_version),
+        "xPos": (TAG_INT, cx),
+        "yPos": (TAG_INT, MIN_Y >> 4),
+        "zPos": (TAG_INT, cz),
+        "Status": (TAG_STRING, "minecraft:full"),
+        "LastUpdate": (TAG_LONG, 0),
+        "InhabitedTime": (TAG_LONG, 0),
+        "sections": (TAG_LIST, (TAG_COMPOUND, [])),
+        "block_entities": (TAG_LIST, (TAG_COMPOUND, [])),
+    }
+
+
+# Place one 16x16 layer of block states into a section: layer holds indices into states, -1 keeps the
+# existing block. The section palette is rebuilt with only the states still in use.
+def set_section_layer(section, local_y, layer, states):
+    block_states = section.setdefault("block_states", (TAG_COMPOUND, {}))[1]
+    palette = list(block_states.get("palette", (TAG_LIST, (TAG_COMPOUND, [block_state("minecraft:air")])))[1][1])
+    values = unpack_states(block_states.get("data", (TAG_LONG_ARRAY, None))[1], len(palette))
+    existing = {_state_key(state): i for i, state in enumerate(palette)}
+    positions = np.empty(len(states), dtype=np.int64)  # Index of each placed state in the merged palette
+    for i, state in enumerate(states):
+        positions[i] = existing.setdefault(_state_key(state), len(palette))
+        if positions[i] == len(palette):
+            palette.append(state)
+    cells = values.reshape(SECTION_SIZE, SECTION_SIZE, SECTION_SIZE)[local_y]  # (z, x) view
+    placed = layer >= 0
+    cells[placed] = positions[layer[placed]]
+    used, values = np.unique(values, return_inverse=True)
+    block_states["palette"] = (TAG_LIST, (TAG_COMPOUND, [palette[i] for i in used]))
+    data = pack_states(values.ravel(), len(used))
+    if data is None:
+        block_states.pop("data", None)
+    else:
+        block_states["data"] = (TAG_LONG_ARRAY, data)
+    return int(placed.sum())
+
+
+# Place a layer into a chunk at height y (layer as in set_section_layer, indexed [z, x] within the chunk).
+# Lighting and heightmaps of the chunk are left for the game to recompute, and block entities (chests,
+# signs...) where blocks were placed are removed.
+def set_chunk_layer(chunk, y, layer, states):
+    if "Level" in chunk or chunk.get("DataVersion", (TAG_INT, 0))[1] < MIN_DATA_VERSION:
+        raise ValueError("Only worlds saved by Minecraft 1.18 or newer are supported")
+    section_y = y >> 4
+    sections = chunk.setdefault("sections", (TAG_LIST, (TAG_COMPOUND, [])))[1][1]
+    section = next((s for s in sections if s["Y"][1] == section_y), None)
+    if section is None:
+        section = new_section(section_y)
+        sections.append(section)
+        sections.sort(key=lambda s: s["Y"][1])
+    placed = set_section_layer(section, y & 15, layer, states)
+
+    chunk["isLightOn"] = (TAG_BYTE, 0)  # The game relights the chunk when it loads
+    chunk.pop("Heightmaps", None)  # Missing heightmaps are recomputed on load
+    entities = chunk.get("block_entities")
+    if entities is not None and entities[1][1]:
+        x0, z0 = chunk["xPos"][1] * SECTION_SIZE, chunk["zPos"][1] * SECTION_SIZE
+        zs, xs = np.nonzero(layer >= 0)
+        replaced = set(zip((xs + x0).tolist(), (zs + z0).tolist()))
+        chunk["block_entities"] = (TAG_LIST, (TAG_COMPOUND, [
+            e for e in entities[1][1] if e["y"][1] != y or (e["x"][1], e["z"][1]) not in replaced]))
+    return placed
+
+
+# DataVersion of a world from its level.dat, or None
+def world_data_version(world_dir):
+    try:
+        with gzip.open(os.path.join(world_dir, "level.dat"), "rb") as f:
+            return read_nbt(f.read())[1]["Data"][1]["DataVersion"][1]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+# Write an index matrix as a horizontal layer of blocks straight into the region files of a (copy of a)
+# Minecraft 1.18+ Java world: image column i, row j goes to block (x + i, y, z + j) for origin (x, y, z).
+# Air (index 0) keeps the world's existing blocks. Only chunks under non-air pixels are decoded and
+# re-encoded; every other chunk is copied byte for byte. Missing region files and chunks are created
+# (as empty, fully generated chunks), so an empty "region" folder is enough. Do not run it on a world
+# that is open in Minecraft. idx_matrix indexes palette (base_colors by default); progress(fraction) is
+# called after every region file. Returns WorldStats.
+def write_to_world(idx_matrix, world_dir, origin=(0, 64, 0), palette=None, data_version=None, progress=None):
+    idx = np.asarray(idx_matrix)
+    if idx.ndim != 2:
+        raise ValueError(f"Expected a 2D index array, got shape {idx.shape}")
+    x0, y, z0 = origin
+    if not MIN_Y <= y <= MAX_Y:
+        raise ValueError(f"Layer height {y} is outside the world ({MIN_Y} to {MAX_Y})")
+    palette = compile_palette(base_colors if palette is None else palette)
+    layer_of = np.full(max(256, len(palette)), -1, dtype=np.int64)  # Palette index -> state, air keeps blocks
+    layer_of[1:len(palette)] = palette.block[1:]
+    layer_of[layer_of == 0] = -1
+    states = [block_state(name) for name in palette.blocks]
+    data_version = data_version or world_data_version(world_dir)
+    region_dir = os.path.join(world_dir, "region")
+    os.makedirs(region_dir, exist_ok=True)
+    height, width = idx.shape
+    stats = WorldStats()
+    if width == 0 or height == 0:
+        return stats
+
+    chunk = SECTION_SIZE * REGION_CHUNKS  # Blocks per region side
+    regions = [(rx, rz) for rz in range(z0 // chunk, (z0 + height - 1) // chunk + 1)
+               for rx in range(x0 // chunk, (x0 + width - 1) // chunk + 1)]
+    now = int(time.time())
+    for n, (rx, rz) in enumerate(regions):
+        path = os.path.join(region_dir, f"r.{rx}.{rz}.mca")
+        records, timestamps = read_region(path)
+        changed = False
+        for cz in range(max(rz * REGION_CHUNKS, z0 // SECTION_SIZE),
+                        min((rz + 1) * REGION_CHUNKS, (z0 + height - 1) // SECTION_SIZE + 1)):
+            for cx in range(max(rx * REGION_CHUNKS, x0 // SECTION_SIZE),
+                            min((rx + 1) * REGION_CHUNKS, (x0 + width - 1) // SECTION_SIZE + 1)):
+                # Part of the image over this chunk, and where it lies inside the chunk
+                bx0, bz0 = max(x0, cx * SECTION_SIZE), max(z0, cz * SECTION_SIZE)
+                bx1, bz1 = min(x0 + width, (cx + 1) * SECTION_SIZE), min(z0 + height, (cz + 1) * SECTION_SIZE)
+                blocks = layer_of[idx[bz0 - z0:bz1 - z0, bx0 - x0:bx1 - x0]]
+                if (blocks < 0).all():
+                    continue  # Only air here: leave the chunk untouched
+                layer = np.full((SECTION_SIZE, SECTION_SIZE), -1, dtype=np.int64)
+                lx, lz = bx0 - cx * SECTION_SIZE, bz0 - cz * SECTION_SIZE
+                layer[lz:lz + blocks.shape[0], lx:lx + blocks.shape[1]] = blocks
+
+                i = (cx % REGION_CHUNKS) + (cz % REGION_CHUNKS) * REGION_CHUNKS
+                if records[i] is None:
+                    if data_version is None:
+                        data_version = next((decode_chunk(r)["DataVersion"][1] for r in records if r is not None),
+                                            DEFAULT_DATA_VERSION)
+                    root = new_chunk(cx, cz, data_version)
+                    stats.created_chunks += 1
+                else:
+                    root = decode_chunk(records[i])
+                stats.blocks += set_chunk_layer(root, y, layer, states)
+                records[i] = encode_chunk(root)
+                timestamps[i] = now
+                stats.chunks += 1
+                stats.sections += 1
+                changed = True
+        if changed:
+            write_region(path, records, timestamps)
+            stats.regions += 1
+        release_pages(idx)  # Keep a file-backed index array from piling up in memory
+        if progress is not None:
+            progress((n + 1) / len(regions))
+    return stats
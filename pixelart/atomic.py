@@ -0,0 +1,44 @@
+import os  # OS-related functions (path handling, etc.)
+import tempfile  # For temporary files next to the target
+from contextlib import contextmanager
+
+
+# Write a file through a temporary path in the same folder that replaces path only when the block
+# completes, so readers (and cancelled or failed conversions) never leave a half-written file behind.
+# The temporary name keeps the extension, so writers that pick the format from it still work.
+# group: list from atomic_group(); the finished file then replaces path together with the rest of the group
+@contextmanager
+def atomic_path(path, group=None):
+    output_dir = os.path.dirname(path) or "."
+    stem, ext = os.path.splitext(os.path.basename(path))
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, prefix=f".{stem}.", suffix=ext)
+    os.close(fd)
+    try:
+        yield temp_path
+        os.chmod(temp_path, 0o644)  # mkstemp creates owner-only files
+        if group is None:
+            os.replace(temp_path, path)
+        else:
+            group.append((temp_path, path))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+# Collect the files written with atomic_path(path, group) inside the block and replace their targets only
+# once the whole block completes, so related outputs (PNG, schematic, .mcfunction) appear together and an
+# error or cancellation in any of them leaves every existing target untouched
+@contextmanager
+def atomic_group():
+    group = []  # (temporary path, target path) of the finished files
+    try:
+        yield group
+        while group:
+            temp_path, path = group.pop(0)
+            os.replace(temp_path, path)
+    except BaseException:
+        for temp_path, _ in group:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
@@ -0,0 +1,70 @@
+# Function mapping block indices to Minecraft block ID strings
+def get_block_mapping():
+    return {
+        0: "minecraft:air",  # Air block
+        1: "minecraft:grass_block",  # Grass block
+        2: "minecraft:sand",  # Sand block
+        3: "minecraft:white_wool",  # White wool
+        4: "minecraft:tnt",  # TNT block
+        5: "minecraft:ice",  # Ice block
+        6: "minecraft:iron_block",  # Iron block
+        7: "minecraft:oak_leaves",  # Oak leaves
+        8: "minecraft:snow_block",  # Snow block
+        9: "minecraft:clay",  # Clay block
+        10: "minecraft:dirt",  # Dirt block
+        11: "minecraft:stone",  # Stone block
+        12: "minecraft:water",  # Water block
+        13: "minecraft:oak_planks",  # Oak planks
+        14: "minecraft:quartz_block",  # Quartz block
+        15: "minecraft:orange_terracotta",  # Orange terracotta
+        16: "minecraft:magenta_wool",  # Magenta wool
+        17: "minecraft:light_blue_wool",  # Light blue wool
+        18: "minecraft:yellow_wool",  # Yellow wool
+        19: "minecraft:lime_wool",  # Lime wool
+        20: "minecraft:pink_wool",  # Pink wool
+        21: "minecraft:gray_wool",  # Gray wool
+        22: "minecraft:light_gray_wool",  # Light gray wool
+        23: "minecraft:cyan_wool",  # Cyan wool
+        24: "minecraft:purple_wool",  # Purple wool
+        25: "minecraft:blue_wool",  # Blue wool
+        26: "minecraft:brown_wool",  # Brown wool
+        27: "minecraft:green_wool",  # Green wool
+        28: "minecraft:red_wool",  # Red wool
+        29: "minecraft:black_wool",  # Black wool
+        30: "minecraft:gold_block",  # Gold block
+        31: "minecraft:diamond_block",  # Diamond block
+        32: "minecraft:lapis_block",  # Lapis lazuli block
+        33: "minecraft:emerald_block",  # Emerald block
+        34: "minecraft:podzol",  # Podzol block
+        35: "minecraft:netherrack",  # Netherrack
+        36: "minecraft:white_terracotta",  # White terracotta
+        37: "minecraft:orange_terracotta",  # Orange terracotta
+        38: "minecraft:magenta_terracotta",  # Magenta terracotta
+        39: "minecraft:light_blue_terracotta",  # Light blue terracotta
+        40: "minecraft:yellow_terracotta",  # Yellow terracotta
+        41: "minecraft:lime_terracotta",  # Lime terracotta
+        42: "minecraft:pink_terracotta",  # Pink terracotta
+        43: "minecraft:gray_terracotta",  # Gray terracotta
+        44: "minecraft:light_gray_terracotta",  # Light gray terracotta
+        45: "minecraft:cyan_terracotta",  # Cyan terracotta
+        46: "minecraft:purple_terracotta",  # Purple terracotta
+        47: "minecraft:blue_terracotta",  # Blue terracotta
+        48: "minecraft:brown_terracotta",  # Brown terracotta
+        49: "minecraft:green_terracotta",  # Green terracotta
+        50: "minecraft:red_terracotta",  # Red terracotta
+        51: "minecraft:black_terracotta",  # Black terracotta
+        52: "minecraft:crimson_nylium",  # Crimson nylium
+        53: "minecraft:crimson_stem",  # Crimson stem
+        54: "minecraft:crimson_hyphae",  # Crimson hyphae
+        55: "minecraft:warped_nylium",  # Warped nylium
+        56: "minecraft:warped_stem",  # Warped stem
+        57: "minecraft:warped_hyphae",  # Warped hyphae
+        58: "minecraft:warped_wart_block",  # Warped wart block
+        59: "minecraft:deepslate",  # Deepslate
+        60: "minecraft:raw_iron_block",  # Raw iron block
+        61: "minecraft:glow_lichen",  # Glow lichen
+        62: "minecraft:pink_concrete",  # Light pink - pink concrete
+        63: "minecraft:pink_concrete",  # Pink - pink concrete
+        64: "minecraft:pink_concrete",  # Baby pink - pink concrete
+        65: "minecraft:pink_concrete",  # Pale pink - pink concrete
+    }
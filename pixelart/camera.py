@@ -0,0 +1,220 @@
+import queue  # Bounded hand-off of frames from the capture thread to the conversion thread
+import threading  # Capture and conversion run on their own threads
+import time  # For warm-up and frame pacing
+from dataclasses import dataclass
+import numpy as np  # Import NumPy for array and numerical calculations
+from PIL import Image  # Import library for image processing
+from .convert import ConvertOptions, convert, render_image
+
+DEFAULT_RESOLUTION = (1024, 768)
+DEFAULT_FRAMERATE = 15  # Frames per second of continuous capture
+WARMUP_SECONDS = 2  # Exposure and white balance settle after the camera starts
+LIVE_QUEUE_FRAMES = 1  # Frames waiting for conversion; older ones are dropped so the preview stays current
+
+
+# Stand-in for picamera.PiCamera on machines without a Raspberry Pi camera: produces a moving synthetic
+# test pattern through the same capture calls (file names, writable objects and raw 'rgb' buffers)
+class MockPiCamera:
+    def __init__(self):
+        self.resolution = DEFAULT_RESOLUTION
+        self.framerate = DEFAULT_FRAMERATE
+        self.frame = 0  # Frames produced so far
+        self.closed = False
+        self._pattern = None
+
+    def start_preview(self):
+        pass
+
+    def stop_preview(self):
+        pass
+
+    # Next synthetic frame as a (height, width, 3) uint8 array: a gradient scrolling one step per frame
+    def next_frame(self):
+        width, height = self.resolution
+        if self._pattern is None or self._pattern.shape[:2] != (height, 2 * width):
+            y, x = np.mgrid[0:height, 0:2 * width]
+            self._pattern = np.stack([(np.sin(x * np.pi / width) + 1) * 127.5, y * 255 / max(height - 1, 1),
+                                      (x % width) * 255 / width], axis=-1).astype(np.uint8)
+        offset = self.frame * 8 % width
+        self.frame += 1
+        return self._pattern[:, offset:offset + width]
+
+    def capture(self, output, format=None, use_video_port=False):
+        rgb = self.next_frame()
+        if format == 'rgb':
+            # Raw RGB rows padded like the camera firmware: width to a multiple of 32, height to 16
+            width, height = self.resolution
+            padded = np.zeros((-(-height // 16) * 16, -(-width // 32) * 32, 3), dtype=np.uint8)
+            padded[:height, :width] = rgb
+            data = padded.tobytes()
+            if hasattr(output, 'write'):
+                output.write(data)
+            else:
+                memoryview(output).cast('B')[:len(data)] = data
+        else:
+            Image.fromarray(rgb).save(output, format=format or ('JPEG' if hasattr(output, 'write') else None))
+
+    def capture_continuous(self, output, format=None, use_video_port=False):
+        next_time = time.monotonic()
+        while not self.closed:
+            next_time += 1 / self.framerate
+            time.sleep(max(0.0, next_time - time.monotonic()))  # Paced like a real video port
+            self.capture(output, format, use_video_port)
+            yield output
+
+    def close(self):
+        self.closed = True
+
+
+# picamera.PiCamera when the picamera package is installed, MockPiCamera otherwise. Imported here, on the
+# first open, so starting the program without a camera never probes for the Raspberry Pi library.
+def default_camera():
+    try:
+        import picamera  # Raspberry Pi camera control library
+    except ImportError:
+        return MockPiCamera()
+    return picamera.PiCamera()
+
+
+# Camera kept open between captures, so only the first capture pays for start-up and warm-up.
+# Frames are captured as raw RGB straight into NumPy arrays (no JPEG encoding or temporary files).
+# Uses picamera.PiCamera when available and MockPiCamera otherwise (or camera_factory, if given).
+class CameraSession:
+    def __init__(self, resolution=DEFAULT_RESOLUTION, framerate=DEFAULT_FRAMERATE, camera_factory=None,
+                 warmup=WARMUP_SECONDS):
+        self.resolution = tuple(resolution)
+        self.framerate = framerate
+        self.camera_factory = camera_factory or default_camera
+        self.warmup = warmup
+        self.camera = None
+
+    def open(self):
+        if self.camera is None:
+            camera = self.camera_factory()
+            camera.resolution = self.resolution
+            camera.framerate = self.framerate
+            time.sleep(self.warmup)
+            self.camera = camera
+        return self.camera
+
+    # Empty buffer for one raw frame (the camera pads rows to 32 pixels and height to 16 rows)
+    def _buffer(self):
+        width, height = self.resolution
+        return np.empty((-(-height // 16) * 16, -(-width // 32) * 32, 3), dtype=np.uint8)
+
+    # One full-quality still as a (height, width, 3) uint8 array
+    def capture(self):
+        width, height = self.resolution
+        buffer = self._buffer()
+        self.open().capture(buffer, 'rgb')
+        return buffer[:height, :width]
+
+    # Endless frames from the video port as (height, width, 3) arrays. Every frame reuses the same
+    # buffer, so copy a frame before the next one is requested if it must be kept.
+    def frames(self):
+        width, height = self.resolution
+        buffer = self._buffer()
+        for _ in self.open().capture_continuous(buffer, 'rgb', use_video_port=True):
+            yield buffer[:height, :width]
+
+    def close(self):
+        if self.camera is not None:
+            self.camera.close()
+            self.camera = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+# One converted frame of a live preview
+@dataclass
+class LiveFrame:
+    number: int  # Frame number from the camera (gaps are dropped frames)
+    rgb: np.ndarray  # Captured camera frame
+    result: object  # ConvertResult of the frame (no files written)
+    preview: Image.Image  # Rendered pixel art
+    seconds: float  # Capture-to-preview latency
+
+
+# Continuous capture and conversion: a capture thread puts frames into a bounded queue, replacing the
+# waiting frame when the converter falls behind, and a conversion thread turns the newest frame into
+# pixel art. latest holds the most recent LiveFrame; on_frame(frame), if given, is called from the
+# conversion thread after every frame.
+class LiveConverter:
+    def __init__(self, session, width, height=None, options=None, on_frame=None):
+        self.session = session
+        self.on_frame = on_frame
+        self.latest = None
+        self.error = None  # Exception that stopped the pipeline, if any
+        self.captured = 0
+        self.converted = 0
+        self.dropped = 0
+        self.configure(width, height, options)
+        self._frames = queue.Queue(maxsize=LIVE_QUEUE_FRAMES)
+        self._stop = threading.Event()
+        self._threads = []
+
+    # Change the output size and options; applies from the next converted frame
+    def configure(self, width, height=None, options=None):
+        self._settings = (width, height, options or ConvertOptions())
+
+    def start(self):
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._capture_loop, daemon=True),
+                         threading.Thread(target=self._convert_loop, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _capture_loop(self):
+        try:
+            for rgb in self.session.frames():
+                if self._stop.is_set():
+                    break
+                self.captured += 1
+                item = (self.captured, rgb.copy(), time.perf_counter())
+                try:
+                    self._frames.put_nowait(item)
+                except queue.Full:
+                    try:
+                        self._frames.get_nowait()  # The converter is busy: replace the stale frame
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+                    self._frames.put_nowait(item)
+        except Exception as e:
+            self.error = e
+            self._stop.set()
+
+    def _convert_loop(self):
+        while not self._stop.is_set():
+            try:
+                number, rgb, captured_at = self._frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            width, height, options = self._settings
+            try:
+                result = convert(Image.fromarray(rgb), width, height, options)
+            except Exception as e:
+                self.error = e
+                self._stop.set()
+                return
+            frame = LiveFrame(number, rgb, result, render_image(result.idx, result.palette),
+                              time.perf_counter() - captured_at)
+            self.latest = frame
+            self.converted += 1
+            if self.on_frame is not None:
+                self.on_frame(frame)
@@ -0,0 +1,290 @@
+import argparse  # For command-line argument parsing
+import glob  # For expanding wildcard patterns
+import os  # OS-related functions (path handling, etc.)
+import sys
+import time  # For per-file timing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image  # For reading image sizes
+from .convert import ConvertOptions, convert, options_palette, output_names, select_palette, target_size
+from .tiles import MAP_SIZE, convert_tiled
+from .commands import MAX_COMMAND_CHAIN
+from .anvil import write_to_world
+from .animation import convert_animation
+from .memory import peak_rss
+from .resultcache import DEFAULT_RESULT_CACHE_BYTES, ResultCache
+from .watch import DEFAULT_SETTLE, watch_folder
+from .filters import BLOCK_CATEGORIES, allowed_base_colors
+from .lut import load_lut, lut_path
+from .dither import DITHER_METHODS
+from . import instrument
+from .quantize import METRICS
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")  # Same file types as the GUI file dialog
+
+
+# Expand files, directories and glob patterns into a sorted list of image paths
+def collect_inputs(inputs, recursive=False):
+    paths = []
+    for item in inputs:
+        if os.path.isfile(item):
+            paths.append(item)  # Explicit files are taken as given, whatever the extension
+            continue
+        if os.path.isdir(item):
+            pattern = os.path.join(item, "**", "*") if recursive else os.path.join(item, "*")
+        else:
+            pattern = item  # Glob pattern (quoted so the shell did not expand it)
+        paths.extend(p for p in glob.glob(pattern, recursive=recursive)
+                     if os.path.isfile(p) and p.lower().endswith(IMAGE_EXTENSIONS))
+    return sorted(set(paths))
+
+
+# Convert a single file into output_dir (runs inside a worker process); with frames, every frame of an
+# animated image (see pixelart.animation), with layered in one schematic.
+# results: optional ResultCache that repeated conversions are taken from
+# Returns (path, output paths, seconds, peak RSS in bytes or None, CommandStats or None, error message or None)
+def convert_file(path, output_dir, width, height, options, frames=False, layered=False, results=None):
+    start = time.perf_counter()
+    try:
+        with Image.open(path) as img:  # Only the header is read here
+            w, h = target_size(img.size, width, height)  # Final size for the output names
+            animated = frames and getattr(img, "n_frames", 1) > 1
+        if animated:
+            result = convert_animation(path, w, h, options, output_dir, layered=layered)
+            outputs = [p for p in (result.manifest_path, result.schematic_path) if p is not None]
+            return path, outputs, time.perf_counter() - start, peak_rss(), None, None
+        file_name = os.path.splitext(os.path.basename(path))[0]
+        png_name, schematic_name = output_names(file_name, w, h, options.shade)
+        result = convert(path, w, h, options, output_path=os.path.join(output_dir, png_name),
+                         schematic_name=schematic_name, results=results)
+        outputs = [p for p in (result.png_path, result.schematic_path, result.function_path) if p is not None]
+        return path, outputs, time.perf_counter() - start, result.peak_rss, result.command_stats, None
+    except Exception as e:
+        return path, [], time.perf_counter() - start, None, None, f"{type(e).__name__}: {e}"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m pixelart",
+        description="Convert images into Minecraft map-color pixel art (PNG + schematic).")
+    parser.add_argument("inputs", nargs="*", help="image files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default=".", help="folder for the converted files (default: .)")
+    parser.add_argument("-W", "--width", type=int, help="output width in blocks")
+    parser.add_argument("-H", "--height", type=int, help="output height in blocks")
+    parser.add_argument("--crop", action="store_true", help="crop instead of stretching if aspect ratio differs")
+    parser.add_argument("--fill", metavar="COLOR", help="fill transparent pixels with COLOR (e.g. '#ffffff')")
+    parser.add_argument("--shade", action="store_true", help="include shading (extended palette)")
+    parser.add_argument("--metric", choices=METRICS, default="rgb",
+                        help="color matching metric (default: rgb)")
+    parser.add_argument("--dither", choices=DITHER_METHODS, default="none",
+                        help="dithering method (default: none)")
+    parser.add_argument("--exclude", action="extend", nargs="+", default=[], metavar="BLOCK",
+                        help="never use these blocks (e.g. 'tnt', 'minecraft:sand') or categories: "
+                             + ", ".join(BLOCK_CATEGORIES))
+    parser.add_argument("--only", action="extend", nargs="+", metavar="BLOCK",
+                        help="only use these blocks or categories")
+    parser.add_argument("--no-schematic", action="store_true", help="only write the PNG")
+    parser.add_argument("--schematic-writer", choices=("native", "mcschematic"), default="native",
+                        help="schematic writer (default: native streaming writer)")
+    parser.add_argument("--mcfunction", action="store_true",
+                        help="also write /fill commands (.mcfunction) that build the art from where they run")
+    parser.add_argument("--frames", action="store_true",
+                        help="convert every frame of animated images (GIF, APNG, WebP); frames after the first "
+                             "only re-quantize changed pixels, and their .mcfunction only changes those blocks")
+    parser.add_argument("--layered", action="store_true",
+                        help="with --frames, write one schematic with a layer per frame instead of one per frame")
+    parser.add_argument("--world", metavar="DIR",
+                        help="place the art straight into the region files of this Minecraft 1.18+ world "
+                             "(use a copy, and never a world that is open in the game)")
+    parser.add_argument("--origin", type=int, nargs=3, default=(0, 64, 0), metavar=("X", "Y", "Z"),
+                        help="with --world, block position of the image's top-left corner (default: 0 64 0)")
+    parser.add_argument("--no-lut", action="store_true", help="use a KDTree instead of the lookup table")
+    parser.add_argument("--stream", action="store_true", default=None,
+                        help="convert in horizontal strips with bounded memory (default: only for outputs "
+                             "above 16 megapixels)")
+    parser.add_argument("--memory-limit", type=int, default=64, metavar="MB",
+                        help="working memory per strip in streaming mode (default: 64)")
+    parser.add_argument("--tiles", action="store_true",
+                        help="split each image into map-sized tiles with a JSON manifest, rendered in parallel")
+    parser.add_argument("--tile-size", type=int, default=MAP_SIZE, help=f"tile size in blocks (default: {MAP_SIZE})")
+    parser.add_argument("--force", action="store_true", help="with --tiles, re-render tiles that did not change")
+    parser.add_argument("-r", "--recursive", action="store_true", help="search directories recursively")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: number of CPU cores)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="append per-stage timing spans as JSON lines to FILE ('-' for stderr)")
+    parser.add_argument("--profile", action="append", choices=instrument.PROFILERS, default=[],
+                        help="also capture a cProfile or tracemalloc profile of every conversion "
+                             "(repeatable; implies --trace - unless --trace is given)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always convert, without looking up or storing results in the result cache")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_RESULT_CACHE_BYTES >> 20, metavar="MB",
+                        help="size limit of the result cache, least recently used results are removed first "
+                             f"(default: {DEFAULT_RESULT_CACHE_BYTES >> 20})")
+    parser.add_argument("--cache-info", action="store_true", help="list the cached results and exit")
+    parser.add_argument("--clear-cache", action="store_true", help="remove all cached results and exit")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help="run an HTTP conversion service instead of converting files (POST /convert, "
+                             "GET /metrics); the other options become the defaults of its requests")
+    parser.add_argument("--queue", type=int, metavar="N",
+                        help="with --serve, conversions that may wait for a worker before uploads are "
+                             "refused with 429 (default: twice --jobs)")
+    parser.add_argument("--watch", metavar="DIR",
+                        help="keep converting images that appear or change in DIR into --output-dir (settings "
+                             "from the options, or from a photo.jpg.json file next to photo.jpg)")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE, metavar="SECONDS",
+                        help=f"with --watch, time a file must stay unchanged before it is converted "
+                             f"(default: {DEFAULT_SETTLE:g})")
+    parser.add_argument("--poll", action="store_true",
+                        help="with --watch, scan the folder every second instead of using inotify "
+                             "(needed for network shares)")
+    parser.add_argument("--build-luts", action="store_true",
+                        help="precompute the color lookup tables for both palettes (and --metric) and exit")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.trace or args.profile:
+        # Through the environment so worker processes pick it up however they are started
+        os.environ["PIXELART_TRACE"] = args.trace or "-"
+        os.environ["PIXELART_PROFILE"] = ",".join(args.profile)
+        instrument.configure_from_env()
+
+    try:
+        allowed_base_colors(args.only, args.exclude)  # Reject unknown block names before converting anything
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    if args.cache_info or args.clear_cache:
+        return manage_cache(ResultCache(max_bytes=args.cache_size << 20), args.clear_cache)
+    results = None if args.no_cache else ResultCache(max_bytes=args.cache_size << 20)
+
+    if args.build_luts:
+        for shade in (False, True):
+            palette = select_palette(shade, args.only, args.exclude)
+            load_lut(palette, metric=args.metric)  # Builds the table if missing or outdated
+            print(f"{'extended_colors' if shade else 'base_colors'}: {lut_path(palette, metric=args.metric)}")
+        return 0
+
+    paths = collect_inputs(args.inputs, args.recursive)
+    if not paths and not (args.serve or args.watch):
+        print("No input images found.", file=sys.stderr)
+        return 2
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    options = ConvertOptions(crop=args.crop, fill_color=args.fill, shade=args.shade, metric=args.metric,
+                             dither=args.dither, include_blocks=args.only and tuple(args.only),
+                             exclude_blocks=tuple(args.exclude),
+                             use_lut=not args.no_lut, schematic=not args.no_schematic,
+                             schematic_writer=args.schematic_writer, mcfunction=args.mcfunction,
+                             streaming=args.stream,
+                             memory_limit=args.memory_limit << 20)
+    if options.use_lut:
+        load_lut(options_palette(options), metric=options.metric)  # Built once here, workers only map the table
+
+    if args.serve:
+        from .server import serve  # Imported here: the HTTP and multipart parsing modules only matter when serving
+        return serve(args.serve, max(1, args.jobs), args.queue, options, results)
+    if args.watch:
+        try:
+            return watch_folder(args.watch, args.output_dir, args.width, args.height, options, args.frames,
+                                args.layered, max(1, args.jobs), args.settle, args.poll, results=results,
+                                log=lambda message: print(message, flush=True))
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 2
+
+    if args.tiles:
+        return convert_tiles(paths, args, options)
+    if args.world:
+        if len(paths) != 1:
+            print("--world places exactly one image.", file=sys.stderr)
+            return 2
+        return place_in_world(paths[0], args, options)
+
+    jobs = max(1, min(args.jobs, len(paths)))
+    failures = 0
+    start = time.perf_counter()
+
+    def report(path, outputs, seconds, rss, commands, error):
+        nonlocal failures
+        if error:
+            failures += 1
+            print(f"FAILED {path} ({seconds:.2f}s): {error}", file=sys.stderr)
+        else:
+            memory = "" if rss is None else f", peak RSS {rss / (1 << 20):.0f} MB"
+            print(f"{path} ({seconds:.2f}s{memory}) -> {', '.join(outputs)}")
+            if commands is not None:
+                print(f"  {commands.commands} commands ({commands.fills} fill, {commands.setblocks} setblock) "
+                      f"for {commands.blocks} blocks, {commands.compression:.1f} blocks per command")
+                if commands.commands > MAX_COMMAND_CHAIN:
+                    print(f"  warning: more than {MAX_COMMAND_CHAIN} commands, raise the maxCommandChainLength "
+                          f"gamerule before running the function", file=sys.stderr)
+
+    if jobs == 1:
+        for path in paths:
+            report(*convert_file(path, args.output_dir, args.width, args.height, options, args.frames,
+                                 args.layered, results))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(convert_file, path, args.output_dir, args.width, args.height, options,
+                                   args.frames, args.layered, results) for path in paths]
+            for future in as_completed(futures):
+                report(*future.result())
+
+    elapsed = time.perf_counter() - start
+    print(f"Converted {len(paths) - failures}/{len(paths)} images in {elapsed:.2f}s "
+          f"({len(paths) / elapsed:.1f} images/s, {jobs} worker{'s' if jobs > 1 else ''})")
+    return 1 if failures else 0
+
+
+# List (or clear) the result cache
+def manage_cache(results, clear=False):
+    if clear:
+        removed = results.clear()
+        print(f"Removed {removed} cached result{'s' if removed != 1 else ''} from {results.path}")
+        return 0
+    entries = results.entries()
+    for entry in reversed(entries):  # Most recently used first
+        used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.last_used))
+        print(f"{entry.key}  {used}  {entry.size / (1 << 20):8.1f} MB  {entry.width}x{entry.height}  "
+              f"{'+'.join(entry.files)}  {entry.source or '(image)'}")
+    total = sum(entry.size for entry in entries)
+    print(f"{len(entries)} cached results, {total / (1 << 20):.1f} MB of {results.max_bytes / (1 << 20):.0f} MB "
+          f"in {results.path}")
+    return 0
+
+
+# World mode: convert one image in memory and write it into the world's region files
+def place_in_world(path, args, options):
+    start = time.perf_counter()
+    try:
+        result = convert(path, args.width, args.height, options)
+        stats = write_to_world(result.idx, args.world, tuple(args.origin), result.palette)
+    except Exception as e:
+        print(f"FAILED {path} ({time.perf_counter() - start:.2f}s): {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    height, width = result.idx.shape
+    x, y, z = args.origin
+    print(f"{path} ({time.perf_counter() - start:.2f}s) -> {args.world}: {stats.blocks} blocks from "
+          f"({x}, {y}, {z}) to ({x + width - 1}, {y}, {z + height - 1}) in {stats.chunks} chunks "
+          f"({stats.created_chunks} new) of {stats.regions} region files")
+    return 0
+
+
+# Tiled mode: one image at a time, with the worker pool spread over its tiles
+def convert_tiles(paths, args, options):
+    failures = 0
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            result = convert_tiled(path, args.width, args.height, options, args.output_dir,
+                                   tile_size=args.tile_size, jobs=max(1, args.jobs), force=args.force)
+        except Exception as e:
+            failures += 1
+            print(f"FAILED {path} ({time.perf_counter() - start:.2f}s): {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        print(f"{path} ({time.perf_counter() - start:.2f}s, {result.rendered} tiles rendered, "
+              f"{result.reused} unchanged) -> {result.manifest_path}")
+    return 1 if failures else 0
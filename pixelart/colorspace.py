@@ -0,0 +1,109 @@
+import numpy as np  # Import NumPy for array and numerical calculations
+
+# sRGB (D65) -> CIE XYZ matrix
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])  # Reference white for CIELAB
+
+# OKLab matrices (linear sRGB -> LMS, cube-rooted LMS -> Lab), from Björn Ottosson's definition
+_RGB_TO_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+_LMS_TO_OKLAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+
+
+# Convert sRGB values (0-255, any shape (..., 3)) to linear-light RGB in 0-1
+def srgb_to_linear(rgb):
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+_LINEAR_TABLE = srgb_to_linear(np.arange(256))  # Per-channel table for uint8 input
+
+
+# Linear RGB for uint8 input (table lookup) or arbitrary values (formula)
+def _linear(rgb):
+    rgb = np.asarray(rgb)
+    if rgb.dtype == np.uint8:
+        return _LINEAR_TABLE[rgb]
+    return srgb_to_linear(rgb)
+
+
+# Convert sRGB (0-255) to OKLab
+def rgb_to_oklab(rgb):
+    lms = _linear(rgb) @ _RGB_TO_LMS.T
+    return np.cbrt(lms) @ _LMS_TO_OKLAB.T
+
+
+# Convert sRGB (0-255) to CIELAB (D65)
+def rgb_to_lab(rgb):
+    xyz = (_linear(rgb) @ _RGB_TO_XYZ.T) / _D65_WHITE
+    delta = 6 / 29
+    f = np.where(xyz > delta ** 3, np.cbrt(xyz), xyz / (3 * delta ** 2) + 4 / 29)
+    L = 116 * f[..., 1] - 16
+    a = 500 * (f[..., 0] - f[..., 1])
+    b = 200 * (f[..., 1] - f[..., 2])
+    return np.stack([L, a, b], axis=-1)
+
+
+# CIEDE2000 color difference between CIELAB arrays (broadcasting over leading dimensions)
+def delta_e_2000(lab1, lab2):
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(a2, b2)
+    C_bar7 = ((C1 + C2) / 2) ** 7
+    G = 0.5 * (1 - np.sqrt(C_bar7 / (C_bar7 + 25.0 ** 7)))
+    a1p = (1 + G) * a1
+    a2p = (1 + G) * a2
+    C1p = np.hypot(a1p, b1)
+    C2p = np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    dLp = L2 - L1
+    dCp = C2p - C1p
+    dhp = h2p - h1p
+    dhp = np.where(dhp > 180, dhp - 360, np.where(dhp < -180, dhp + 360, dhp))
+    dhp = np.where(C1p * C2p == 0, 0, dhp)
+    dHp = 2 * np.sqrt(C1p * C2p) * np.sin(np.radians(dhp) / 2)
+
+    Lp_bar = (L1 + L2) / 2
+    Cp_bar = (C1p + C2p) / 2
+    hp_sum = h1p + h2p
+    hp_bar = np.where(np.abs(h1p - h2p) > 180,
+                      np.where(hp_sum < 360, hp_sum + 360, hp_sum - 360), hp_sum) / 2
+    hp_bar = np.where(C1p * C2p == 0, hp_sum, hp_bar)
+
+    T = (1 - 0.17 * np.cos(np.radians(hp_bar - 30)) + 0.24 * np.cos(np.radians(2 * hp_bar))
+         + 0.32 * np.cos(np.radians(3 * hp_bar + 6)) - 0.20 * np.cos(np.radians(4 * hp_bar - 63)))
+    d_theta = 30 * np.exp(-(((hp_bar - 275) / 25) ** 2))
+    Cp_bar7 = Cp_bar ** 7
+    R_C = 2 * np.sqrt(Cp_bar7 / (Cp_bar7 + 25.0 ** 7))
+    S_L = 1 + 0.015 * (Lp_bar - 50) ** 2 / np.sqrt(20 + (Lp_bar - 50) ** 2)
+    S_C = 1 + 0.045 * Cp_bar
+    S_H = 1 + 0.015 * Cp_bar * T
+    R_T = -np.sin(np.radians(2 * d_theta)) * R_C
+
+    return np.sqrt((dLp / S_L) ** 2 + (dCp / S_C) ** 2 + (dHp / S_H) ** 2
+                   + R_T * (dCp / S_C) * (dHp / S_H))
+
+
+# Squared "redmean" weighted RGB distance between every color in rgb (N, 3) and palette (P, 3) -> (N, P)
+def redmean_distance_sq(rgb, palette):
+    rgb = np.asarray(rgb, dtype=np.float32)[:, None, :]
+    palette = np.asarray(palette, dtype=np.float32)[None, :, :]
+    r_mean = (rgb[..., 0] + palette[..., 0]) / 2
+    d = rgb - palette
+    return ((2 + r_mean / 256) * d[..., 0] ** 2 + 4 * d[..., 1] ** 2
+            + (2 + (255 - r_mean) / 256) * d[..., 2] ** 2)
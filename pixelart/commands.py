@@ -0,0 +1,182 @@
+import os  # OS-related functions (path handling, etc.)
+from dataclasses import dataclass
+import numpy as np  # Import NumPy for array and numerical calculations
+from .atomic import atomic_path
+from .compiled import compile_palette
+from .memory import release_pages
+from .palettes import base_colors
+
+FILL_LIMIT = 32768  # Most blocks one /fill command may change
+MAX_COMMAND_CHAIN = 65536  # Default maxCommandChainLength: longer functions are cut off unless it is raised
+WRITE_RECTANGLES = 1 << 14  # Commands formatted and written at a time
+PROGRESS_ROWS = 256  # Rows between progress callbacks
+
+
+# Command counts of an exported function
+@dataclass
+class CommandStats:
+    blocks: int = 0  # Non-air blocks placed (in a delta, also blocks cleared to air)
+    fills: int = 0  # /fill commands (rectangles of two or more blocks)
+    setblocks: int = 0  # /setblock commands (single blocks)
+
+    @property
+    def commands(self):
+        return self.fills + self.setblocks
+
+    # Blocks placed per command (1.0 would be one /setblock per block)
+    @property
+    def compression(self):
+        return self.blocks / self.commands if self.commands else 0.0
+
+
+# Same-block runs of one row of block indices: (start column, end column (inclusive), block), air skipped
+def row_runs(row):
+    if len(row) == 0:
+        return row[:0], row[:0], row[:0]
+    change = np.flatnonzero(row[1:] != row[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [len(row)])) - 1
+    blocks = row[starts]
+    solid = blocks != 0
+    return starts[solid], ends[solid], blocks[solid]
+
+
+# Greedy rectangle cover of rows of block indices (0 = air, left empty; rows is any iterable of equally
+# long 1D arrays): row runs are found with NumPy and a run that repeats exactly in the next row extends
+# its rectangle downwards. Yields (x0, z0, x1, z1, block) arrays of finished rectangles (inclusive
+# corners), a batch per row.
+def fill_rectangles(rows):
+    empty = np.empty(0, dtype=np.int64)
+    keys = empty  # (block, x0, x1) of the open rectangles, sorted
+    open_x0 = open_x1 = open_block = open_z0 = empty
+    scale = np.int64(1)
+    for z, row in enumerate(_closing(rows)):
+        if row is None:
+            x0 = x1 = block = empty  # Close everything after the last row
+        else:
+            x0, x1, block = (a.astype(np.int64) for a in row_runs(np.asarray(row)))
+            scale = np.int64(len(row) + 1)
+        row_keys = (block * scale + x0) * scale + x1  # (block, x0, x1) packed into one integer
+        pos = np.searchsorted(keys, row_keys)
+        pos[pos == len(keys)] = 0
+        continued = (keys[pos] == row_keys) if len(keys) else np.zeros(len(row_keys), dtype=bool)
+        closed = np.ones(len(keys), dtype=bool)
+        closed[pos[continued]] = False
+        if closed.any():
+            z1 = np.full(int(closed.sum()), z - 1, dtype=np.int64)
+            yield open_x0[closed], open_z0[closed], open_x1[closed], z1, open_block[closed]
+        z0 = np.full(len(row_keys), z, dtype=np.int64)
+        z0[continued] = open_z0[pos[continued]]
+        order = np.argsort(row_keys, kind="stable")
+        keys, open_x0, open_x1, open_block, open_z0 = (a[order] for a in (row_keys, x0, x1, block, z0))
+
+
+def _closing(rows):
+    yield from rows
+    yield None
+
+
+# Split rectangles larger than FILL_LIMIT blocks into bands of rows (and columns, for very wide ones)
+def split_rectangles(x0, z0, x1, z1, block):
+    big = (x1 - x0 + 1) * (z1 - z0 + 1) > FILL_LIMIT
+    if not big.any():
+        return x0, z0, x1, z1, block
+    pieces = [(x0[~big], z0[~big], x1[~big], z1[~big], block[~big])]
+    for rx0, rz0, rx1, rz1, b in zip(x0[big], z0[big], x1[big], z1[big], block[big]):
+        columns = min(rx1 - rx0 + 1, FILL_LIMIT)
+        rows = FILL_LIMIT // columns
+        xs = np.arange(rx0, rx1 + 1, columns)
+        zs = np.arange(rz0, rz1 + 1, rows)
+        px, pz = np.meshgrid(xs, zs)
+        px, pz = px.ravel(), pz.ravel()
+        pieces.append((px, pz, np.minimum(px + columns - 1, rx1), np.minimum(pz + rows - 1, rz1),
+                       np.full(len(px), b)))
+    return tuple(np.concatenate(parts) for parts in zip(*pieces))
+
+
+# Write /fill (and /setblock, for single blocks) commands that build the art in a .mcfunction file,
+# relative to the position the function runs at: image columns along +x, rows along +z, all at ~y.
+# Air is skipped, so existing blocks there stay. Shades of a color share one block (and rectangle).
+# idx_matrix indexes palette (base_colors by default); progress(fraction) is called as rows finish.
+# previous: index array of art that is already built (such as the last animation frame); only blocks
+# that differ from it are written, including air where a block has to be cleared, and only the rows and
+# columns around the changes are scanned. Returns CommandStats.
+def write_mcfunction(idx_matrix, path, palette=None, progress=None, previous=None):
+    idx = np.asarray(idx_matrix)
+    if idx.ndim != 2:
+        raise ValueError(f"Expected a 2D index array, got shape {idx.shape}")
+    palette = compile_palette(base_colors if palette is None else palette)
+    block_of = np.zeros(max(256, len(palette)), dtype=np.int64)  # Palette index -> block, past the palette air
+    block_of[:len(palette)] = palette.block
+    names = np.array(palette.blocks, dtype=object)
+    stats = CommandStats()
+    top = left = 0  # Position of the scanned area
+    if previous is not None:
+        previous = np.asarray(previous)
+        if previous.shape != idx.shape:
+            raise ValueError(f"Previous index array has shape {previous.shape}, expected {idx.shape}")
+        changed = idx != previous  # Changed indices, then within their bounding box, changed blocks
+        changed_rows, changed_cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+        if len(changed_rows) == 0:
+            changed_rows = changed_cols = np.zeros(1, dtype=np.int64)  # Nothing to write: scan one cell
+        top, left = changed_rows[0], changed_cols[0]
+        box = np.s_[top:changed_rows[-1] + 1, left:changed_cols[-1] + 1]
+        blocks = block_of[idx[box]]
+        # Block code 0 = unchanged (skipped), otherwise 1 + block, so that air can be placed as well
+        idx = np.where(blocks != block_of[previous[box]], blocks + 1, 0)
+        block_of = np.arange(len(names) + 1)
+        names = np.concatenate([[None], names])
+    height = idx.shape[0]
+
+    def rows():
+        for z in range(height):
+            if z % PROGRESS_ROWS == 0:
+                release_pages(idx)  # Keep a file-backed index array from piling up in memory
+                if progress is not None:
+                    progress(z / height)
+            yield block_of[idx[z]]
+
+    def write(f, batch):
+        x0, z0, x1, z1, block = split_rectangles(*(np.concatenate(a) for a in zip(*batch)))
+        _write_commands(f, (x0 + left, z0 + top, x1 + left, z1 + top, block), names, stats)
+
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        batch = []
+        for rectangles in fill_rectangles(rows()):
+            batch.append(rectangles)
+            if sum(len(r[0]) for r in batch) >= WRITE_RECTANGLES:
+                write(f, batch)
+                batch = []
+        if batch:
+            write(f, batch)
+    if progress is not None:
+        progress(1.0)
+    return stats
+
+
+def _write_commands(f, rectangles, names, stats):
+    x0, z0, x1, z1, block = rectangles
+    single = (x0 == x1) & (z0 == z1)
+    stats.blocks += int(((x1 - x0 + 1) * (z1 - z0 + 1)).sum())
+    stats.setblocks += int(single.sum())
+    stats.fills += int((~single).sum())
+    f.writelines(f"setblock ~{x} ~ ~{z} {name}\n" if one else f"fill ~{a} ~ ~{b} ~{c} ~ ~{d} {name}\n"
+                 for one, x, z, a, b, c, d, name in zip(single, x0, z0, x0, z0, x1, z1, names[block]))
+
+
+# Path of the {name}.mcfunction next to output_path
+# Minecraft function names may only use lowercase letters, digits, "_", "-" and ".".
+def mcfunction_path(output_path, name):
+    function_name = "".join(c if c.isascii() and (c.isalnum() or c in "_-.") else "_" for c in name.lower())
+    return os.path.join(os.path.dirname(output_path), f"{function_name}.mcfunction")
+
+
+# Write {name}.mcfunction next to output_path (atomically, like the schematic); returns (path, CommandStats)
+# previous: already built index array, to write only the changes (see write_mcfunction)
+# group: optional pixelart.atomic.atomic_group() list the file joins instead of appearing on its own
+def create_mcfunction_from_idx_matrix(idx_matrix, output_path, name, palette=None, progress=None, previous=None,
+                                      group=None):
+    function_path = mcfunction_path(output_path, name)
+    with atomic_path(function_path, group) as temp_path:
+        stats = write_mcfunction(idx_matrix, temp_path, palette, progress, previous)
+    return function_path, stats
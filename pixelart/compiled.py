@@ -0,0 +1,98 @@
+from collections import OrderedDict  # LRU order of the compiled palettes
+from dataclasses import dataclass
+from functools import cached_property  # For building the search index on first use
+import numpy as np  # Import NumPy for array and numerical calculations
+from .blocks import get_block_mapping
+from .palettes import NORMAL_SHADE, SHADED_BASE_COLORS, base_colors, extended_colors
+from .quantize import get_matcher
+
+CACHED_PALETTES = 16  # Compiled palettes remembered by list identity, least recently used dropped first
+
+_compiled = OrderedDict()  # id(palette list) -> (palette list, CompiledPalette)
+_sources = None  # (r, g, b) -> (base color index, shade level), built on first use
+
+
+# Immutable per-palette tables, built once, so quantizing, rendering and schematic writing are array lookups.
+# Entry i of every array describes palette index i; placeholder (air) entries have base 0 and block 0.
+@dataclass(frozen=True, eq=False)
+class CompiledPalette:
+    colors: tuple  # The palette's (r, g, b) entries, placeholders included
+    rgb: np.ndarray  # (n, 3) uint8 colors, placeholders black
+    valid: np.ndarray  # (n,) bool, False for placeholders
+    rgba: np.ndarray  # (n, 4) uint8 rendering table, index 0 (air) transparent
+    base: np.ndarray  # (n,) index into base_colors
+    shade: np.ndarray  # (n,) shade level, index into SHADE_MULTIPLIERS
+    block: np.ndarray  # (n,) index into blocks
+    blocks: tuple  # Distinct Minecraft block ids, blocks[0] is air
+
+    def __len__(self):
+        return len(self.colors)
+
+    # Nearest-color search index for the rgb metric, built on the first search (conversions through a
+    # lookup table never need it)
+    @cached_property
+    def index(self):
+        return get_matcher(self.colors)
+
+    # Nearest-color search for a metric (rgb uses the palette's own index)
+    def matcher(self, metric="rgb"):
+        return self.index if metric == "rgb" else get_matcher(self.colors, metric)
+
+
+# Base color and shade level of every color that extended_colors or base_colors contains
+def color_sources():
+    global _sources
+    if _sources is None:
+        sources = {}
+        for i, color in enumerate(extended_colors):
+            if i < 4 * SHADED_BASE_COLORS:
+                sources.setdefault(tuple(color), (i // 4, i % 4))
+            else:
+                sources.setdefault(tuple(color), (SHADED_BASE_COLORS + i - 4 * SHADED_BASE_COLORS, NORMAL_SHADE))
+        for i, color in enumerate(base_colors):
+            sources.setdefault(tuple(color), (i, NORMAL_SHADE))
+        _sources = sources
+    return _sources
+
+
+def _compile(colors):
+    table = np.array(colors, dtype=np.int64).reshape(-1, 3)
+    valid = ((table >= 0) & (table <= 255)).all(axis=1)
+    rgb = np.where(valid[:, None], table, 0).astype(np.uint8)
+    rgba = np.zeros((len(colors), 4), dtype=np.uint8)
+    rgba[1:, :3] = np.clip(table[1:], 0, 255)  # Placeholder colors are never produced
+    rgba[1:, 3] = 255
+
+    # Colors that are not Minecraft map colors (and placeholders) stay air, like unmapped block indices
+    sources = color_sources()
+    base = np.zeros(len(colors), dtype=np.int64)
+    shade = np.full(len(colors), NORMAL_SHADE, dtype=np.int64)
+    for i, color in enumerate(colors):
+        if valid[i] and color in sources:
+            base[i], shade[i] = sources[color]
+
+    # Several base colors share a block (the custom pinks, two orange terracottas): keep one entry each
+    block_mapping = get_block_mapping()
+    blocks = {"minecraft:air": 0}
+    base_block = [blocks.setdefault(block_mapping.get(k, "minecraft:air"), len(blocks))
+                  for k in range(len(base_colors))]
+    block = np.array(base_block, dtype=np.int64)[base]
+
+    for array in (rgb, valid, rgba, base, shade, block):
+        array.flags.writeable = False
+    return CompiledPalette(colors=colors, rgb=rgb, valid=valid, rgba=rgba, base=base, shade=shade, block=block,
+                           blocks=tuple(blocks))
+
+
+# Compiled form of a palette (a list of (r, g, b) colors such as base_colors, or a CompiledPalette).
+# The same list object is compiled only once.
+def compile_palette(palette):
+    if isinstance(palette, CompiledPalette):
+        return palette
+    entry = _compiled.get(id(palette))
+    if entry is None or entry[0] is not palette:
+        entry = _compiled[id(palette)] = (palette, _compile(tuple(map(tuple, palette))))
+        if len(_compiled) > CACHED_PALETTES:
+            _compiled.popitem(last=False)
+    _compiled.move_to_end(id(palette))
+    return entry[1]
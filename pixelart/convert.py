@@ -0,0 +1,334 @@
+import os  # OS-related functions (path handling, etc.)
+from dataclasses import dataclass, field
+import numpy as np  # Import NumPy for array and numerical calculations
+from PIL import Image  # Import library for image processing
+from .atomic import atomic_group, atomic_path
+from .commands import create_mcfunction_from_idx_matrix
+from .compiled import compile_palette
+from .palettes import base_colors, extended_colors
+from .filters import filter_palette
+from .dither import DIFFUSION_KERNELS, dither_image
+from .lut import load_lut
+from .instrument import span
+from .memory import peak_rss
+from .png import PNGStreamWriter
+from .schematic import create_schematic_from_idx_matrix
+
+STREAMING_PIXELS = 4096 * 4096  # Outputs larger than this are converted in strips unless told otherwise
+DEFAULT_MEMORY_LIMIT = 64 << 20  # Working memory per strip in streaming mode (bytes)
+PNG_ROWS = 256  # Rows rendered and compressed at a time when saving the PNG
+
+# Conversion stages in order, with their rough share of the total time (for progress bars)
+STAGES = (("open", 0.05), ("resize", 0.10), ("quantize", 0.55), ("png", 0.15), ("schematic", 0.10),
+          ("commands", 0.05))
+
+
+# Raised (typically by a progress callback) to abort a conversion; no output files are left behind
+class ConversionCancelled(Exception):
+    pass
+
+
+# Overall completion in [0, 1] from a (stage, fraction of that stage) progress event
+def overall_progress(stage, fraction):
+    done = 0.0
+    for name, weight in STAGES:
+        if name == stage:
+            return min(1.0, done + weight * fraction)
+        done += weight
+    return 1.0
+
+
+# Single-argument progress callback for one stage, or None without a progress callback
+def stage_progress(progress, stage):
+    if progress is None:
+        return None
+    return lambda fraction: progress(stage, fraction)
+
+
+# Conversion settings (the same choices as the GUI options)
+@dataclass
+class ConvertOptions:
+    crop: bool = False  # Crop instead of stretching when the aspect ratio differs
+    fill_color: str = None  # Fill transparent pixels with this color (e.g. "#ffffff"), None keeps them as air
+    shade: bool = False  # Use the extended palette with shading
+    use_lut: bool = True  # Quantize with the precomputed lookup table instead of a KDTree
+    metric: str = "rgb"  # Color matching metric: "rgb", "redmean", "oklab", "cie76" or "ciede2000"
+    dither: str = "none"  # Dithering method from pixelart.dither.DITHER_METHODS
+    include_blocks: tuple = None  # Only use these blocks / categories (pixelart.filters.BLOCK_CATEGORIES)
+    exclude_blocks: tuple = ()  # Never use these blocks / categories
+    schematic: bool = True  # Also write a schematic next to the PNG
+    schematic_writer: str = "native"  # "native" streaming writer or the original "mcschematic" path
+    mcfunction: bool = False  # Also write /fill commands (.mcfunction) next to the PNG
+    streaming: bool = None  # Convert in horizontal strips; None decides from the output size
+    memory_limit: int = DEFAULT_MEMORY_LIMIT  # Working memory cap per strip in streaming mode (bytes)
+
+
+# Output of one conversion
+@dataclass
+class ConvertResult:
+    idx: np.ndarray  # (h, w) palette index array (uint8, uint16 past 256 colors), 0 = air
+    palette: list  # Palette the indices refer to
+    png_path: str = None  # Saved PNG path, if any
+    schematic_path: str = None  # Saved schematic path, if any
+    function_path: str = None  # Saved .mcfunction path, if any
+    command_stats: object = None  # pixelart.commands.CommandStats of the .mcfunction, if written
+    timings: dict = field(default_factory=dict)  # Seconds spent per stage
+    peak_rss: int = None  # Peak resident memory of the process in bytes, if the platform reports it
+
+
+# Palette used for the given shading option, restricted to the included and not excluded blocks
+def select_palette(shade, include=None, exclude=()):
+    return filter_palette(extended_colors if shade else base_colors, include, exclude)
+
+
+# Palette of a conversion's options
+def options_palette(options):
+    return select_palette(options.shade, options.include_blocks, options.exclude_blocks)
+
+
+# Default output file names, matching the GUI's save dialog
+def output_names(file_name, w, h, shade):
+    png_name = f"{file_name}_{w}x{h}_minecraftmap{'_noshade' if not shade else ''}.png"
+    schematic_name = f"{file_name}_{w}x{h}_pixelart"
+    return png_name, schematic_name
+
+
+# Target resolution: missing width or height is derived from the image aspect ratio (like the GUI entries)
+def target_size(image_size, width=None, height=None):
+    src_w, src_h = image_size
+    aspect_ratio = src_w / src_h
+    if width is None and height is None:
+        return src_w, src_h
+    if height is None:
+        return width, int(round(width / aspect_ratio, 0))
+    if width is None:
+        return int(round(height * aspect_ratio, 0)), height
+    return width, height
+
+
+# Open an image file (or take an already opened PIL image) as RGBA
+def open_rgba(source):
+    img = source if isinstance(source, Image.Image) else Image.open(source)
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')  # Convert to RGBA for transparency handling
+    return img
+
+
+# Intermediate resize size and crop offset for a (w, h) output: returns (resized_w, resized_h, left, top)
+# (without crop the image is simply stretched; with crop the aspect ratio is kept and the overflow
+# is cut off centered)
+def resize_geometry(src_size, w, h, crop=False):
+    if not crop:
+        return w, h, 0, 0
+    src_w, src_h = src_size
+    width_ratio = w / src_w
+    height_ratio = h / src_h
+    aspect_ratio = src_w / src_h
+    if width_ratio > height_ratio:
+        temp_h = int(round(w / aspect_ratio))
+        return w, temp_h, 0, (temp_h - h) // 2  # Crop vertically centered
+    temp_w = int(round(h * aspect_ratio))
+    return temp_w, h, (temp_w - w) // 2, 0  # Crop horizontally centered
+
+
+# Source region (left, top, right, bottom) a (w, h) output is sampled from: the whole image, or with crop
+# only the centered part that is left after cropping, in source pixel coordinates
+def resize_box(src_size, w, h, crop=False):
+    resized_w, resized_h, left, top = resize_geometry(src_size, w, h, crop)
+    scale_x, scale_y = src_size[0] / resized_w, src_size[1] / resized_h
+    return left * scale_x, top * scale_y, (left + w) * scale_x, (top + h) * scale_y
+
+
+# Resize image to (w, h), optionally keeping the aspect ratio and cropping the overflow centered
+# (only the source region left after cropping is resampled, instead of resizing everything and cropping)
+def resize_image(img, w, h, crop=False):
+    return img.resize((w, h), Image.Resampling.NEAREST, box=resize_box(img.size, w, h, crop))
+
+
+# Let a lazily opened JPEG decode at the smallest DCT scale (1/2, 1/4 or 1/8) that still keeps at least
+# one source pixel per pixel of the (w, h) output, so a 12 MP photo for a 128 block wide output decodes
+# 64 times fewer pixels. Does nothing for other formats and already decoded images. Call it after
+# target_size(), which needs the full size.
+def draft_image(img, w, h, crop=False):
+    resized_w, resized_h, _, _ = resize_geometry(img.size, w, h, crop)
+    img.draft(img.mode, (resized_w, resized_h))
+    return img
+
+
+# Composite the image over a solid background color so no pixel stays transparent
+def fill_transparent(img, color):
+    background = Image.new('RGBA', img.size, color)  # Create background color
+    return Image.alpha_composite(background, img)  # Alpha composite
+
+
+# (len(palette), 4) uint8 RGBA table for rendering indices; index 0 (air) is transparent (read-only)
+def palette_rgba(palette):
+    return compile_palette(palette).rgba
+
+
+# Create output RGBA image from palette indices (air stays transparent)
+def render_image(idx, palette):
+    return Image.fromarray(palette_rgba(palette)[idx], 'RGBA')
+
+
+# Window of the image shown zoom screen pixels per block (below 1 zooms out), rendered straight from the
+# index array with nearest-neighbor scaling: only the blocks under the width x height screen pixels starting
+# at (left, top) of the zoomed image are looked up. The window is clipped to the zoomed image, so the
+# returned RGBA image can be smaller than asked (air stays transparent).
+def render_view(idx, palette, left, top, width, height, zoom):
+    idx = np.asarray(idx)
+    rows = ((top + np.arange(max(height, 0))) / zoom).astype(np.intp)  # Block row under each screen row
+    cols = ((left + np.arange(max(width, 0))) / zoom).astype(np.intp)
+    rows, cols = rows[rows < idx.shape[0]], cols[cols < idx.shape[1]]
+    colors = palette_rgba(palette).view(np.uint32)[:, 0]  # Whole RGBA pixels, gathered as one word each
+    if zoom >= 1 and len(rows) and len(cols):
+        # Zoomed in: look up the few visible blocks once, then repeat each over the screen pixels it covers
+        view = colors[idx[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]]
+        if zoom > 1:
+            view = np.repeat(np.repeat(view, np.bincount(rows - rows[0]), axis=0), np.bincount(cols - cols[0]), axis=1)
+    else:
+        view = colors[idx.take(rows, axis=0).take(cols, axis=1)]  # Whole rows first, then columns (faster)
+    return Image.fromarray(view.view(np.uint8).reshape(len(rows), len(cols), 4), 'RGBA')
+
+
+# Whether a conversion of width x height pixels runs in streaming mode
+def use_streaming(options, width, height):
+    if options.streaming is not None:
+        return options.streaming
+    return width * height > STREAMING_PIXELS and options.dither not in DIFFUSION_KERNELS
+
+
+# Full conversion pipeline: open, resize/crop, fill, quantize, then save PNG and schematic if output_path is given
+# (width or height may be None to keep the source aspect ratio)
+# progress(stage, fraction) is called at every stage from STAGES and while quantizing and writing; it may
+# raise ConversionCancelled (or any exception) to stop the conversion without leaving partial files.
+# cache: optional pixelart.imagecache.ImageCache reusing decoded and resized images of a file path.
+# results: optional pixelart.resultcache.ResultCache; a conversion it already holds only places the cached
+# files at the output paths, and new conversions are added to it.
+def convert(source, width, height, options=None, output_path=None, schematic_name=None, progress=None,
+            cache=None, results=None):
+    options = options or ConvertOptions()
+    source_name = None if isinstance(source, Image.Image) else str(source)
+    with span("convert", source=source_name, metric=options.metric, dither=options.dither,
+              shade=options.shade) as run:
+        hit = None
+        if results is not None:
+            timings = {}
+            with span("cache", timings) as stage:
+                key, hit = results.get(source, width, height, options, output_path, schematic_name)
+                stage.update(hit=hit is not None)
+        result = hit
+        if result is None:
+            result = _convert(source, width, height, options, output_path, schematic_name, progress, cache)
+            if results is not None:
+                with span("cache", timings):
+                    results.put(key, result, source_name)
+        elif progress is not None:
+            progress("commands", 1.0)
+        if results is not None:
+            result.timings["cache"] = timings["cache"]
+        run.update(height=result.idx.shape[0], width=result.idx.shape[1], png=result.png_path,
+                   schematic=result.schematic_path, cached=hit is not None)
+    result.timings["total"] = run.seconds
+    result.peak_rss = peak_rss()
+    return result
+
+
+def _convert(source, width, height, options, output_path, schematic_name, progress, cache):
+    timings = {}
+    report = progress or (lambda stage, fraction: None)
+
+    report("open", 0.0)
+    with span("open", timings) as stage:
+        img = source if isinstance(source, Image.Image) else Image.open(source)  # Lazy: only reads the header
+        width, height = target_size(img.size, width, height)
+        stage.update(source_width=img.width, source_height=img.height, source_mode=img.mode)
+        streaming = use_streaming(options, width, height)
+        cached = cache is not None and not isinstance(source, Image.Image)
+        if cached and not streaming:
+            img.close()  # The cache decodes the file only if it has no matching resized image
+        elif not isinstance(source, Image.Image):
+            draft_image(img, width, height, options.crop)  # Streaming decodes the source strip by strip
+    if streaming:
+        from .streaming import convert_streaming  # Imported here: pixelart.streaming builds on this module
+        result = convert_streaming(img, width, height, options, output_path,
+                                   schematic_name or default_schematic_name(source, output_path, width, height,
+                                                                            options.shade), progress)
+        result.timings["open"] = result.timings.get("open", 0.0) + timings["open"]
+        return result
+
+    report("resize", 0.0)
+    with span("resize", timings, pixels=width * height, cached=cached):
+        if cached:
+            img_resized = cache.resized(source, width, height, options.crop, options.fill_color)
+        else:
+            img_resized = open_rgba(resize_image(img, width, height, options.crop))  # Convert only kept pixels
+            if options.fill_color is not None:
+                img_resized = fill_transparent(img_resized, options.fill_color)
+
+    report("quantize", 0.0)
+    with span("quantize", timings, pixels=width * height, lut=options.use_lut):
+        palette = options_palette(options)
+        lut = load_lut(palette, metric=options.metric) if options.use_lut else None
+        idx = dither_image(img_resized, palette, options.dither, lut=lut, metric=options.metric,
+                           progress=stage_progress(progress, "quantize"))
+
+    result = ConvertResult(idx=idx, palette=palette, timings=timings)
+    if output_path is not None:
+        if schematic_name is None:
+            schematic_name = default_schematic_name(source, output_path, width, height, options.shade)
+        save_outputs(result, output_path, schematic_name if options.schematic else None,
+                     options.schematic_writer, progress, schematic_name if options.mcfunction else None)
+    report("commands", 1.0)
+    return result
+
+
+# Same naming as the GUI when converting a file, otherwise follow the PNG name (None without output_path)
+def default_schematic_name(source, output_path, width, height, shade):
+    if output_path is None:
+        return None
+    if isinstance(source, Image.Image):
+        file_name = os.path.splitext(os.path.basename(output_path))[0]
+    else:
+        file_name = os.path.splitext(os.path.basename(source))[0]
+    return output_names(file_name, width, height, shade)[1]
+
+
+# Save the converted PNG and (unless schematic_name / function_name is None) the schematic and .mcfunction
+# in the same folder. All files appear together once the last one is complete; an error or cancellation
+# leaves none.
+def save_outputs(result, output_path, schematic_name=None, writer="native", progress=None, function_name=None):
+    report = progress or (lambda stage, fraction: None)
+    height, width = result.idx.shape
+    report("png", 0.0)
+    with atomic_group() as group, atomic_path(output_path, group) as temp_path:
+        with span("png", result.timings, pixels=width * height) as stage:
+            colors = palette_rgba(result.palette)
+            with PNGStreamWriter(temp_path, width, height) as png:  # Save PNG a block of rows at a time
+                for y0 in range(0, height, PNG_ROWS):
+                    report("png", y0 / height)
+                    png.write_rows(colors[result.idx[y0:y0 + PNG_ROWS]])
+            stage.update(bytes=os.path.getsize(temp_path))
+
+        if schematic_name is not None:
+            report("schematic", 0.0)
+            with span("schematic", result.timings, blocks=width * height, writer=writer) as stage:
+                result.schematic_path = create_schematic_from_idx_matrix(result.idx, output_path, schematic_name,
+                                                                         writer, stage_progress(progress, "schematic"),
+                                                                         palette=result.palette, group=group)
+                stage.update(bytes=os.path.getsize(group[-1][0]))  # Still under its temporary name
+        if function_name is not None:
+            save_commands(result, output_path, function_name, progress, group)
+    result.png_path = output_path
+    return result
+
+
+# Write the .mcfunction of a result next to output_path (group: see pixelart.atomic.atomic_group)
+def save_commands(result, output_path, function_name, progress=None, group=None):
+    if progress is not None:
+        progress("commands", 0.0)
+    with span("commands", result.timings, blocks=result.idx.size) as stage:
+        result.function_path, result.command_stats = create_mcfunction_from_idx_matrix(
+            result.idx, output_path, function_name, result.palette, stage_progress(progress, "commands"), group=group)
+        written = group[-1][0] if group is not None else result.function_path  # Temporary name inside a group
+        stage.update(commands=result.command_stats.commands, bytes=os.path.getsize(written))
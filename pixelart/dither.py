@@ -0,0 +1,164 @@
+from functools import lru_cache  # For building threshold matrices only once
+import numpy as np  # Import NumPy for array and numerical calculations
+from .compiled import compile_palette
+from .quantize import index_dtype, quantize_image
+
+# Ordered (threshold matrix) dithering methods
+ORDERED_METHODS = ("bayer2", "bayer4", "bayer8", "bluenoise")
+
+# Error diffusion kernels: (dx, dy, weight) offsets from the current pixel, and the weight divisor
+DIFFUSION_KERNELS = {
+    "floyd-steinberg": ([(1, 0, 7), (-1, 1, 3), (0, 1, 5), (1, 1, 1)], 16),
+    "atkinson": ([(1, 0, 1), (2, 0, 1), (-1, 1, 1), (0, 1, 1), (1, 1, 1), (0, 2, 1)], 8),  # Spreads 6/8
+    "sierra": ([(1, 0, 5), (2, 0, 3), (-2, 1, 2), (-1, 1, 4), (0, 1, 5), (1, 1, 4), (2, 1, 2),
+                (-1, 2, 2), (0, 2, 3), (1, 2, 2)], 32),
+}
+
+DITHER_METHODS = ("none",) + ORDERED_METHODS + tuple(DIFFUSION_KERNELS)
+DEFAULT_STRENGTH = 48  # Amplitude of ordered dithering in RGB units (roughly the palette color spacing)
+
+
+# Bayer threshold matrix of size n x n (n a power of two), values 0 .. n*n-1
+def bayer_matrix(n):
+    m = np.zeros((1, 1), dtype=np.int64)
+    while m.shape[0] < n:
+        m = np.block([[4 * m, 4 * m + 2], [4 * m + 3, 4 * m + 1]])
+    return m
+
+
+# Approximate blue noise: high-pass filtered white noise, rank-ordered to uniform thresholds
+@lru_cache(maxsize=1)
+def blue_noise_matrix(size=64, seed=0):
+    from scipy.ndimage import gaussian_filter  # Imported here: only the blue-noise texture needs scipy.ndimage
+    white = np.random.default_rng(seed).random((size, size))
+    high_pass = white - gaussian_filter(white, sigma=1.5, mode="wrap")  # Remove low frequencies
+    ranks = np.empty(size * size, dtype=np.int64)
+    ranks[np.argsort(high_pass, axis=None)] = np.arange(size * size)
+    return ranks.reshape(size, size)
+
+
+# Threshold offsets in [-0.5, 0.5) of an ordered method's matrix
+def _thresholds(method):
+    matrix = blue_noise_matrix() if method == "bluenoise" else bayer_matrix(int(method[len("bayer"):]))
+    return (matrix + 0.5) / matrix.size - 0.5
+
+
+# Threshold offsets for an ordered method, tiled over (h, w) starting at origin (x, y)
+# (so strips or tiles of one image continue the same pattern)
+def _threshold_map(method, h, w, origin=(0, 0)):
+    thresholds = _thresholds(method)
+    n = thresholds.shape[0]
+    rows = (origin[1] + np.arange(h)) % n
+    cols = (origin[0] + np.arange(w)) % n
+    return thresholds[rows[:, None], cols[None, :]]
+
+
+# Ordered dithering: add the tiled threshold pattern to every pixel at once, then quantize normally
+def ordered_dither(rgba, palette, method, lut=None, metric="rgb", strength=DEFAULT_STRENGTH, origin=(0, 0)):
+    h, w = rgba.shape[:2]
+    offset = (_threshold_map(method, h, w, origin) * strength)[..., None]
+    dithered = rgba.copy()
+    dithered[..., :3] = np.clip(np.rint(rgba[..., :3] + offset), 0, 255)  # Alpha (air mask) untouched
+    return quantize_image(dithered, palette, lut=lut, metric=metric)
+
+
+PROGRESS_ROWS = 64  # Rows quantized between progress callbacks
+PROGRESS_WAVEFRONTS = 64  # Error diffusion wavefronts between progress callbacks
+
+
+# Error diffusion processed in wavefronts: with t = x + slope * y, every pixel on one wavefront only
+# receives error from pixels on earlier wavefronts, so each wavefront is quantized in one vectorized
+# step and the result is identical to the usual pixel-by-pixel scan order. Pending error is kept in
+# skewed (wavefront, y) coordinates, where every kernel target of a wavefront is a contiguous slice,
+# in a small ring buffer covering only the wavefronts the kernel can reach.
+def error_diffusion_dither(rgba, palette, method, lut=None, metric="rgb", progress=None):
+    offsets, divisor = DIFFUSION_KERNELS[method]
+    h, w = rgba.shape[:2]
+    idx = np.zeros(h * w, dtype=index_dtype(len(palette)))  # Transparent pixels stay index 0 (air)
+    if h == 0 or w == 0:
+        return idx.reshape(h, w)
+
+    # Smallest slope so that every kernel target lies on a later wavefront than its source
+    slope = max(-dx // dy + 1 for dx, dy, _ in offsets if dy > 0)
+    targets = [(dx + slope * dy, dy, weight / divisor) for dx, dy, weight in offsets]  # (wavefront step, dy, w)
+    ring = max(step for step, _, _ in targets) + 1
+    rows = max(dy for _, dy, _ in targets)
+    pending = np.zeros((ring, h + rows, 3), dtype=np.float32)  # Error waiting for upcoming wavefronts
+
+    pixels = rgba.reshape(h * w, 4)
+    palette = compile_palette(palette)
+    palette_rgb = palette.rgb.astype(np.float32)  # Placeholder (air) colors are black
+    matcher = None if lut is not None else palette.matcher(metric)
+    lut = None if lut is None else np.asarray(lut)  # Plain ndarray view: avoids memmap overhead per gather
+    channel_weights = np.array([65536, 256, 1], dtype=np.int64)
+    ys_all = np.arange(h)
+
+    wavefronts = w + slope * (h - 1)
+    for t in range(wavefronts):
+        if progress is not None and t % PROGRESS_WAVEFRONTS == 0:
+            progress(t / wavefronts)
+        y0 = max(0, -(-(t - w + 1) // slope))
+        y1 = min(h - 1, t // slope) + 1
+        flat = ys_all[y0:y1] * (w - slope) + t  # y * w + x with x = t - slope * y
+        px = pixels[flat]
+        slot = pending[t % ring]
+        colors = px[:, :3] + slot[y0:y1]
+        quantized = np.clip(np.rint(colors), 0, 255).astype(np.int64)
+        if lut is not None:
+            nearest = lut[quantized @ channel_weights]
+        else:
+            nearest = matcher.nearest(quantized.astype(np.uint8))
+        idx[flat] = nearest
+        slot[:] = 0  # This ring slot is reused for wavefront t + ring
+
+        # Air pixels never pass error on; error sent into air or past the edges lands in slots never read
+        error = (colors - palette_rgb[nearest]) * (px[:, 3:] != 0)
+        for step, dy, weight in targets:
+            pending[(t + step) % ring, y0 + dy:y1 + dy] += error * weight
+
+    idx = idx.reshape(h, w)
+    idx[rgba[..., 3] == 0] = 0  # Transparent pixels are air
+    return idx
+
+
+# Quantize an RGBA image with the given dithering method ("none" = plain nearest color)
+# origin: position of img inside a larger image, for ordered dithering of strips and tiles
+# progress(fraction), if given, is called as the work advances (and may raise to abort)
+def dither_image(img, palette, method="none", lut=None, metric="rgb", strength=DEFAULT_STRENGTH, origin=(0, 0),
+                 progress=None):
+    rgba = np.asarray(img, dtype=np.uint8)
+    palette = compile_palette(palette)
+    if progress is not None and method not in DIFFUSION_KERNELS and len(rgba) > PROGRESS_ROWS:
+        # Rows are independent here, so quantize a block of rows at a time between callbacks
+        idx = np.empty(rgba.shape[:2], dtype=index_dtype(len(palette)))
+        for y0 in range(0, len(rgba), PROGRESS_ROWS):
+            progress(y0 / len(rgba))
+            idx[y0:y0 + PROGRESS_ROWS] = dither_image(rgba[y0:y0 + PROGRESS_ROWS], palette, method, lut, metric,
+                                                      strength, (origin[0], origin[1] + y0))
+        return idx
+    if method == "none":
+        return quantize_image(rgba, palette, lut=lut, metric=metric)
+    if rgba.ndim != 3 or rgba.shape[2] != 4:
+        raise ValueError(f"Expected an RGBA image, got array of shape {rgba.shape}")
+    if method in ORDERED_METHODS:
+        return ordered_dither(rgba, palette, method, lut=lut, metric=metric, strength=strength, origin=origin)
+    if method in DIFFUSION_KERNELS:
+        return error_diffusion_dither(rgba, palette, method, lut=lut, metric=metric, progress=progress)
+    raise ValueError(f"Unknown dithering method {method!r}, expected one of {', '.join(DITHER_METHODS)}")
+
+
+# Quantize scattered pixels of an image: pixels is an (n, 4) RGBA array found at rows ys and columns xs.
+# Gives exactly the indices dither_image would give those pixels, so changed pixels of an image can be
+# re-quantized alone. Only for methods where every pixel is independent ("none" and ordered dithering).
+def dither_pixels(pixels, ys, xs, palette, method="none", lut=None, metric="rgb", strength=DEFAULT_STRENGTH):
+    pixels = np.asarray(pixels, dtype=np.uint8).reshape(1, -1, 4)  # One-row image
+    if method in ORDERED_METHODS:
+        thresholds = _thresholds(method)
+        n = thresholds.shape[0]
+        offset = (thresholds[np.asarray(ys) % n, np.asarray(xs) % n] * strength)[None, :, None]
+        dithered = pixels.copy()
+        dithered[..., :3] = np.clip(np.rint(pixels[..., :3] + offset), 0, 255)
+        pixels = dithered
+    elif method != "none":
+        raise ValueError(f"Dithering method {method!r} spreads error between pixels, quantize the whole image")
+    return quantize_image(pixels, palette, lut=lut, metric=metric)[0]
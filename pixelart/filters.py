@@ -0,0 +1,79 @@
+from collections import OrderedDict  # LRU order of the filtered palettes
+from .blocks import get_block_mapping
+from .compiled import compile_palette
+
+PLACEHOLDER = (9999, 9999, 9999)  # Palette entry that is never matched (same as the air entries)
+FILTERED_PALETTES = 32  # Filtered palettes remembered, least recently used dropped first
+
+# Named groups of blocks that builds often have to avoid (or stick to)
+BLOCK_CATEGORIES = {
+    "gravity": ("minecraft:sand",),  # Falls when the block below is missing
+    "explosive": ("minecraft:tnt",),
+    "fluid": ("minecraft:water",),  # Flows unless every side is closed
+    "melting": ("minecraft:ice",),  # Melts next to light sources
+    "needs_support": ("minecraft:glow_lichen",),  # Must be attached to another block
+    "nether": ("minecraft:netherrack", "minecraft:crimson_nylium", "minecraft:crimson_stem",
+               "minecraft:crimson_hyphae", "minecraft:warped_nylium", "minecraft:warped_stem",
+               "minecraft:warped_hyphae", "minecraft:warped_wart_block"),
+    "precious": ("minecraft:iron_block", "minecraft:gold_block", "minecraft:diamond_block",
+                 "minecraft:lapis_block", "minecraft:emerald_block", "minecraft:raw_iron_block"),  # Costly in survival
+    "custom": ("minecraft:pink_concrete",),  # Extra pinks whose colors maps do not actually show
+    "wool": tuple(f"minecraft:{color}_wool" for color in (
+        "white", "magenta", "light_blue", "yellow", "lime", "pink", "gray", "light_gray", "cyan", "purple",
+        "blue", "brown", "green", "red", "black")),
+    "terracotta": tuple(f"minecraft:{color}_terracotta" for color in (
+        "white", "orange", "magenta", "light_blue", "yellow", "lime", "pink", "gray", "light_gray", "cyan",
+        "purple", "blue", "brown", "green", "red", "black")),
+}
+
+_filtered = OrderedDict()  # (id(palette list), allowed base colors) -> (palette list, filtered list)
+
+
+# Block ids named by a list of category names and block ids ("minecraft:sand" or just "sand")
+def resolve_blocks(names):
+    known = set(get_block_mapping().values())
+    blocks = set()
+    for name in names:
+        name = name.strip().lower()
+        if name in BLOCK_CATEGORIES:
+            blocks.update(BLOCK_CATEGORIES[name])
+        elif (name if ":" in name else "minecraft:" + name) in known:
+            blocks.add(name if ":" in name else "minecraft:" + name)
+        else:
+            raise ValueError(f"Unknown block or category {name!r}, categories are {', '.join(BLOCK_CATEGORIES)}")
+    return blocks
+
+
+# Indices into base_colors whose blocks pass the filter: in include (every block when include is empty or
+# None) and not in exclude. Both are lists of category names and block ids.
+def allowed_base_colors(include=None, exclude=()):
+    mapping = get_block_mapping()
+    included = resolve_blocks(include) if include else None
+    excluded = resolve_blocks(exclude or ())
+    return frozenset(k for k, block in mapping.items() if block != "minecraft:air"
+                     and (included is None or block in included) and block not in excluded)
+
+
+# Palette restricted to the blocks that pass the filter (see allowed_base_colors). Excluded colors are
+# replaced by placeholders, so the indices (and blocks) of the remaining colors stay the same. Returns
+# palette itself without a filter, and the same list object for the same subset, so its compiled tables,
+# search index and lookup table (stored on disk under the hash of its contents) are built only once.
+def filter_palette(palette, include=None, exclude=()):
+    if not include and not exclude:
+        return palette
+    allowed = allowed_base_colors(include, exclude)
+    key = (id(palette), allowed)
+    entry = _filtered.get(key)
+    if entry is not None and entry[0] is palette:
+        _filtered.move_to_end(key)
+        return entry[1]
+
+    compiled = compile_palette(palette)
+    filtered = [color if valid and base in allowed else PLACEHOLDER
+                for color, valid, base in zip(compiled.colors, compiled.valid, compiled.base)]
+    if all(color == PLACEHOLDER for color in filtered):
+        raise ValueError("The block filter leaves no colors to match")
+    _filtered[key] = (palette, filtered)
+    if len(_filtered) > FILTERED_PALETTES:
+        _filtered.popitem(last=False)
+    return filtered
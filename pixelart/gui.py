@@ -0,0 +1,642 @@
+# Tkinter window shared by the English and Korean front ends, which only pass in their string tables.
+# The engine package never imports this module, so headless use does not load tkinter.
+from PIL import Image, ImageTk  # Import libraries for image processing and displaying images in Tkinter
+import tkinter as tk  # Import Tkinter for GUI creation
+from tkinter import filedialog, messagebox, colorchooser  # Import file dialog, message box, and color chooser
+from tkinter import ttk  # Themed widgets (progress bar)
+import math  # For the size of the zoomed result
+import os  # Import OS-related functions (path handling, etc.)
+from .animation import convert_animation, frame_count  # Every frame of animated GIFs
+from .camera import CameraSession, LiveConverter  # Raspberry Pi camera (or synthetic stand-in) kept open
+from .convert import ConversionCancelled, ConvertOptions, convert, output_names, overall_progress, render_view
+from .dither import DITHER_METHODS
+from .filters import BLOCK_CATEGORIES  # Named block groups for the block filter
+from .imagecache import ImageCache  # Decoded/resized images reused across GO clicks
+from .quantize import METRICS
+from .resultcache import ResultCache  # Finished conversions reused when the same image and settings come again
+import time  # For naming camera captures
+import threading  # For running the conversion in the background
+import queue  # For passing progress events from the worker to the GUI thread
+
+POLL_INTERVAL_MS = 16  # Check the worker's progress about 60 times per second
+LIVE_POLL_MS = 33  # Show new live preview frames up to 30 times per second
+LIVE_WIDTH = 128  # Live preview width when no resolution is entered
+PREVIEW_SIZE = 50  # Longest side of the source image preview
+LIVE_PREVIEW_SIZE = 150  # Longest side of the live pixel art preview
+ZOOM_LEVELS = (1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32)  # Result viewer: screen pixels per block
+VIEWER_SIZE = (640, 640)  # Initial canvas size of the result viewer
+
+# Keys of the string table a front end passes to App and main: every text the window shows.
+# "stages" maps each conversion stage to its status text; *_error, animation_done, conversion_done and
+# viewer_title are format strings ({error}; {frames}, {manifest}; {png}, {schematic}; {width}, {height}, {zoom}).
+STRING_KEYS = (
+    "title", "browse", "capture", "live", "stop_live", "no_image", "resolution", "options", "aspect_ratio", "crop",
+    "fill", "choose_color", "color_title", "shade", "frames", "metric", "dither", "avoid", "categories", "blocks",
+    "only_use", "go", "cancel", "select_image", "image_files", "png_files", "all_files", "save_as", "error",
+    "success", "camera_starting", "camera_error", "live_status", "live_error", "no_source", "bad_resolution", "done",
+    "cancelled", "cancelling", "processing_error", "animation_done", "conversion_done", "view_result",
+    "viewer_title", "stages",
+)
+
+
+# Block ids / category names typed into an entry, separated by commas or spaces
+def block_names(text):
+    return tuple(name for name in text.replace(",", " ").split() if name)
+
+
+# Offset of a view view pixels long into a zoomed image size pixels long: centered when the image fits,
+# otherwise kept inside the image
+def clamp_offset(offset, size, view):
+    if size <= view:
+        return -((view - size) // 2)
+    return min(max(offset, 0), size - view)
+
+
+# Window showing a converted result at full resolution: scroll to zoom around the pointer, drag to pan.
+# Only the part of the image inside the canvas is rendered, straight from the index array (no PNG), into one
+# reused PhotoImage; redraws asked for while one is pending are merged, so dragging never queues up work.
+class ResultViewer:
+    def __init__(self, root, strings):
+        self.strings = strings
+        self.window = tk.Toplevel(root)
+        self.canvas = tk.Canvas(self.window, width=VIEWER_SIZE[0], height=VIEWER_SIZE[1], bg='gray50',
+                                highlightthickness=0)
+        self.canvas.pack(fill='both', expand=True)
+        self.item = self.canvas.create_image(0, 0, anchor='nw')  # The visible part of the image
+        self.photo = None  # PhotoImage on the canvas, reused while the visible size stays the same
+        self.result = None  # ConvertResult on show
+        self.zoom = 1  # One of ZOOM_LEVELS
+        self.x = self.y = 0  # Pixel of the zoomed image at the canvas's top-left corner (negative: margin)
+        self.drag = None  # Pointer position of the previous drag event
+        self.pending = None  # Scheduled redraw
+        self.canvas.bind("<Configure>", lambda event: self.schedule())
+        self.canvas.bind("<ButtonPress-1>", self.start_drag)
+        self.canvas.bind("<B1-Motion>", self.pan)
+        self.canvas.bind("<MouseWheel>", lambda event: self.zoom_at(event.x, event.y, 1 if event.delta > 0 else -1))
+        self.canvas.bind("<Button-4>", lambda event: self.zoom_at(event.x, event.y, 1))  # Wheel on X11
+        self.canvas.bind("<Button-5>", lambda event: self.zoom_at(event.x, event.y, -1))
+
+    def exists(self):
+        return bool(self.window.winfo_exists())
+
+    # Show a result, zoomed to the largest level at which it fits the canvas
+    def show(self, result):
+        self.result = result
+        height, width = result.idx.shape
+        canvas_w, canvas_h = self.canvas_size()
+        fitting = [zoom for zoom in ZOOM_LEVELS if width * zoom <= canvas_w and height * zoom <= canvas_h]
+        self.zoom = fitting[-1] if fitting else ZOOM_LEVELS[0]
+        self.window.lift()
+        self.schedule()
+
+    # Canvas size in pixels (the requested size until the window is mapped)
+    def canvas_size(self):
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        return (width, height) if width > 1 and height > 1 else VIEWER_SIZE
+
+    def start_drag(self, event):
+        self.drag = (event.x, event.y)
+
+    def pan(self, event):
+        if self.drag is None:
+            return
+        self.x += self.drag[0] - event.x
+        self.y += self.drag[1] - event.y
+        self.drag = (event.x, event.y)
+        self.schedule()
+
+    # Zoom in (step 1) or out (step -1) by one level, keeping the block under canvas point (cx, cy) in place
+    def zoom_at(self, cx, cy, step):
+        level = ZOOM_LEVELS.index(self.zoom) + step
+        if self.result is None or not 0 <= level < len(ZOOM_LEVELS):
+            return
+        zoom = ZOOM_LEVELS[level]
+        self.x = round((self.x + cx) / self.zoom * zoom - cx)
+        self.y = round((self.y + cy) / self.zoom * zoom - cy)
+        self.zoom = zoom
+        self.schedule()
+
+    def schedule(self):
+        if self.pending is None:
+            self.pending = self.window.after_idle(self.redraw)
+
+    # Render the visible part of the zoomed image onto the canvas
+    def redraw(self):
+        self.pending = None
+        if self.result is None:
+            return
+        height, width = self.result.idx.shape
+        canvas_w, canvas_h = self.canvas_size()
+        self.x = clamp_offset(self.x, math.ceil(width * self.zoom), canvas_w)
+        self.y = clamp_offset(self.y, math.ceil(height * self.zoom), canvas_h)
+        left, top = max(self.x, 0), max(self.y, 0)  # First visible pixel of the zoomed image
+        img = render_view(self.result.idx, self.result.palette, left, top, canvas_w - (left - self.x),
+                          canvas_h - (top - self.y), self.zoom)
+        if img.width == 0 or img.height == 0:
+            return
+        if self.photo is None or (self.photo.width(), self.photo.height()) != img.size:
+            self.photo = ImageTk.PhotoImage(img)
+            self.canvas.itemconfig(self.item, image=self.photo)
+        else:
+            self.photo.paste(img)  # Same size: update the pixels of the image already on the canvas
+        self.canvas.coords(self.item, left - self.x, top - self.y)
+        self.window.title(self.strings["viewer_title"].format(width=width, height=height, zoom=f"{self.zoom:.0%}"))
+
+
+# GUI application class definition; strings is the front end's string table (see STRING_KEYS)
+class App:
+    def __init__(self, root, strings):
+        missing = set(STRING_KEYS) - set(strings)
+        if missing:
+            raise KeyError(f"String table is missing {', '.join(sorted(missing))}")
+        self.root = root  # Store root window
+        self.strings = strings  # Texts in the front end's language
+        self.file_path = ''  # Initialize selected image file path
+        self.captured_image = None  # Camera capture used instead of a file (kept in memory)
+        self.source_name = ''  # Base name for outputs of the camera capture
+        self.image_cache = ImageCache()  # Decoded and resized images, reused across GO clicks
+        self.result_cache = ResultCache()  # Finished conversions on disk, reused for repeated GO clicks
+
+        # Create and pack file upload frame
+        self.frame = tk.LabelFrame(self.root, padx=10, pady=10)
+        self.frame.pack(padx=10, pady=10, fill="x")
+
+        # Create file selection button and bind to upload_file function
+        self.file_btn = tk.Button(self.frame, text=strings["browse"], command=self.upload_file)
+        self.file_btn.pack(side="left")
+
+        # Create camera capture button and bind to capture_from_camera function
+        self.capture_btn = tk.Button(self.frame, text=strings["capture"], command=self.capture_from_camera)
+        self.capture_btn.pack(side="left", padx=10)
+
+        # Create live preview button (converts camera frames continuously)
+        self.live_btn = tk.Button(self.frame, text=strings["live"], command=self.toggle_live)
+        self.live_btn.pack(side="left")
+
+        # Create label to show selected file name
+        self.file_label = tk.Label(self.frame, text="")
+        self.file_label.pack(side="left", padx=10)
+
+        # Create image preview label (initially shows 'No image selected')
+        self.preview_image_label = tk.Label(self.frame, text=strings["no_image"])
+        self.preview_image_label.pack(side="left", padx=10)
+
+        # Initialize variables to store original image size
+        self.width = 0
+        self.height = 1
+
+        # Create StringVar variables to hold resolution input values
+        self.var_res_width = tk.StringVar()
+        self.var_res_height = tk.StringVar()
+
+        # Create resolution input frame
+        self.resolution_frame = tk.Frame(root)
+
+        # Create and pack resolution label
+        self.resolution_label = tk.Label(self.resolution_frame, text=strings["resolution"], font=("Arial", 13))
+        self.resolution_label.pack(fill='both')
+
+        # Create and pack width entry
+        self.resolution_w_entry = tk.Entry(self.resolution_frame, textvariable=self.var_res_width,
+                                           width=6, font=("Arial", 13), justify='right')
+        self.resolution_w_entry.pack(side='left')
+
+        # Create and pack multiplication sign label
+        self.resolution_x = tk.Label(self.resolution_frame, text="×", font=("Arial", 13))
+        self.resolution_x.pack(side='left')
+
+        # Create and pack height entry
+        self.resolution_h_entry = tk.Entry(self.resolution_frame, textvariable=self.var_res_height,
+                                           width=6, font=("Arial", 13), justify='right')
+        self.resolution_h_entry.pack(side='left')
+
+        # Bind focus out and Enter key events for width and height entries to update functions
+        self.resolution_w_entry.bind("<FocusOut>", self.update_height)
+        self.resolution_w_entry.bind("<Return>", self.unfocus)
+        self.resolution_h_entry.bind("<FocusOut>", self.update_width)
+        self.resolution_h_entry.bind("<Return>", self.unfocus)
+
+        # Pack resolution frame
+        self.resolution_frame.pack(pady=10)
+
+        # Create and pack options frame
+        option_frame = tk.Frame(root)
+        option_frame.pack(pady=10, anchor="w", padx=20)
+
+        # Create and pack options label
+        tk.Label(option_frame, text=strings["options"]).pack(anchor='w')
+
+        # Create BooleanVars for options and set default values
+        self.var_maintain_aspect_ratio = tk.BooleanVar(value=True)  # Maintain aspect ratio
+        self.var_crop = tk.BooleanVar()  # Crop if aspect ratio differs
+        self.var_transparent_fill = tk.BooleanVar()  # Fill transparent pixels with color
+        self.selected_color = "#ffffff"  # Default fill color for transparent pixels (white)
+        self.var_shade = tk.BooleanVar()  # Include shading
+
+        # Create and pack maintain aspect ratio checkbox with command binding
+        self.cb0 = tk.Checkbutton(option_frame, text=strings["aspect_ratio"],
+                                  variable=self.var_maintain_aspect_ratio,
+                                  command=self.cb0_update_state)
+        self.cb0.pack(anchor='w')
+
+        # Create and pack crop checkbox, initially disabled
+        self.cb1 = tk.Checkbutton(option_frame, state='disabled',
+                                  text=strings["crop"],
+                                  variable=self.var_crop)
+        self.cb1.pack(anchor='w')
+
+        # Create frame for transparent fill option and color picker button
+        self.cb2_frame = tk.Frame(option_frame)
+
+        # Create and pack transparent fill checkbox with command binding
+        self.cb2 = tk.Checkbutton(self.cb2_frame, text=strings["fill"],
+                                  variable=self.var_transparent_fill,
+                                  command=self.cb2_update_state)
+        self.cb2.pack(anchor='w', side='left')
+
+        # Create and pack color picker button, initially disabled
+        self.color_picker = tk.Button(self.cb2_frame, state='disabled',
+                                      text=strings["choose_color"], bg=self.selected_color,
+                                      command=self.choose_color)
+        self.color_picker.pack(anchor='w', side='left')
+        self.cb2_frame.pack()
+
+        # Create and pack shading checkbox
+        self.cb3 = tk.Checkbutton(option_frame, text=strings["shade"],
+                                  variable=self.var_shade)
+        self.cb3.pack(anchor='w')
+
+        # Create and pack checkbox for converting every frame of animated images
+        self.var_frames = tk.BooleanVar()  # Convert all frames of animated images
+        self.cb4 = tk.Checkbutton(option_frame, text=strings["frames"], variable=self.var_frames)
+        self.cb4.pack(anchor='w')
+
+        # Create and pack color matching metric selector
+        self.var_metric = tk.StringVar(value="rgb")  # Color distance used to pick blocks
+        metric_frame = tk.Frame(option_frame)
+        tk.Label(metric_frame, text=strings["metric"]).pack(side='left')
+        tk.OptionMenu(metric_frame, self.var_metric, *METRICS).pack(side='left')
+        metric_frame.pack(anchor='w')
+
+        # Create and pack dithering method selector
+        self.var_dither = tk.StringVar(value="none")  # How to spread color error between blocks
+        dither_frame = tk.Frame(option_frame)
+        tk.Label(dither_frame, text=strings["dither"]).pack(side='left')
+        tk.OptionMenu(dither_frame, self.var_dither, *DITHER_METHODS).pack(side='left')
+        dither_frame.pack(anchor='w')
+
+        # Create and pack block filter: categories and blocks to avoid, and optionally the only blocks to use
+        self.var_exclude = {name: tk.BooleanVar() for name in BLOCK_CATEGORIES}  # Block categories to avoid
+        self.var_exclude_blocks = tk.StringVar()  # Extra blocks to avoid (comma-separated)
+        self.var_only_blocks = tk.StringVar()  # Only use these blocks/categories (empty = all)
+        filter_frame = tk.Frame(option_frame)
+        tk.Label(filter_frame, text=strings["avoid"]).pack(side='left')
+        category_button = tk.Menubutton(filter_frame, text=strings["categories"], relief='raised')
+        category_menu = tk.Menu(category_button, tearoff=0)
+        for name, var in self.var_exclude.items():
+            category_menu.add_checkbutton(label=name, variable=var)
+        category_button['menu'] = category_menu
+        category_button.pack(side='left')
+        tk.Label(filter_frame, text=strings["blocks"]).pack(side='left')
+        tk.Entry(filter_frame, textvariable=self.var_exclude_blocks, width=14).pack(side='left')
+        tk.Label(filter_frame, text=strings["only_use"]).pack(side='left')
+        tk.Entry(filter_frame, textvariable=self.var_only_blocks, width=10).pack(side='left')
+        filter_frame.pack(anchor='w')
+
+        # Create and pack GO button to start processing
+        self.go_btn = tk.Button(root, text=strings["go"], font=("Arial", 16, "bold"),
+                                command=self.go_action)
+        self.go_btn.pack(pady=10)
+
+        # Create and pack progress bar and cancel button for the running conversion
+        progress_frame = tk.Frame(root)
+        progress_frame.pack(fill='x', padx=20)
+        self.progress_bar = ttk.Progressbar(progress_frame, maximum=1.0, mode='determinate')
+        self.progress_bar.pack(side='left', fill='x', expand=True)
+        self.cancel_btn = tk.Button(progress_frame, text=strings["cancel"], state='disabled',
+                                    command=self.cancel_action)
+        self.cancel_btn.pack(side='left', padx=10)
+
+        # Create and pack label showing the current conversion stage
+        self.status_label = tk.Label(root, text="")
+        self.status_label.pack()
+
+        # Create and pack button reopening the full-size result viewer (enabled once an image is converted)
+        self.view_btn = tk.Button(root, text=strings["view_result"], state='disabled', command=self.view_result)
+        self.view_btn.pack(pady=5)
+        self.result = None  # Last converted still image (ConvertResult)
+        self.viewer = None  # ResultViewer window, if opened
+
+        # Background conversion state
+        self.cancel_event = threading.Event()  # Set by the Cancel button, checked by the worker
+        self.events = queue.Queue()  # (kind, payload) events posted by the worker thread
+
+        # Camera stays open between captures; live preview state
+        self.camera = CameraSession()
+        self.live = None  # Running LiveConverter
+        self.live_shown = None  # Number of the live frame on screen
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+    # Remove focus from entry widget on Enter key press
+    def unfocus(self, event):
+        event.widget.master.focus_set()
+
+    # Update height entry based on width input to maintain aspect ratio
+    def update_height(self, *args):
+        if self.var_maintain_aspect_ratio.get():
+            aspect_ratio = self.width / self.height  # Original image aspect ratio
+            try:
+                width = float(self.var_res_width.get())  # Input width
+                height = int(round(width / aspect_ratio, 0))  # Calculate height maintaining ratio
+                self.var_res_height.set(f"{height}")  # Update height entry
+            except ValueError:
+                pass  # Ignore invalid input
+
+    # Update width entry based on height input to maintain aspect ratio
+    def update_width(self, *args):
+        if self.var_maintain_aspect_ratio.get():
+            aspect_ratio = self.width / self.height
+            try:
+                height = float(self.var_res_height.get())
+                width = int(round(height * aspect_ratio, 0))
+                self.var_res_width.set(f"{width}")
+            except ValueError:
+                pass
+
+    # Enable or disable crop option based on maintain aspect ratio checkbox
+    def cb0_update_state(self):
+        if self.var_maintain_aspect_ratio.get():
+            self.var_crop.set(False)  # Disable crop if maintaining aspect ratio
+            self.cb1.config(state='disabled')  # Disable crop checkbox
+            self.update_height()  # Update height accordingly
+        else:
+            self.cb1.config(state='normal')  # Enable crop checkbox
+
+    # Enable or disable color picker based on transparent fill checkbox
+    def cb2_update_state(self):
+        if self.var_transparent_fill.get():
+            self.color_picker.config(state='normal')  # Enable color picker
+        else:
+            self.color_picker.config(state='disabled')  # Disable color picker
+
+    # Open color chooser dialog and update selected color and button appearance
+    def choose_color(self):
+        color_code = colorchooser.askcolor(title=self.strings["color_title"])
+        if color_code[1]:
+            self.selected_color = color_code[1]  # Selected color in hex
+            hex_color = self.selected_color.lstrip('#')
+            r, g, b = [int(hex_color[i:i+2], 16) for i in (0, 2, 4)]  # Extract RGB
+            brightness = (r*299 + g*587 + b*114) / 1000  # Calculate brightness
+            # Set text color to white or black depending on brightness
+            self.color_picker.config(fg='white' if brightness < 128 else 'black',
+                                    bg=self.selected_color)
+
+    # Open file dialog to select image file, then load and preview it
+    def upload_file(self):
+        self.file_path = filedialog.askopenfilename(
+            title=self.strings["select_image"],
+            filetypes=[(self.strings["image_files"], "*.png *.jpg *.jpeg *.bmp *.gif"),
+                       (self.strings["all_files"], "*.*")]
+        )
+        if self.file_path:
+            self.captured_image = None
+            self.file_label.config(text=os.path.basename(self.file_path))  # Show file name
+            with Image.open(self.file_path) as img:  # Only the preview is decoded (JPEGs at a reduced scale)
+                self.load_source(img)
+
+    # Store the source image size, fill in the resolution entries and show a small preview
+    # (img is shrunk in place)
+    def load_source(self, img):
+        self.width, self.height = img.size  # Store original size
+        # Shrink to max PREVIEW_SIZE pixels in place (reduces by whole factors first, then resamples)
+        img.thumbnail((PREVIEW_SIZE, PREVIEW_SIZE), Image.Resampling.LANCZOS)
+        img_tk = ImageTk.PhotoImage(img)  # Convert for Tkinter
+        # Set resolution entries to original image size
+        self.resolution_w_entry.delete(0, tk.END)
+        self.resolution_w_entry.insert(0, self.width)
+        self.resolution_h_entry.delete(0, tk.END)
+        self.resolution_h_entry.insert(0, self.height)
+        # Show preview image
+        self.preview_image_label.config(text='', image=img_tk)
+        self.preview_image_label.image = img_tk  # Keep reference
+
+    # Capture photo from Raspberry Pi camera into memory and load it into GUI
+    # (while the live preview runs, its newest camera frame is taken)
+    def capture_from_camera(self):
+        try:
+            if self.live is not None:
+                if self.live.latest is None:
+                    messagebox.showerror(self.strings["error"], self.strings["camera_starting"])
+                    return
+                rgb = self.live.latest.rgb
+            else:
+                rgb = self.camera.capture().copy()  # The camera stays open for the next capture
+
+            # Load captured image into GUI
+            self.file_path = ''
+            self.captured_image = Image.fromarray(rgb)
+            self.source_name = time.strftime("camera_%Y%m%d_%H%M%S")
+            self.file_label.config(text=self.source_name)
+            self.load_source(self.captured_image.copy())
+
+        except Exception as e:
+            messagebox.showerror(self.strings["error"], self.strings["camera_error"].format(error=e))
+
+    # Live preview size from the resolution entries (LIVE_WIDTH wide when they are empty)
+    def live_size(self):
+        try:
+            return int(self.var_res_width.get()), int(self.var_res_height.get())
+        except ValueError:
+            return LIVE_WIDTH, None
+
+    # Conversion options from the checkboxes
+    def current_options(self):
+        excluded = tuple(name for name, var in self.var_exclude.items() if var.get())  # Checked categories
+        return ConvertOptions(
+            crop=self.var_crop.get(),  # Crop if aspect ratio differs
+            fill_color=self.selected_color if self.var_transparent_fill.get() else None,  # Transparent fill
+            shade=self.var_shade.get(),  # Include shading
+            metric=self.var_metric.get(),  # Color matching metric
+            exclude_blocks=excluded + block_names(self.var_exclude_blocks.get()),  # Avoided categories and blocks
+            include_blocks=block_names(self.var_only_blocks.get()) or None,  # Only these blocks (None = all)
+            dither=self.var_dither.get()  # Dithering method
+        )
+
+    # Start or stop converting camera frames continuously into the preview
+    def toggle_live(self):
+        if self.live is not None:
+            self.stop_live()
+            return
+        self.live = LiveConverter(self.camera, *self.live_size(), self.current_options())
+        self.live_shown = None
+        self.live.start()
+        self.live_btn.config(text=self.strings["stop_live"], relief='sunken')
+        self.status_label.config(text=self.strings["live_status"])
+        self.root.after(LIVE_POLL_MS, self.poll_live)
+
+    def stop_live(self):
+        self.live.stop()
+        self.live = None
+        self.live_btn.config(text=self.strings["live"], relief='raised')
+        self.status_label.config(text="")
+
+    # Main thread (scheduled with root.after): show the newest converted frame, apply changed options
+    def poll_live(self):
+        if self.live is None:
+            return
+        if self.live.error is not None:
+            error = self.live.error
+            self.stop_live()
+            messagebox.showerror(self.strings["error"], self.strings["live_error"].format(error=error))
+            return
+        self.live.configure(*self.live_size(), self.current_options())
+        frame = self.live.latest
+        if frame is not None and frame.number != self.live_shown:
+            self.live_shown = frame.number
+            img = frame.preview
+            scale = max(1, LIVE_PREVIEW_SIZE // max(img.size))  # Whole-pixel zoom keeps blocks sharp
+            img = img.resize((img.width * scale, img.height * scale), Image.Resampling.NEAREST)
+            img.thumbnail((LIVE_PREVIEW_SIZE, LIVE_PREVIEW_SIZE), Image.Resampling.NEAREST)
+            img_tk = ImageTk.PhotoImage(img)
+            self.preview_image_label.config(text='', image=img_tk)
+            self.preview_image_label.image = img_tk  # Keep reference
+        self.root.after(LIVE_POLL_MS, self.poll_live)
+
+    # Stop the camera before the window closes
+    def close(self):
+        if self.live is not None:
+            self.live.stop()
+        self.camera.close()
+        self.root.destroy()
+
+    # Main processing function triggered by GO button
+    def go_action(self):
+        if not self.file_path and self.captured_image is None:
+            messagebox.showerror(self.strings["error"], self.strings["no_source"])
+            return
+
+        if self.file_path:
+            file_name, file_ext = os.path.splitext(os.path.basename(self.file_path))  # Split filename and extension
+        else:
+            file_name = self.source_name  # Camera capture
+        try:
+            w = int(self.var_res_width.get())  # Input width
+            h = int(self.var_res_height.get())  # Input height
+        except ValueError:
+            messagebox.showerror(self.strings["error"], self.strings["bad_resolution"])
+            return
+
+        # Ask user where to save the PNG output file
+        png_name, schematic_name = output_names(file_name, w, h, self.var_shade.get())
+        output_file_path = filedialog.asksaveasfilename(
+            initialfile=png_name,
+            defaultextension=".png",
+            filetypes=[(self.strings["png_files"], "*.png"), (self.strings["all_files"], "*.*")],
+            title=self.strings["save_as"]
+        )
+        if not output_file_path:
+            return  # User cancelled save dialog
+
+        options = self.current_options()
+        # Animated file with the frames option: every frame is converted
+        animated = self.var_frames.get() and bool(self.file_path) and frame_count(self.file_path) > 1
+
+        # Run the conversion in a background thread so the window stays responsive
+        self.cancel_event = threading.Event()
+        self.go_btn.config(state='disabled')
+        self.cancel_btn.config(state='normal')
+        self.progress_bar['value'] = 0
+        threading.Thread(target=self.run_conversion, daemon=True,
+                         args=(self.file_path or self.captured_image, w, h, options, output_file_path,
+                               schematic_name, animated)).start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_conversion)
+
+    # Worker thread: resize, quantize, save PNG and schematic (in same folder as PNG with related name)
+    # source: image file path or in-memory camera capture
+    # Never touches Tk widgets; results and progress are posted to self.events for poll_conversion
+    # animated: convert every frame (PNG, schematic and .mcfunction per frame, named after schematic_name)
+    def run_conversion(self, source, w, h, options, output_file_path, schematic_name, animated=False):
+        cancel_event, events = self.cancel_event, self.events
+
+        def progress(stage, fraction):
+            if cancel_event.is_set():
+                raise ConversionCancelled()  # Stops the conversion; no partial files are kept
+            events.put(("progress", (stage, fraction)))
+
+        try:
+            if animated:
+                result = convert_animation(source, w, h, options, os.path.dirname(output_file_path), schematic_name,
+                                           progress=lambda fraction: progress("frames", fraction))
+            else:
+                result = convert(source, w, h, options, output_path=output_file_path,
+                                 schematic_name=schematic_name, progress=progress, cache=self.image_cache,
+                                 results=self.result_cache)
+            events.put(("done", result))
+        except ConversionCancelled:
+            events.put(("cancelled", None))
+        except Exception as e:
+            events.put(("error", e))
+
+    # Main thread (scheduled with root.after): apply the worker's events to the widgets
+    def poll_conversion(self):
+        while True:
+            try:
+                kind, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind != "progress":
+                self.finish_conversion(kind, payload)
+                return
+            stage, fraction = payload
+            self.progress_bar['value'] = fraction if stage == "frames" else overall_progress(stage, fraction)
+            self.status_label.config(text=self.strings["stages"].get(stage, ""))
+        self.root.after(POLL_INTERVAL_MS, self.poll_conversion)
+
+    # Re-enable the controls and report the outcome of a finished conversion
+    def finish_conversion(self, kind, payload):
+        self.go_btn.config(state='normal')
+        self.cancel_btn.config(state='disabled')
+        if kind == "done":
+            self.progress_bar['value'] = 1.0
+            self.status_label.config(text=self.strings["done"])
+            # Show success message with output paths
+            if hasattr(payload, "frames"):  # Animation
+                messagebox.showinfo(self.strings["success"], self.strings["animation_done"].format(
+                    frames=len(payload.frames), manifest=os.path.abspath(payload.manifest_path)))
+                return
+            self.result = payload
+            self.view_btn.config(state='normal')
+            self.view_result()  # Show the converted image at full size
+            messagebox.showinfo(self.strings["success"], self.strings["conversion_done"].format(
+                png=os.path.abspath(payload.png_path), schematic=os.path.abspath(payload.schematic_path)))
+        elif kind == "cancelled":
+            self.progress_bar['value'] = 0
+            self.status_label.config(text=self.strings["cancelled"])
+        else:
+            self.progress_bar['value'] = 0
+            self.status_label.config(text="")
+            messagebox.showerror(self.strings["error"], self.strings["processing_error"].format(error=payload))
+
+    # Open the result viewer (or bring it to the front) showing the last converted image
+    def view_result(self):
+        if self.result is None:
+            return
+        if self.viewer is None or not self.viewer.exists():
+            self.viewer = ResultViewer(self.root, self.strings)
+        self.viewer.show(self.result)
+
+    # Ask the running conversion to stop at its next progress check
+    def cancel_action(self):
+        self.cancel_event.set()
+        self.cancel_btn.config(state='disabled')
+        self.status_label.config(text=self.strings["cancelling"])
+
+
+# Program entry point of a front end - run the GUI with its string table
+def main(strings):
+    root = tk.Tk()  # Create Tkinter root window
+    root.title(strings["title"])  # Set window title
+    root.geometry("500x720")  # Set window size
+    root.bind_all("<Button-1>", lambda event: event.widget.focus_set())  # Set focus on click
+    app = App(root, strings)  # Create App instance and initialize GUI
+    root.mainloop()  # Start event loop
@@ -0,0 +1,86 @@
+import os  # OS-related functions (path handling, etc.)
+import threading  # The GUI uses the cache from its main and worker threads
+from collections import OrderedDict
+from PIL import Image  # Import library for image processing
+from .convert import draft_image, fill_transparent, open_rgba, resize_image
+
+DEFAULT_BUDGET = 512 << 20  # Bytes of decoded and resized pixels kept in memory
+
+
+# Cache of decoded images and their resized/cropped/filled variants, so repeated conversions of the
+# same file (e.g. after changing only the palette or dithering option) skip decoding and resizing.
+# Files are identified by path, modification time and size, so an edited file is decoded again.
+# Least recently used images are evicted once their pixels exceed budget bytes. Cached images are
+# shared: callers must not modify them in place.
+class ImageCache:
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.budget = budget
+        self.size = 0  # Bytes currently cached
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> image, least recently used first
+        self._lock = threading.Lock()
+
+    # Identity of a file's current contents: (absolute path, mtime in ns, size in bytes)
+    @staticmethod
+    def file_key(path):
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+    def _get(self, key):
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def _put(self, key, image):
+        nbytes = image.width * image.height * 4
+        with self._lock:
+            if key in self._entries or nbytes > self.budget:
+                return
+            # Entries for an older version of the same file can never be hit again
+            for old in [k for k in self._entries if k[0][0] == key[0][0] and k[0] != key[0]]:
+                self._drop(old)
+            self._entries[key] = image
+            self.size += nbytes
+            while self.size > self.budget:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        image = self._entries.pop(key)
+        self.size -= image.width * image.height * 4
+
+    # Decoded image of a file in its own mode: in full, or for a (w, h) output at the reduced JPEG scale
+    # draft_image picks (decodes at the same scale are shared by every output size that picks it)
+    def decoded(self, path, w=None, h=None, crop=False):
+        img = Image.open(path)  # Lazy: only reads the header
+        if w is not None:
+            draft_image(img, w, h, crop)
+        key = (self.file_key(path), img.size)
+        image = self._get(key)
+        if image is not None:
+            img.close()
+            return image
+        img.load()  # Decode now (PIL then closes the file)
+        self._put(key, img)
+        return img
+
+    # Resized (and optionally cropped and filled) RGBA image of a file, as convert() produces it
+    def resized(self, path, w, h, crop=False, fill_color=None):
+        key = (self.file_key(path), w, h, crop, fill_color)
+        image = self._get(key)
+        if image is None:
+            image = open_rgba(resize_image(self.decoded(path, w, h, crop), w, h, crop))
+            if fill_color is not None:
+                image = fill_transparent(image, fill_color)
+            self._put(key, image)
+        return image
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
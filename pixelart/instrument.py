@@ -0,0 +1,136 @@
+import cProfile  # Optional function-level profile of a whole conversion
+import json  # Trace records are written as JSON lines
+import os  # OS-related functions (path handling, etc.)
+import pstats
+import threading  # Span nesting is tracked per thread (the GUI converts on a worker thread)
+import time  # For measuring span durations
+import tracemalloc  # Optional per-span memory peaks
+
+PROFILERS = ("cprofile", "tracemalloc")
+PROFILE_TOP = 30  # Functions listed in a cProfile record, by cumulative time
+
+_output = None  # File descriptor receiving JSON lines, None when tracing is off
+_profilers = frozenset()
+_local = threading.local()
+
+
+# Turn tracing on (output: file path, or "-" for stderr) or off (output=None); profile lists profilers from
+# PROFILERS to run around every top-level span
+def configure(output=None, profile=()):
+    global _output, _profilers
+    unknown = set(profile) - set(PROFILERS)
+    if unknown:
+        raise ValueError(f"Unknown profiler {', '.join(sorted(unknown))}, expected {', '.join(PROFILERS)}")
+    if _output not in (None, 2):
+        os.close(_output)
+    if output is None:
+        _output = None
+    elif output == "-":
+        _output = 2
+    else:
+        _output = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    _profilers = frozenset(profile) if output is not None else frozenset()
+
+
+# Configure from PIXELART_TRACE (output) and PIXELART_PROFILE (comma-separated profilers)
+def configure_from_env():
+    profile = [name for name in os.environ.get("PIXELART_PROFILE", "").split(",") if name]
+    configure(os.environ.get("PIXELART_TRACE") or None, profile)
+
+
+def enabled():
+    return _output is not None
+
+
+# Write one JSON record as a single line (one write per line, so worker processes can share a file)
+def emit(record):
+    if _output is not None:
+        os.write(_output, (json.dumps(record, default=str) + "\n").encode())
+
+
+# Timed region of a conversion. Durations are always measured (and added to timings[name] when a timings
+# dict is given); records, nesting and profilers only cost anything while tracing is on.
+class Span:
+    __slots__ = ("name", "fields", "timings", "seconds", "_start", "_traced", "_parent", "_path",
+                 "_profiler", "_own_tracemalloc", "_base", "_child_peak")
+
+    def __init__(self, name, timings=None, fields=None):
+        self.name = name
+        self.fields = fields or {}
+        self.timings = timings
+        self.seconds = 0.0
+        self._traced = False
+
+    # Attach counts such as pixels, blocks or bytes to the span's record
+    def update(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        if _output is not None:
+            self._begin()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self._start
+        if self.timings is not None:
+            self.timings[self.name] = self.timings.get(self.name, 0.0) + self.seconds
+        if self._traced:
+            self._end(exc_type)
+        return False
+
+    def _begin(self):
+        self._traced = True
+        stack = _local.__dict__.setdefault("stack", [])
+        self._parent = stack[-1] if stack else None
+        self._path = f"{self._parent._path}/{self.name}" if self._parent else self.name
+        self._profiler = None
+        self._own_tracemalloc = False
+        if self._parent is None and "cprofile" in _profilers:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if self._parent is None and "tracemalloc" in _profilers and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracemalloc = True
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._parent is not None:
+                self._parent._child_peak = max(self._parent._child_peak, peak)  # Keep it across the reset
+            tracemalloc.reset_peak()
+            self._base = current
+            self._child_peak = 0
+        stack.append(self)
+
+    def _end(self, exc_type):
+        _local.stack.pop()
+        record = {"event": "span", "name": self.name, "path": self._path, "pid": os.getpid(),
+                  "seconds": round(self.seconds, 6), "status": "ok" if exc_type is None else exc_type.__name__}
+        record.update(self.fields)
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            record["peak_bytes"] = max(peak, self._child_peak) - self._base
+            record["allocated_bytes"] = current - self._base
+            if self._own_tracemalloc:
+                tracemalloc.stop()
+        if self._profiler is not None:
+            self._profiler.disable()
+            emit_profile(self._path, self._profiler)
+        emit(record)
+
+
+# Span context manager: with span("quantize", timings, pixels=n) as s: ...; s.update(bytes=...)
+def span(name, timings=None, **fields):
+    return Span(name, timings, fields)
+
+
+# Emit the top functions of a cProfile run as one record
+def emit_profile(path, profiler):
+    stats = pstats.Stats(profiler).stats
+    top = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+    emit({"event": "profile", "path": path, "pid": os.getpid(), "functions": [
+        {"function": f"{os.path.basename(file)}:{line}({func})", "calls": calls, "primitive_calls": primitive,
+         "tottime": round(tottime, 6), "cumtime": round(cumtime, 6)}
+        for (file, line, func), (primitive, calls, tottime, cumtime, _) in top]})
+
+
+configure_from_env()
@@ -0,0 +1,72 @@
+import hashlib  # For hashing palette contents into a table version
+import os  # OS-related functions (path handling, etc.)
+from collections import OrderedDict  # LRU order of the mapped tables
+import numpy as np  # Import NumPy for array and numerical calculations
+from .atomic import atomic_path
+from .quantize import METRICS, get_matcher, index_dtype
+
+LUT_VERSION = 1  # Bump when the table layout or build method changes, so old tables are ignored
+LOADED_LUTS = 16  # Tables kept mapped per process (one per palette subset and metric), least recently used dropped
+
+_loaded_luts = OrderedDict()  # Tables already memory-mapped by this process, keyed by file path
+
+
+# Folder where lookup tables are stored (override with the PIXELART_CACHE_DIR environment variable)
+def default_cache_dir():
+    return os.environ.get("PIXELART_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "minecraft-pixelart")
+
+
+# Short hash identifying a palette's contents and color metric (and the table format)
+def palette_hash(palette, metric="rgb"):
+    data = np.asarray(palette, dtype=np.int64).tobytes()
+    return hashlib.sha256(b"lut-v%d:%s:" % (LUT_VERSION, metric.encode()) + data).hexdigest()[:16]
+
+
+# File path of the lookup table for a palette and metric
+def lut_path(palette, cache_dir=None, metric="rgb"):
+    return os.path.join(cache_dir or default_cache_dir(), f"lut_{metric}_{palette_hash(palette, metric)}.npy")
+
+
+# Precompute the nearest palette index for all 2^24 RGB colors and save it as a .npy file
+def build_lut(palette, path, metric="rgb"):
+    matcher = get_matcher(palette, metric)  # Palette converted to the metric's color space once
+    lut = np.empty(1 << 24, dtype=index_dtype(len(palette)))  # Index of color (r << 16 | g << 8 | b)
+
+    # Query one red plane (256 x 256 green/blue colors) at a time to keep memory small
+    plane = np.empty((1 << 16, 3), dtype=np.uint8)
+    plane[:, 1] = np.repeat(np.arange(256), 256)  # Green
+    plane[:, 2] = np.tile(np.arange(256), 256)  # Blue
+    for r in range(256):
+        plane[:, 0] = r
+        lut[r << 16:(r + 1) << 16] = matcher.nearest(plane)
+
+    # Write to a temporary file first so other processes never map a half-written table
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with atomic_path(path) as temp_path:
+        np.save(temp_path, lut)
+    return path
+
+
+# Return the memory-mapped lookup table for a palette and metric, building it first if missing or outdated
+def load_lut(palette, cache_dir=None, metric="rgb"):
+    dtype = index_dtype(len(palette))
+    if metric not in METRICS:
+        raise ValueError(f"Unknown color metric {metric!r}, expected one of {', '.join(METRICS)}")
+    path = lut_path(palette, cache_dir, metric)
+    lut = _loaded_luts.get(path)
+    if lut is not None:
+        _loaded_luts.move_to_end(path)
+        return lut
+
+    try:
+        lut = np.load(path, mmap_mode="r")  # Read-only mapping, shared through the OS page cache
+    except (OSError, ValueError):
+        lut = None  # Missing or unreadable table
+    if lut is None or lut.shape != (1 << 24,) or lut.dtype != dtype:
+        build_lut(palette, path, metric)
+        lut = np.load(path, mmap_mode="r")
+    _loaded_luts[path] = lut
+    if len(_loaded_luts) > LOADED_LUTS:
+        _loaded_luts.popitem(last=False)
+    return lut
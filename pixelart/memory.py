@@ -0,0 +1,37 @@
+import mmap  # For file-backed arrays whose pages can be handed back to the OS
+import sys
+import tempfile  # Anonymous backing files
+import numpy as np  # Import NumPy for array and numerical calculations
+
+try:
+    import resource  # Peak memory reporting (not available on Windows)
+except ImportError:
+    resource = None
+
+
+# Peak resident memory of this process in bytes, or None where the resource module is unavailable
+def peak_rss():
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024  # Bytes on macOS, kilobytes elsewhere
+
+
+# Array backed by an unlinked temporary file instead of process memory (written pages can be released
+# with release_pages, the data stays in the file)
+def mapped_array(shape, dtype=np.uint8):
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    with tempfile.TemporaryFile() as f:  # The mapping keeps its own handle to the file
+        f.truncate(max(size, 1))  # Zero-length mappings are not allowed
+        buffer = mmap.mmap(f.fileno(), max(size, 1))
+    return np.ndarray(shape, dtype=dtype, buffer=buffer)
+
+
+# Drop the resident pages of a file-backed array (they are read back from the file on the next access);
+# does nothing for ordinary arrays or where madvise is unavailable
+def release_pages(array):
+    base = array
+    while isinstance(base, np.ndarray):
+        base = base.base
+    if isinstance(base, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED"):
+        base.madvise(mmap.MADV_DONTNEED)
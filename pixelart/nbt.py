@@ -0,0 +1,158 @@
+import struct  # For big-endian binary encoding
+import numpy as np  # Import NumPy for array and numerical calculations
+
+# NBT tag type ids
+TAG_END = 0
+TAG_BYTE = 1
+TAG_SHORT = 2
+TAG_INT = 3
+TAG_LONG = 4
+TAG_FLOAT = 5
+TAG_DOUBLE = 6
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+
+# Minimal streaming NBT encoder: writes tags straight to a (gzip) file object in order,
+# so large arrays never have to be wrapped in tag objects first.
+# A name of None means the tag is a list element and is written without type and name.
+class NBTWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def _header(self, tag_type, name):
+        if name is not None:
+            encoded = name.encode("utf-8")
+            self.f.write(struct.pack(">bH", tag_type, len(encoded)) + encoded)
+
+    def begin_compound(self, name=None):
+        self._header(TAG_COMPOUND, name)
+
+    def end_compound(self):
+        self.f.write(b"\x00")  # TAG_End
+
+    def begin_list(self, name, element_type, length):
+        self._header(TAG_LIST, name)
+        self.f.write(struct.pack(">bi", element_type if length else TAG_END, length))
+
+    def byte(self, name, value):
+        self._header(TAG_BYTE, name)
+        self.f.write(struct.pack(">b", value))
+
+    def short(self, name, value):
+        self._header(TAG_SHORT, name)
+        self.f.write(struct.pack(">h", value))
+
+    def int(self, name, value):
+        self._header(TAG_INT, name)
+        self.f.write(struct.pack(">i", value))
+
+    def long(self, name, value):
+        self._header(TAG_LONG, name)
+        self.f.write(struct.pack(">q", value))
+
+    def string(self, name, value):
+        self._header(TAG_STRING, name)
+        encoded = value.encode("utf-8")
+        self.f.write(struct.pack(">H", len(encoded)) + encoded)
+
+    # Write the tag header of a byte array; the caller then writes exactly `length` raw bytes
+    def begin_byte_array(self, name, length):
+        self._header(TAG_BYTE_ARRAY, name)
+        self.f.write(struct.pack(">i", length))
+
+    def byte_array(self, name, data):
+        self.begin_byte_array(name, len(data))
+        self.f.write(data)
+
+    # values: NumPy array (or anything np.asarray accepts) of 32-bit ints
+    def int_array(self, name, values):
+        values = np.asarray(values, dtype=">i4")
+        self._header(TAG_INT_ARRAY, name)
+        self.f.write(struct.pack(">i", values.size) + values.tobytes())
+
+    # values: NumPy array (or anything np.asarray accepts) of 64-bit ints
+    def long_array(self, name, values):
+        values = np.asarray(values, dtype=">i8")
+        self._header(TAG_LONG_ARRAY, name)
+        self.f.write(struct.pack(">i", values.size) + values.tobytes())
+
+    # Write any tag as read by read_nbt: compounds are dicts of name -> (type, value), lists are
+    # (element type, [values]) and arrays are NumPy arrays
+    def tag(self, name, tag_type, value):
+        if tag_type == TAG_COMPOUND:
+            self.begin_compound(name)
+            for key, (child_type, child) in value.items():
+                self.tag(key, child_type, child)
+            self.end_compound()
+        elif tag_type == TAG_LIST:
+            element_type, items = value
+            self.begin_list(name, element_type, len(items))
+            for item in items:
+                self.tag(None, element_type, item)
+        elif tag_type == TAG_BYTE_ARRAY:
+            self.byte_array(name, np.asarray(value, dtype=np.int8).tobytes())
+        elif tag_type in _SCALAR_FORMATS:
+            self._header(tag_type, name)
+            self.f.write(struct.pack(_SCALAR_FORMATS[tag_type], value))
+        else:
+            {TAG_STRING: self.string, TAG_INT_ARRAY: self.int_array, TAG_LONG_ARRAY: self.long_array}[tag_type](
+                name, value)
+
+
+_SCALAR_FORMATS = {TAG_BYTE: ">b", TAG_SHORT: ">h", TAG_INT: ">i", TAG_LONG: ">q", TAG_FLOAT: ">f",
+                   TAG_DOUBLE: ">d"}
+_ARRAY_TYPES = {TAG_BYTE_ARRAY: ">i1", TAG_INT_ARRAY: ">i4", TAG_LONG_ARRAY: ">i8"}
+
+
+# Decode uncompressed NBT data into (root name, root compound), keeping every tag type so that
+# NBTWriter.tag writes it back unchanged (see NBTWriter.tag for the value layout)
+def read_nbt(data):
+    view = memoryview(data)
+    tag_type, = struct.unpack_from(">b", view, 0)
+    if tag_type != TAG_COMPOUND:
+        raise ValueError(f"NBT root is not a compound (tag type {tag_type})")
+    name, pos = _read_string(view, 1)
+    value, _ = _read_payload(view, pos, TAG_COMPOUND)
+    return name, value
+
+
+def _read_string(view, pos):
+    length, = struct.unpack_from(">H", view, pos)
+    return bytes(view[pos + 2:pos + 2 + length]).decode("utf-8"), pos + 2 + length
+
+
+def _read_payload(view, pos, tag_type):
+    if tag_type in _SCALAR_FORMATS:
+        fmt = _SCALAR_FORMATS[tag_type]
+        return struct.unpack_from(fmt, view, pos)[0], pos + struct.calcsize(fmt)
+    if tag_type == TAG_STRING:
+        return _read_string(view, pos)
+    if tag_type in _ARRAY_TYPES:
+        length, = struct.unpack_from(">i", view, pos)
+        dtype = np.dtype(_ARRAY_TYPES[tag_type])
+        end = pos + 4 + length * dtype.itemsize
+        return np.frombuffer(view[pos + 4:end], dtype=dtype).copy(), end
+    if tag_type == TAG_LIST:
+        element_type, length = struct.unpack_from(">bi", view, pos)
+        pos += 5
+        items = []
+        for _ in range(length):
+            item, pos = _read_payload(view, pos, element_type)
+            items.append(item)
+        return (element_type, items), pos
+    if tag_type == TAG_COMPOUND:
+        value = {}
+        while True:
+            child_type = view[pos]
+            pos += 1
+            if child_type == TAG_END:
+                return value, pos
+            key, pos = _read_string(view, pos)
+            child, pos = _read_payload(view, pos, child_type)
+            value[key] = (child_type, child)
+    raise ValueError(f"Unknown NBT tag type {tag_type}")
@@ -0,0 +1,67 @@
+import os  # For removing aborted files
+import struct  # For big-endian binary encoding
+import zlib  # For PNG compression and CRCs
+import numpy as np  # Import NumPy for array and numerical calculations
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+# Streaming 8-bit RGBA PNG writer: rows are filtered, compressed and written as IDAT chunks as they
+# arrive, so the whole image never has to be in memory
+class PNGStreamWriter:
+    def __init__(self, path, width, height, compress_level=6):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(compress_level)
+        self._file = open(path, "wb")
+        self._file.write(PNG_SIGNATURE)
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))  # 8-bit RGBA
+
+    def _chunk(self, tag, data):
+        self._file.write(struct.pack(">I", len(data)) + tag + data)
+        self._file.write(struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    # Append rows given as an (n, width, 4) uint8 array
+    def write_rows(self, rgba):
+        n = rgba.shape[0]
+        if rgba.shape[1:] != (self.width, 4):
+            raise ValueError(f"Expected rows of shape (n, {self.width}, 4), got {rgba.shape}")
+        if self.rows_written + n > self.height:
+            raise ValueError("More rows written than the PNG height")
+        flat = rgba.reshape(n, self.width * 4)
+        raw = np.empty((n, 1 + self.width * 4), dtype=np.uint8)
+        raw[:, 0] = 1  # "Sub" filter: each byte minus the same channel of the pixel to its left
+        raw[:, 1:5] = flat[:, :4]
+        np.subtract(flat[:, 4:], flat[:, :-4], out=raw[:, 5:])
+        data = self._compressor.compress(raw.tobytes())
+        if data:
+            self._chunk(b"IDAT", data)
+        self.rows_written += n
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(f"PNG closed after {self.rows_written} of {self.height} rows")
+            self._chunk(b"IDAT", self._compressor.flush())
+            self._chunk(b"IEND", b"")
+        finally:
+            self._file.close()
+
+    # Close and delete an unfinished file
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()  # Never leave a truncated PNG behind
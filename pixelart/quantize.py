@@ -0,0 +1,107 @@
+from functools import lru_cache  # For building each palette matcher only once
+import numpy as np  # Import NumPy for array and numerical calculations
+from .colorspace import delta_e_2000, redmean_distance_sq, rgb_to_lab, rgb_to_oklab
+
+# Available color matching metrics
+METRICS = ("rgb", "redmean", "oklab", "cie76", "ciede2000")
+CIEDE2000_CANDIDATES = 8  # CIE76 nearest candidates re-ranked by CIEDE2000
+CHUNK_PIXELS = 1 << 16  # Pixels compared against the whole palette at once (brute-force metrics)
+MAX_PALETTE = 1 << 16  # Palette entries that uint16 indices can address
+
+
+# KDTree over points for nearest-color search. Imported here: scipy.spatial is the slowest import of the
+# package, and lookup-table conversions and the redmean metric never build a tree.
+def kdtree(points):
+    from scipy.spatial import KDTree
+    return KDTree(points)
+
+
+# Nearest-palette-color search for one palette and metric; the palette is converted once
+class PaletteMatcher:
+    def __init__(self, palette, metric="rgb"):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown color metric {metric!r}, expected one of {', '.join(METRICS)}")
+        self.metric = metric
+        palette = np.array(palette)
+        if metric == "rgb":
+            self.tree = kdtree(palette)  # Plain Euclidean sRGB, exactly as before
+            return
+
+        # Placeholder entries such as (9999, 9999, 9999) for air are never matched
+        self.valid = np.flatnonzero(((palette >= 0) & (palette <= 255)).all(axis=1))
+        colors = palette[self.valid].astype(np.uint8)
+        if metric == "redmean":
+            self.colors = colors
+        elif metric == "oklab":
+            self.tree = kdtree(rgb_to_oklab(colors))
+        else:  # CIE76 is Euclidean in CIELAB, CIEDE2000 refines its nearest candidates
+            self.lab = rgb_to_lab(colors)
+            self.tree = kdtree(self.lab)
+
+    # Nearest palette index for every color in rgb, an (N, 3) uint8 array
+    def nearest(self, rgb):
+        if self.metric == "rgb":
+            return self.tree.query(rgb, workers=-1)[1]
+        if self.metric == "oklab":
+            return self.valid[self.tree.query(rgb_to_oklab(rgb), workers=-1)[1]]
+        if self.metric == "cie76":
+            return self.valid[self.tree.query(rgb_to_lab(rgb), workers=-1)[1]]
+        if self.metric == "ciede2000":
+            lab = rgb_to_lab(rgb)
+            k = min(CIEDE2000_CANDIDATES, len(self.valid))
+            _, candidates = self.tree.query(lab, k=k, workers=-1)
+            candidates = candidates.reshape(len(lab), k)
+            distances = delta_e_2000(lab[:, None, :], self.lab[candidates])
+            best = candidates[np.arange(len(lab)), distances.argmin(axis=1)]
+            return self.valid[best]
+        # Redmean is not a Euclidean metric: compare against the whole palette in chunks
+        out = np.empty(len(rgb), dtype=np.int64)
+        for start in range(0, len(rgb), CHUNK_PIXELS):
+            chunk = rgb[start:start + CHUNK_PIXELS]
+            out[start:start + CHUNK_PIXELS] = redmean_distance_sq(chunk, self.colors).argmin(axis=1)
+        return self.valid[out]
+
+
+# Matcher for a palette and metric, cached so the palette conversion and search index are built once
+# (a CompiledPalette from pixelart.compiled hands out its own index, built on first use)
+def get_matcher(palette, metric="rgb"):
+    if hasattr(palette, "matcher"):
+        return palette.matcher(metric)
+    return _cached_matcher(tuple(map(tuple, palette)), metric)
+
+
+@lru_cache(maxsize=16)
+def _cached_matcher(palette, metric):
+    return PaletteMatcher(palette, metric)
+
+
+# Smallest dtype for indices into a palette of n colors: one byte per pixel up to 256 colors, two beyond
+def index_dtype(n):
+    if n > MAX_PALETTE:
+        raise ValueError(f"Palette has {n} colors, indices support at most {MAX_PALETTE}")
+    return np.uint8 if n <= 256 else np.uint16
+
+
+# Function converting a whole RGBA image into a 2D array of palette indices (uint8, uint16 past 256 colors)
+# (fully transparent pixels become index 0 = air, every other pixel is resolved in one batched query,
+# or gathered from a precomputed 24-bit lookup table from pixelart.lut when one is given)
+def quantize_image(img, palette, lut=None, metric="rgb"):
+    rgba = np.asarray(img, dtype=np.uint8)  # PIL RGBA image or (h, w, 4) array -> NumPy array
+    if rgba.ndim != 3 or rgba.shape[2] != 4:
+        raise ValueError(f"Expected an RGBA image, got array of shape {rgba.shape}")
+    idx = np.zeros(rgba.shape[:2], dtype=index_dtype(len(palette)))  # Every pixel starts as index 0 (air)
+    opaque = rgba[..., 3] != 0  # Mask of pixels that are not fully transparent
+    if opaque.any() and lut is not None:
+        rgb = rgba[opaque, :3].astype(np.uint32)
+        idx[opaque] = lut[(rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]]  # Single gather from the table
+    elif opaque.any():
+        rgb = rgba[opaque, :3]
+        if metric != "rgb":
+            # Perceptual metrics cost more per color, so match each distinct color only once
+            packed = (rgb[:, 0].astype(np.uint32) << 16) | (rgb[:, 1].astype(np.uint32) << 8) | rgb[:, 2]
+            unique, inverse = np.unique(packed, return_inverse=True)
+            colors = np.stack([unique >> 16, (unique >> 8) & 0xFF, unique & 0xFF], axis=1).astype(np.uint8)
+            idx[opaque] = get_matcher(palette, metric).nearest(colors)[inverse.ravel()]
+        else:
+            idx[opaque] = get_matcher(palette, metric).nearest(rgb)  # Nearest palette index for all pixels at once
+    return idx
@@ -0,0 +1,236 @@
+import dataclasses  # For serializing options and command counts
+import hashlib  # For content-addressed keys
+import json  # For entry metadata
+import os  # OS-related functions (path handling, etc.)
+import shutil  # For copying files and removing entries
+import tempfile  # For building entries next to their final folder
+import time  # For entry timestamps
+from dataclasses import dataclass
+import numpy as np  # Import NumPy for array and numerical calculations
+from PIL import Image  # Import library for image processing
+from .atomic import atomic_path
+from .commands import CommandStats, mcfunction_path
+from .convert import ConvertResult, default_schematic_name, options_palette, target_size
+from .lut import default_cache_dir, palette_hash
+
+RESULT_VERSION = 2  # Bump when conversion output changes, so older cached results are never returned
+DEFAULT_RESULT_CACHE_BYTES = 1 << 30  # Size limit of the result cache (least recently used entries go first)
+HASH_BLOCK = 1 << 20  # Bytes of a source file hashed at a time
+HASHED_FILES = 256  # Source file digests remembered per process (by path, modification time and size)
+IGNORED_OPTIONS = ("memory_limit",)  # ConvertOptions fields that do not change the output
+
+_file_digests = {}  # (absolute path, mtime in ns, size) -> SHA-256 of the file's bytes
+
+
+# One cached conversion
+@dataclass
+class CacheEntry:
+    key: str
+    path: str  # Folder holding the entry's files
+    size: int  # Bytes on disk
+    last_used: float  # Time of the last store or hit (seconds since the epoch)
+    source: str  # Source file path of the first conversion, None for in-memory images
+    width: int
+    height: int
+    files: tuple  # Cached artifacts: "idx", "png", "schematic", "mcfunction"
+
+
+# SHA-256 of a source image: the file's bytes, or the mode, size and pixels of an in-memory image
+def source_digest(source):
+    if isinstance(source, Image.Image):
+        digest = hashlib.sha256(f"{source.mode}:{source.width}x{source.height}:".encode())
+        digest.update(source.tobytes())
+        return digest.hexdigest()
+    stat = os.stat(source)
+    file_key = (os.path.abspath(source), stat.st_mtime_ns, stat.st_size)
+    value = _file_digests.get(file_key)
+    if value is None:
+        digest = hashlib.sha256()
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b""):
+                digest.update(block)
+        if len(_file_digests) >= HASHED_FILES:
+            _file_digests.clear()
+        value = _file_digests[file_key] = digest.hexdigest()
+    return value
+
+
+# Hard-link src to dst when link is set and both are on one file system, copy it otherwise
+def _link_or_copy(src, dst, link=True):
+    if link:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # Different file systems, or no hard links there
+    shutil.copyfile(src, dst)
+
+
+# Put a cached file at path, replacing any file there only once it is complete
+def _place(src, path, link=True):
+    if os.path.exists(path) and os.path.samefile(src, path):
+        return  # Already linked there by an earlier hit (renaming onto the same file would do nothing)
+    with atomic_path(path) as temp_path:
+        os.remove(temp_path)
+        _link_or_copy(src, temp_path, link)
+
+
+# Size and modification time of a file, to notice cached files that were changed through an output link
+def _file_state(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+# Content-addressed cache of finished conversions in {cache_dir}/results: each entry holds the index array
+# and the PNG, schematic and .mcfunction of one conversion, keyed by a hash of the source image's bytes,
+# the output size, the options, the palette and RESULT_VERSION. A repeated conversion links (or copies)
+# the cached files to the requested output paths instead of converting again. Least recently used
+# entries are removed once the cache grows past max_bytes.
+class ResultCache:
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_RESULT_CACHE_BYTES, link=True):
+        self.path = os.path.join(cache_dir or default_cache_dir(), "results")
+        self.max_bytes = max_bytes
+        self.link = link  # Hard-link outputs to cached files (falls back to copying)
+        self.hits = 0
+        self.misses = 0
+
+    # Key of converting source to exactly width x height blocks with options
+    def key(self, source, width, height, options):
+        settings = {k: v for k, v in dataclasses.asdict(options).items() if k not in IGNORED_OPTIONS}
+        palette = palette_hash(options_palette(options), options.metric)
+        header = json.dumps([RESULT_VERSION, width, height, settings, palette], sort_keys=True)
+        return hashlib.sha256(header.encode() + source_digest(source).encode()).hexdigest()[:32]
+
+    # Look up a conversion (same arguments as pixelart.convert). Returns (key, ConvertResult or None); on a hit
+    # the cached PNG, schematic and .mcfunction are placed at the paths the conversion would write.
+    def get(self, source, width, height, options, output_path=None, schematic_name=None):
+        if isinstance(source, Image.Image):
+            size = source.size
+        else:
+            with Image.open(source) as img:  # Only the header is read here
+                size = img.size
+        width, height = target_size(size, width, height)
+        key = self.key(source, width, height, options)
+        entry_dir = os.path.join(self.path, key)
+        needed = ["idx"]
+        if output_path is not None:
+            needed.append("png")
+            needed += ["schematic"] if options.schematic else []
+            needed += ["mcfunction"] if options.mcfunction else []
+        try:
+            with open(os.path.join(entry_dir, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            files = meta["files"]
+            if any(kind not in files for kind in needed):
+                self.misses += 1
+                return key, None
+            if any(_file_state(os.path.join(entry_dir, files[kind]["name"])) != files[kind]["state"]
+                   for kind in files):
+                shutil.rmtree(entry_dir, ignore_errors=True)  # A cached file was changed (e.g. through an output link)
+                self.misses += 1
+                return key, None
+
+            result = ConvertResult(idx=np.load(os.path.join(entry_dir, files["idx"]["name"]), mmap_mode="r"),
+                                   palette=options_palette(options))
+            if output_path is not None:
+                if schematic_name is None:
+                    schematic_name = default_schematic_name(source, output_path, width, height, options.shade)
+                _place(os.path.join(entry_dir, files["png"]["name"]), output_path, self.link)
+                result.png_path = output_path
+                if options.schematic:
+                    result.schematic_path = os.path.join(os.path.dirname(output_path), f"{schematic_name}.schem")
+                    _place(os.path.join(entry_dir, files["schematic"]["name"]), result.schematic_path, self.link)
+                if options.mcfunction:
+                    result.function_path = mcfunction_path(output_path, schematic_name)
+                    _place(os.path.join(entry_dir, files["mcfunction"]["name"]), result.function_path, self.link)
+                    result.command_stats = CommandStats(**meta["command_stats"])
+            os.utime(os.path.join(entry_dir, "meta.json"))  # Last use, for the eviction order
+        except (OSError, ValueError, KeyError):
+            self.misses += 1  # Missing, incomplete or concurrently evicted entry
+            return key, None
+        self.hits += 1
+        return key, result
+
+    # Store a finished conversion under key (from get), then evict down to max_bytes
+    def put(self, key, result, source=None):
+        os.makedirs(self.path, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(dir=self.path, prefix=f".{key}.")
+        try:
+            files = {"idx": "idx.npy"}
+            np.save(os.path.join(temp_dir, "idx.npy"), result.idx)
+            for kind, path, name in (("png", result.png_path, "image.png"),
+                                     ("schematic", result.schematic_path, "image.schem"),
+                                     ("mcfunction", result.function_path, "image.mcfunction")):
+                if path is not None:
+                    _link_or_copy(path, os.path.join(temp_dir, name), self.link)
+                    files[kind] = name
+            height, width = result.idx.shape
+            meta = {
+                "version": RESULT_VERSION,
+                "key": key,
+                "source": source,
+                "width": width,
+                "height": height,
+                "created": time.time(),
+                "files": {kind: {"name": name, "state": _file_state(os.path.join(temp_dir, name))}
+                          for kind, name in files.items()},
+                "command_stats": result.command_stats and dataclasses.asdict(result.command_stats),
+            }
+            with open(os.path.join(temp_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+
+            entry_dir = os.path.join(self.path, key)
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)  # Replace an entry without some of these files
+            os.rename(temp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(temp_dir, ignore_errors=True)  # Another process stored the same key first
+            return
+        self.evict()
+
+    # Cached conversions, least recently used first
+    def entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            entry_dir = os.path.join(self.path, name)
+            if name.startswith("."):
+                continue  # Entry still being written
+            try:
+                meta_path = os.path.join(entry_dir, "meta.json")
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+                size = sum(os.path.getsize(os.path.join(entry_dir, file)) for file in os.listdir(entry_dir))
+                entries.append(CacheEntry(key=name, path=entry_dir, size=size, last_used=os.path.getmtime(meta_path),
+                                          source=meta.get("source"), width=meta["width"], height=meta["height"],
+                                          files=tuple(meta["files"])))
+            except (OSError, ValueError, KeyError):
+                continue  # Removed meanwhile or unreadable
+        entries.sort(key=lambda entry: entry.last_used)
+        return entries
+
+    # Bytes used by all entries
+    def total_size(self):
+        return sum(entry.size for entry in self.entries())
+
+    # Remove least recently used entries until the cache fits max_bytes (or the given limit);
+    # returns the number of entries removed
+    def evict(self, max_bytes=None):
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(entry.size for entry in entries)
+        removed = 0
+        for entry in entries:
+            if total <= limit:
+                break
+            shutil.rmtree(entry.path, ignore_errors=True)
+            total -= entry.size
+            removed += 1
+        return removed
+
+    # Remove every entry; returns the number removed
+    def clear(self):
+        return self.evict(0)
@@ -0,0 +1,150 @@
+import gzip  # For gzip-compressed NBT output
+import os  # OS-related functions (path handling, etc.)
+import numpy as np  # Import NumPy for array and numerical calculations
+from .atomic import atomic_path
+from .compiled import compile_palette
+from .palettes import base_colors
+from .memory import release_pages
+from .nbt import NBTWriter, TAG_COMPOUND
+
+SCHEM_DATA_VERSION = 1241  # Same DataVersion as mcschematic.Version.JE_1_12_1
+CHUNK_CELLS = 1 << 20  # Blocks counted / encoded and compressed at a time
+COMPRESS_LEVEL = 6  # gzip level of .schem files, as for PNGs (9 is several times slower for barely smaller files)
+
+
+# Encode non-negative integers as a contiguous varint byte array (Sponge BlockData encoding)
+def encode_varints(values):
+    values = np.asarray(values, dtype=np.int64).ravel()
+    if values.size == 0 or values.max() < 128:
+        return values.astype(np.uint8)  # Every id fits in one byte
+
+    lengths = np.ones(values.size, dtype=np.int64)  # Bytes needed per value
+    for shift in (7, 14, 21, 28):
+        lengths += values >= (1 << shift)
+    starts = np.cumsum(lengths) - lengths  # Offset of each value's first byte
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for k in range(int(lengths.max())):
+        sel = lengths > k  # Values that have a k-th byte
+        byte = (values[sel] >> (7 * k)) & 0x7F
+        out[starts[sel] + k] = byte | np.where(lengths[sel] > k + 1, 0x80, 0)  # Continuation bit
+    return out
+
+
+# Block-state palette for the color indices counted in counts: returns (palette names in id order,
+# index -> id table). Indices sharing a block (shades of one color, duplicate blocks) share an id.
+def build_block_palette(counts, palette):
+    block = np.zeros(len(counts), dtype=np.int64)  # Indices past the palette stay air
+    n = min(len(counts), len(palette))
+    block[:n] = palette.block[:n]
+    used = np.union1d([0], block[counts > 0])  # Air is always id 0, like mcschematic
+    return [palette.blocks[b] for b in used], np.searchsorted(used, block)
+
+
+# Native Sponge schematic (.schem, version 2) writer: builds the palette and varint BlockData in bulk
+# with NumPy and streams gzip-compressed NBT straight to disk. The art lies in the y=0 layer,
+# image rows along z and columns along x, exactly as in the mcschematic writer.
+# idx_matrix indexes palette (base_colors by default; shaded indices map to their base color's block).
+# A 3D (layers, rows, columns) array stacks its layers upwards from y=0 (e.g. animation frames).
+# progress(fraction), if given, is called after every chunk of BlockData.
+def write_sponge_schematic(idx_matrix, path, palette=None, progress=None):
+    idx = np.asarray(idx_matrix)
+    if idx.ndim not in (2, 3):
+        raise ValueError(f"Expected a 2D or 3D index array, got shape {idx.shape}")
+    layers = idx.shape[0] if idx.ndim == 3 else 1
+    height, width = idx.shape[-2:]
+    if width > 0xFFFF or height > 0xFFFF or layers > 0xFFFF:
+        raise ValueError(f"Schematic size {width}x{layers}x{height} exceeds the 65535 block limit")
+    palette = compile_palette(base_colors if palette is None else palette)
+    idx = idx.reshape(layers * height, width)  # Rows of all layers in Sponge (y, z, x) order
+    total_rows = layers * height
+
+    # Count the indices chunk by chunk (idx may be a memory-mapped array larger than RAM)
+    rows_per_chunk = max(1, CHUNK_CELLS // max(width, 1))
+    counts = np.zeros(1, dtype=np.int64)
+    for top in range(0, total_rows, rows_per_chunk):
+        chunk_counts = np.bincount(idx[top:top + rows_per_chunk].ravel())
+        if len(chunk_counts) > len(counts):
+            counts = np.pad(counts, (0, len(chunk_counts) - len(counts)))
+        counts[:len(chunk_counts)] += chunk_counts
+        release_pages(idx)  # Keep a file-backed index array from piling up in memory
+
+    names, remap = build_block_palette(counts, palette)
+    id_lengths = np.array([encode_varints([n]).size for n in range(len(names))])  # Varint bytes per id
+    data_length = int(counts @ id_lengths[remap])  # BlockData size, known before streaming
+
+    def unsigned_short(value):
+        return value - 0x10000 if value >= 0x8000 else value  # NBT shorts are signed, Sponge reads them unsigned
+
+    with gzip.open(path, "wb", compresslevel=COMPRESS_LEVEL) as f:
+        nbt = NBTWriter(f)
+        nbt.begin_compound("Schematic")
+        nbt.int("Version", 2)
+        nbt.int("DataVersion", SCHEM_DATA_VERSION)
+        nbt.begin_compound("Metadata")
+        nbt.int("WEOffsetX", 0)
+        nbt.int("WEOffsetY", 0)
+        nbt.int("WEOffsetZ", 0)
+        nbt.end_compound()
+        nbt.short("Width", unsigned_short(width))
+        nbt.short("Height", unsigned_short(layers))
+        nbt.short("Length", unsigned_short(height))
+        nbt.int("PaletteMax", len(names))
+        nbt.begin_compound("Palette")
+        for block_id, name in enumerate(names):
+            nbt.int(name, block_id)
+        nbt.end_compound()
+        nbt.begin_byte_array("BlockData", data_length)
+        for top in range(0, total_rows, rows_per_chunk):  # Stream the varints a few rows at a time
+            # Block-state id per cell (row-major = Sponge x,z order)
+            f.write(encode_varints(remap[idx[top:top + rows_per_chunk]]).tobytes())
+            release_pages(idx)
+            if progress is not None:
+                progress(min(total_rows, top + rows_per_chunk) / total_rows)
+        nbt.begin_list("BlockEntities", TAG_COMPOUND, 0)
+        nbt.end_compound()
+    return path
+
+
+# Original writer: places every block through mcschematic.MCSchematic.setBlock (slow, kept as fallback)
+def write_mcschematic(idx_matrix, output_dir, schem_name, palette=None):
+    try:
+        import mcschematic  # Imported here: only this fallback writer needs it, and it is slow to import
+    except ImportError:
+        raise ImportError("The mcschematic package is required for the mcschematic writer") from None
+    idx = np.asarray(idx_matrix)
+    if idx.ndim != 2:
+        raise ValueError("The mcschematic writer only writes a single layer, use the native writer")
+
+    schem = mcschematic.MCSchematic()  # Create new schematic object
+    palette = compile_palette(base_colors if palette is None else palette)
+    block_names = [palette.blocks[b] for b in palette.block]  # Color index -> block ID
+
+    for y, x in zip(*np.nonzero(idx < len(palette))):  # Indices past the palette place nothing
+        schem.setBlock((int(x), 0, int(y)), block_names[idx[y, x]])  # Place block in schematic (y=0 layer)
+
+    schem.save(  # Save schematic file
+        output_dir,
+        schem_name,
+        mcschematic.Version.JE_1_12_1  # Minecraft version 1.12.1 format
+    )
+
+
+# Function to create a Minecraft schematic file (.schem) from a color index matrix
+# writer: "native" (streaming NumPy writer) or "mcschematic" (original per-block path)
+# The file only appears once it is complete; progress(fraction) is called while the native writer streams.
+# palette: the palette idx_matrix refers to (base_colors by default)
+# idx_matrix: a 2D (or, for the native writer, 3D) index array, or anything np.asarray takes without
+# copying, such as a memoryview of one or a memory-mapped array
+# group: optional pixelart.atomic.atomic_group() list the file joins instead of appearing on its own
+def create_schematic_from_idx_matrix(idx_matrix, output_path, schem_name, writer="native", progress=None,
+                                     palette=None, group=None):
+    output_dir = os.path.dirname(output_path)  # Output directory path
+    schematic_path = os.path.join(output_dir, f"{schem_name}.schem")
+    if writer not in ("native", "mcschematic"):
+        raise ValueError(f"Unknown schematic writer: {writer!r}")
+    with atomic_path(schematic_path, group) as temp_path:
+        if writer == "native":
+            write_sponge_schematic(idx_matrix, temp_path, palette, progress=progress)
+        else:
+            write_mcschematic(idx_matrix, output_dir, os.path.splitext(os.path.basename(temp_path))[0], palette)
+    return schematic_path  # Return saved file path
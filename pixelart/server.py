@@ -0,0 +1,359 @@
+import dataclasses  # For per-request copies of the default options
+import email.parser  # For multipart/form-data uploads
+import email.policy
+import io  # For building zip responses in memory
+import json  # For the metrics endpoint and error bodies
+import math
+import os  # OS-related functions (path handling, etc.)
+import re  # For sanitizing uploaded file names
+import tempfile  # For the per-job working folder
+import threading  # Requests are handled on one thread each
+import time  # For latency counters
+import zipfile  # For returning all outputs at once
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from PIL import Image, ImageColor, UnidentifiedImageError  # Import library for image processing
+from .convert import ConvertOptions, convert, options_palette, output_names, target_size
+from .dither import DITHER_METHODS
+from .filters import allowed_base_colors
+from .lut import load_lut
+from .quantize import METRICS
+
+MAX_UPLOAD_BYTES = 32 << 20  # Largest accepted upload
+MAX_BLOCKS = 1 << 24  # Largest accepted output (width x height)
+FORMATS = ("zip", "png", "schematic", "mcfunction")  # Response formats: all outputs zipped, or a single file
+CONTENT_TYPES = {"zip": "application/zip", "png": "image/png", "schematic": "application/octet-stream",
+                 "mcfunction": "text/plain; charset=utf-8"}
+
+
+# Parameters of a request that do not make sense
+class RequestError(ValueError):
+    pass
+
+
+# Load the lookup table of the default options once per worker, so the first requests do not each map it
+def warm_worker(options):
+    if options.use_lut:
+        load_lut(options_palette(options), metric=options.metric)
+
+
+# Output size in blocks of an upload of image_size pixels; raises RequestError past MAX_BLOCKS
+def output_size(image_size, width, height):
+    w, h = target_size(image_size, width, height)
+    if w * h > MAX_BLOCKS:
+        raise RequestError(f"Output of {w}x{h} blocks is larger than {MAX_BLOCKS} blocks")
+    return w, h
+
+
+# Convert one uploaded image inside a worker process. Returns (response body, file name, stage timings,
+# worker start time); the outputs are written to a temporary folder that is removed afterwards.
+def run_job(data, name, width, height, options, fmt, results=None):
+    started = time.time()
+    with tempfile.TemporaryDirectory(prefix="pixelart-") as work_dir:
+        source = os.path.join(work_dir, "upload")
+        with open(source, "wb") as f:
+            f.write(data)
+        with Image.open(source) as img:  # Only the header is read here
+            w, h = output_size(img.size, width, height)
+        png_name, schematic_name = output_names(name, w, h, options.shade)
+        result = convert(source, w, h, options, output_path=os.path.join(work_dir, png_name),
+                         schematic_name=schematic_name, results=results)
+        outputs = {"png": result.png_path, "schematic": result.schematic_path, "mcfunction": result.function_path}
+        if fmt != "zip":
+            with open(outputs[fmt], "rb") as f:
+                return f.read(), os.path.basename(outputs[fmt]), result.timings, started
+        body = io.BytesIO()
+        with zipfile.ZipFile(body, "w") as archive:
+            for kind, path in outputs.items():
+                if path is not None:  # PNG and schematic are compressed already, the commands are text
+                    archive.write(path, os.path.basename(path),
+                                  zipfile.ZIP_DEFLATED if kind == "mcfunction" else zipfile.ZIP_STORED)
+    return body.getvalue(), f"{name}_{w}x{h}_pixelart.zip", result.timings, started
+
+
+# Request parameters (query string and form fields) as width, height, options and response format;
+# options not given keep the server's defaults
+def request_options(params, defaults):
+    def value(key, default=None):
+        return params[key][-1] if params.get(key) else default
+
+    def flag(key, default):
+        text = value(key)
+        if text is None:
+            return default
+        if text.lower() not in ("1", "0", "true", "false", "yes", "no", "on", "off"):
+            raise RequestError(f"{key} must be true or false, got {text!r}")
+        return text.lower() in ("1", "true", "yes", "on")
+
+    def size(key):
+        text = value(key)
+        if text is None:
+            return None
+        if not text.isdigit() or int(text) < 1:
+            raise RequestError(f"{key} must be a positive whole number of blocks, got {text!r}")
+        return int(text)
+
+    def blocks(key):
+        return [name for item in params.get(key, []) for name in item.split(",") if name.strip()]
+
+    fmt = value("format", "zip")
+    if fmt not in FORMATS:
+        raise RequestError(f"Unknown format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    metric = value("metric", defaults.metric)
+    if metric not in METRICS:
+        raise RequestError(f"Unknown color metric {metric!r}, expected one of {', '.join(METRICS)}")
+    dither = value("dither", defaults.dither)
+    if dither not in DITHER_METHODS:
+        raise RequestError(f"Unknown dithering method {dither!r}, expected one of {', '.join(DITHER_METHODS)}")
+    include = blocks("only") or defaults.include_blocks
+    exclude = blocks("exclude") or defaults.exclude_blocks
+    try:
+        allowed_base_colors(include, exclude)
+    except ValueError as e:
+        raise RequestError(str(e)) from None
+    fill = value("fill", defaults.fill_color)
+    if fill is not None:
+        try:
+            ImageColor.getrgb(fill)
+        except ValueError:
+            raise RequestError(f"fill must be a color such as #ffffff or white, got {fill!r}") from None
+
+    options = dataclasses.replace(
+        defaults, crop=flag("crop", defaults.crop), fill_color=fill, shade=flag("shade", defaults.shade),
+        metric=metric, dither=dither, include_blocks=include and tuple(include), exclude_blocks=tuple(exclude),
+        schematic=fmt == "schematic" or flag("schematic", defaults.schematic and fmt == "zip"),
+        mcfunction=fmt == "mcfunction" or flag("mcfunction", defaults.mcfunction and fmt == "zip"))
+    return size("width"), size("height"), options, fmt
+
+
+# File name stem of an upload, safe to use in output names
+def upload_name(filename):
+    stem = os.path.splitext(os.path.basename(filename or ""))[0]
+    return re.sub(r"[^\w.-]", "_", stem)[:64] or "image"
+
+
+# Counters shared by the request threads: requests by outcome and latency per stage
+class Metrics:
+    def __init__(self):
+        self.started = time.time()
+        self.requests = {"accepted": 0, "completed": 0, "rejected": 0, "invalid": 0, "failed": 0}
+        self.stages = {}  # Stage name -> {"count", "seconds", "max"}
+        self._lock = threading.Lock()
+
+    def count(self, outcome):
+        with self._lock:
+            self.requests[outcome] += 1
+
+    # Add one measurement per stage from a timings dict (seconds per stage name)
+    def record(self, timings):
+        with self._lock:
+            for stage, seconds in timings.items():
+                entry = self.stages.setdefault(stage, {"count": 0, "seconds": 0.0, "max": 0.0})
+                entry["count"] += 1
+                entry["seconds"] += seconds
+                entry["max"] = max(entry["max"], seconds)
+
+    # Average seconds of a stage, or None before its first measurement
+    def mean(self, stage):
+        with self._lock:
+            entry = self.stages.get(stage)
+            return entry and entry["seconds"] / entry["count"]
+
+    def snapshot(self):
+        with self._lock:
+            return {"uptime": time.time() - self.started, "requests": dict(self.requests),
+                    "stages": {stage: dict(entry) for stage, entry in self.stages.items()}}
+
+
+# HTTP service converting uploaded images on a process pool of jobs workers. At most jobs + queue_size
+# conversions are admitted at a time; further uploads are answered with 429 (and a Retry-After estimate)
+# instead of piling up. defaults: ConvertOptions that requests start from; results: optional ResultCache.
+class ConversionServer(ThreadingHTTPServer):
+    daemon_threads = True  # Open connections do not keep the process alive
+
+    def __init__(self, address, jobs=None, queue_size=None, defaults=None, results=None):
+        super().__init__(address, ConversionHandler)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.queue_size = 2 * self.jobs if queue_size is None else queue_size
+        self.defaults = defaults or ConvertOptions()
+        self.results = results
+        self.metrics = Metrics()
+        self.pending = 0  # Admitted conversions, queued or running
+        self._lock = threading.Lock()
+        self._restart_lock = threading.Lock()  # Held while a broken pool is replaced
+        self.pool = self._start_pool()
+
+    # Start the workers and load the default lookup table in each, before the pool takes any request
+    def _start_pool(self):
+        pool = ProcessPoolExecutor(max_workers=self.jobs)
+        list(pool.map(warm_worker, [self.defaults] * self.jobs))
+        return pool
+
+    # Reserve a place for one conversion; False when workers and queue are full
+    def admit(self):
+        with self._lock:
+            if self.pending >= self.jobs + self.queue_size:
+                return False
+            self.pending += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.pending -= 1
+
+    # Replace a pool whose worker died (e.g. killed for running out of memory) with a warmed-up one, so the
+    # next requests do not pay for starting workers and loading tables as queue time
+    def restart_pool(self, broken):
+        with self._restart_lock:
+            if self.pool is not broken:
+                return  # Another request restarted it already
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.pool = self._start_pool()
+
+    # Seconds until a place is likely to be free, from the average conversion time
+    def retry_after(self):
+        mean = self.metrics.mean("request") or 1.0
+        with self._lock:
+            waiting = max(0, self.pending - self.jobs + 1)
+        return max(1, math.ceil(mean * waiting / self.jobs))
+
+    # Metrics endpoint contents: queue, workers, request counts and per-stage latencies
+    def status(self):
+        with self._lock:
+            pending = self.pending
+        status = {"workers": self.jobs, "queue_limit": self.queue_size,
+                  "in_flight": min(pending, self.jobs), "queued": max(0, pending - self.jobs)}
+        status.update(self.metrics.snapshot())
+        return status
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+
+# Request handler: POST /convert, GET /metrics and GET /health
+class ConversionHandler(BaseHTTPRequestHandler):
+    server_version = "pixelart"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            self.send_json(200, self.server.status())
+        elif path == "/health":
+            self.send_body(200, b"ok\n", "text/plain; charset=utf-8")
+        else:
+            self.send_json(404, {"error": f"No such endpoint {path}"})
+
+    # Upload: the image as the raw request body, or as the "image" field of a multipart/form-data form.
+    # Parameters: width, height, crop, fill, shade, metric, dither, only, exclude, schematic, mcfunction and format.
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/convert":
+            self.send_json(404, {"error": f"No such endpoint {url.path}"}, close=True)
+            return
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            self.send_json(411, {"error": "Content-Length is required"}, close=True)
+            return
+        if int(length) > MAX_UPLOAD_BYTES:
+            self.send_json(413, {"error": f"Uploads are limited to {MAX_UPLOAD_BYTES >> 20} MB"}, close=True)
+            return
+        server = self.server
+        if not server.admit():  # Before reading the upload, so a full server does no work for it
+            server.metrics.count("rejected")
+            self.send_json(429, {"error": "Too many conversions queued, try again later"}, close=True,
+                           headers={"Retry-After": str(server.retry_after())})
+            return
+
+        start = time.perf_counter()
+        try:
+            try:
+                body = self.rfile.read(int(length))
+                params = parse_qs(url.query)
+                data, filename = self.read_upload(body, params)
+                width, height, options, fmt = request_options(params, server.defaults)
+                with Image.open(io.BytesIO(data)) as img:  # Only the header is read: reject non-images here
+                    output_size(img.size, width, height)
+                server.metrics.count("accepted")  # Only valid uploads: invalid and rejected ones are counted apart
+                pool = server.pool
+                try:
+                    future = pool.submit(run_job, data, upload_name(filename), width, height, options, fmt,
+                                         server.results)
+                    submitted = time.time()
+                    content, name, timings, started = future.result()
+                except BrokenProcessPool:  # Raised by submit too, once the pool knows a worker died
+                    server.restart_pool(pool)
+                    raise
+            finally:
+                server.release()  # Before answering, so the client's next upload finds the place free
+            timings = dict(timings, queue=max(0.0, started - submitted), request=time.perf_counter() - start)
+            server.metrics.record(timings)
+            server.metrics.count("completed")
+        except (RequestError, Image.DecompressionBombError) as e:
+            server.metrics.count("invalid")
+            self.send_json(400, {"error": str(e)})
+        except UnidentifiedImageError:
+            server.metrics.count("invalid")
+            self.send_json(400, {"error": "The upload is not an image file PIL can read"})
+        except BrokenProcessPool:
+            server.metrics.count("failed")
+            self.send_json(503, {"error": "A conversion worker stopped, try again"})
+        except Exception as e:
+            server.metrics.count("failed")
+            self.send_json(500, {"error": f"{type(e).__name__}: {e}"})
+        else:
+            self.send_body(200, content, CONTENT_TYPES[fmt], {
+                "Content-Disposition": f'attachment; filename="{name}"',
+                "X-Conversion-Seconds": f"{timings['request']:.3f}"})
+
+    # (image bytes, file name or None) of a request body; form fields other than the image are added to params
+    def read_upload(self, body, params):
+        content_type = self.headers.get("Content-Type", "")
+        if not content_type.startswith("multipart/form-data"):
+            return body, None
+        form = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body)
+        upload = None
+        for part in form.iter_parts():
+            field = part.get_param("name", header="content-disposition")
+            if field == "image" or (upload is None and part.get_filename()):
+                upload = part
+            elif field:
+                params.setdefault(field, []).append(part.get_content().strip())
+        if upload is None:
+            raise RequestError('The form has no "image" file field')
+        return upload.get_payload(decode=True), upload.get_filename()
+
+    def send_body(self, code, body, content_type, headers=None, close=False):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if close:  # The request body was not read, so the connection cannot be reused
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, code, value, close=False, headers=None):
+        self.send_body(code, (json.dumps(value, indent=2) + "\n").encode(), "application/json", headers, close)
+
+
+# Run the service until interrupted; address is "PORT" or "HOST:PORT" (default host: localhost only)
+def serve(address, jobs=None, queue_size=None, defaults=None, results=None):
+    host, _, port = address.rpartition(":")
+    server = ConversionServer((host or "127.0.0.1", int(port)), jobs, queue_size, defaults, results)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port} ({server.jobs} workers, queue of {server.queue_size}); "
+          f"POST /convert, GET /metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
@@ -0,0 +1,126 @@
+import os  # OS-related functions (path handling, etc.)
+from contextlib import nullcontext
+import numpy as np  # Import NumPy for array and numerical calculations
+from PIL import Image  # Import library for image processing
+from .atomic import atomic_group, atomic_path
+from .convert import (ConvertOptions, ConvertResult, DEFAULT_MEMORY_LIMIT, draft_image, fill_transparent,
+                      palette_rgba, options_palette, resize_box, save_commands, stage_progress, target_size)
+from .dither import DIFFUSION_KERNELS, dither_image
+from .instrument import span
+from .lut import load_lut
+from .memory import mapped_array, peak_rss, release_pages
+from .png import PNGStreamWriter
+from .quantize import index_dtype
+from .schematic import create_schematic_from_idx_matrix
+
+WORK_BYTES_PER_PIXEL = 64  # Rough working memory per output pixel while quantizing/dithering a strip
+
+
+# Source pixel for every output pixel along one axis, exactly as PIL's NEAREST resize picks it when
+# sampling the source range start..end (default: all n_in pixels). PIL keeps the resize box in 32-bit
+# floats and accumulates the scale step by step, so both roundings are reproduced here.
+def nearest_indices(n_in, n_out, start=0.0, end=None):
+    start, end = np.float32(start), np.float32(n_in if end is None else end)
+    scale = float(end - start) / n_out
+    steps = np.full(n_out, scale)
+    steps[0] = float(start) + scale * 0.5  # Sample at pixel centers
+    return np.minimum(np.add.accumulate(steps).astype(np.int64), n_in - 1)
+
+
+# Source row and column tables for a (width, height) output, including the centered crop
+def resample_tables(src_size, width, height, crop=False):
+    left, top, right, bottom = resize_box(src_size, width, height, crop)
+    rows = nearest_indices(src_size[1], height, top, bottom)
+    cols = nearest_indices(src_size[0], width, left, right)
+    return rows, cols
+
+
+# Resized RGBA pixels (len(rows), len(cols), 4) picked from img by sorted source row/column tables;
+# only the source band the strip needs is cropped and converted
+def read_strip(img, rows, cols, fill_color=None):
+    col_start, row_start = int(cols[0]), int(rows[0])
+    band = img.crop((col_start, row_start, int(cols[-1]) + 1, int(rows[-1]) + 1))
+    if band.mode != 'RGBA':
+        band = band.convert('RGBA')
+    strip = np.asarray(band)[(rows - row_start)[:, None], (cols - col_start)[None, :]]
+    if fill_color is not None:
+        strip = np.asarray(fill_transparent(Image.fromarray(strip, 'RGBA'), fill_color))
+    return strip
+
+
+# Output rows per strip so one strip's source band plus working buffers stay within memory_limit bytes
+def strip_rows(src_size, width, height, memory_limit=DEFAULT_MEMORY_LIMIT):
+    src_w, src_h = src_size
+    source_rows_per_row = -(-src_h // height) + 1  # Source rows a single output row can span
+    per_row = width * WORK_BYTES_PER_PIXEL + source_rows_per_row * src_w * 4 * 2  # Band crop + RGBA copy
+    return int(max(1, min(height, memory_limit // per_row)))
+
+
+# Streaming conversion: resize, quantize and write the PNG in horizontal strips, keeping the index array
+# in a memory-mapped temporary file, then stream the schematic from it. Peak memory is the decoded
+# source image plus one strip, independent of the output size. Error diffusion needs the whole image
+# in scan order and is not supported here. progress(stage, fraction) works as in convert(); strips report
+# as the "quantize" stage.
+def convert_streaming(source, width, height, options=None, output_path=None, schematic_name=None, progress=None):
+    options = options or ConvertOptions()
+    report = progress or (lambda stage, fraction: None)
+    if options.dither in DIFFUSION_KERNELS:
+        raise ValueError(f"Error diffusion dithering ({options.dither}) is not supported in streaming mode")
+    timings = {"open": 0.0, "resize": 0.0, "quantize": 0.0, "png": 0.0}
+
+    with span("open", timings):
+        img = source if isinstance(source, Image.Image) else Image.open(source)  # Decoded on the first crop
+        width, height = target_size(img.size, width, height)
+        if not isinstance(source, Image.Image):
+            draft_image(img, width, height, options.crop)
+        rows, cols = resample_tables(img.size, width, height, options.crop)
+
+    palette = options_palette(options)
+    lut = load_lut(palette, metric=options.metric) if options.use_lut else None
+    colors = palette_rgba(palette)
+    idx = mapped_array((height, width), index_dtype(len(palette)))  # Lives in a temporary file, not in memory
+    step = strip_rows(img.size, width, height, options.memory_limit)
+
+    result = ConvertResult(idx=idx, palette=palette, timings=timings)
+    # The PNG, schematic and .mcfunction are written under temporary names and only appear together once all
+    # are complete
+    with atomic_group() as group, (atomic_path(output_path, group) if output_path is not None
+                                   else nullcontext()) as temp_path:
+        png = PNGStreamWriter(temp_path, width, height) if temp_path is not None else None
+        try:
+            with span("strips", rows_per_strip=step, strips=-(-height // step)) as strips:
+                for y0 in range(0, height, step):
+                    report("quantize", y0 / height)
+                    y1 = min(height, y0 + step)
+                    pixels = (y1 - y0) * width
+                    with span("resize", timings, row=y0, pixels=pixels):
+                        strip = read_strip(img, rows[y0:y1], cols, options.fill_color)
+                    with span("quantize", timings, row=y0, pixels=pixels):
+                        idx[y0:y1] = dither_image(strip, palette, options.dither, lut=lut, metric=options.metric,
+                                                  origin=(0, y0))
+                    if png is not None:
+                        with span("png", timings, row=y0, pixels=pixels):
+                            png.write_rows(colors[idx[y0:y1]])
+                    release_pages(idx)  # Finished rows are only needed again by the schematic writer
+                if png is not None:
+                    png.close()
+                    strips.update(bytes=os.path.getsize(temp_path))
+        except BaseException:
+            if png is not None:
+                png.abort()
+            raise
+
+        if png is not None and options.schematic and schematic_name is not None:
+            report("schematic", 0.0)
+            with span("schematic", timings, blocks=width * height, writer=options.schematic_writer) as stage:
+                result.schematic_path = create_schematic_from_idx_matrix(idx, output_path, schematic_name,
+                                                                         options.schematic_writer,
+                                                                         stage_progress(progress, "schematic"),
+                                                                         palette=palette, group=group)
+                stage.update(bytes=os.path.getsize(group[-1][0]))  # Still under its temporary name
+        if png is not None and options.mcfunction and schematic_name is not None:
+            save_commands(result, output_path, schematic_name, progress, group)
+    result.png_path = output_path
+    report("commands", 1.0)
+    result.peak_rss = peak_rss()
+    return result
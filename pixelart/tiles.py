@@ -0,0 +1,186 @@
+import hashlib  # For fingerprinting tile contents
+import json  # For the tile manifest
+import os  # OS-related functions (path handling, etc.)
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from PIL import Image  # Import library for image processing
+from .atomic import atomic_path
+from .commands import create_mcfunction_from_idx_matrix
+from .convert import ConvertOptions, draft_image, options_palette, render_image, target_size
+from .dither import dither_image
+from .instrument import span
+from .lut import load_lut
+from .schematic import create_schematic_from_idx_matrix
+from .streaming import read_strip, resample_tables
+
+MAP_SIZE = 128  # Blocks covered by one Minecraft map
+MANIFEST_VERSION = 3  # Bump when tile rendering changes, so old tiles are rebuilt
+OUTPUT_KEYS = ("png", "schematic", "mcfunction")  # Manifest entry fields naming a tile's files
+
+
+# Output of a tiled conversion
+@dataclass
+class TiledResult:
+    manifest_path: str  # JSON manifest listing every tile
+    tiles: list  # Manifest entries, row by row
+    rendered: int = 0  # Tiles written by this run
+    reused: int = 0  # Unchanged tiles kept from a previous run
+    timings: dict = field(default_factory=dict)  # Seconds spent per stage
+
+
+# File name stem of one tile
+def tile_name(name, row, col):
+    return f"{name}_r{row}_c{col}"
+
+
+# Fingerprint of everything a tile's output depends on: its resized pixels, position and options
+def tile_hash(rgba, x, y, options):
+    settings = json.dumps([MANIFEST_VERSION, x, y, rgba.shape, options.shade, options.metric, options.dither,
+                           options.schematic, options.schematic_writer, options.mcfunction,
+                           sorted(options.include_blocks or ()), sorted(options.exclude_blocks or ())])
+    return hashlib.sha256(settings.encode() + rgba.tobytes()).hexdigest()[:16]
+
+
+# Quantize one tile and write its PNG, schematic and .mcfunction (runs inside a worker process)
+# Ordered dithering continues the pattern of the whole image; error diffusion stays within the tile.
+def render_tile(rgba, x, y, options, output_dir, stem):
+    with span("tile", x=x, y=y, pixels=rgba.shape[0] * rgba.shape[1]):
+        palette = options_palette(options)
+        lut = load_lut(palette, metric=options.metric) if options.use_lut else None
+        idx = dither_image(rgba, palette, options.dither, lut=lut, metric=options.metric, origin=(x, y))
+        png_path = os.path.join(output_dir, stem + ".png")
+        with atomic_path(png_path) as temp_path:  # A crash never leaves a tile that looks finished
+            render_image(idx, palette).save(temp_path)
+        schematic_path = function_path = None
+        if options.schematic:
+            schematic_path = create_schematic_from_idx_matrix(idx, png_path, stem, options.schematic_writer,
+                                                              palette=palette)
+        if options.mcfunction:
+            function_path, _ = create_mcfunction_from_idx_matrix(idx, png_path, stem, palette)
+    return png_path, schematic_path, function_path
+
+
+# Store a rendered tile's output file names (relative to the manifest) in its manifest entry
+def _record_outputs(entry, paths):
+    png_path, schematic_path, function_path = paths
+    entry["png"] = os.path.basename(png_path)
+    entry["schematic"] = schematic_path and os.path.basename(schematic_path)
+    entry["mcfunction"] = function_path and os.path.basename(function_path)
+
+
+# Previous manifest entries keyed by (row, col), or {} if there is no usable manifest
+def read_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return {(tile["row"], tile["col"]): tile for tile in manifest.get("tiles", [])}
+
+
+# Output files (relative to the manifest) named by a manifest of any version, or an empty set
+def manifest_files(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        return {os.path.basename(tile[key]) for tile in manifest["tiles"] for key in OUTPUT_KEYS if tile.get(key)}
+    except (OSError, ValueError, KeyError, TypeError):
+        return set()
+
+
+# Write JSON through a temporary file so readers never see a half-written manifest
+def write_manifest(path, manifest):
+    with atomic_path(path) as temp_path:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+
+# Convert an image into a grid of map-aligned tiles (tile_size x tile_size blocks, smaller at the right and
+# bottom edges), each with its own PNG and schematic, plus {name}_manifest.json with the tile coordinates.
+# The image is resized one row of tiles at a time and tiles are rendered on a process pool (jobs workers,
+# None = all cores). Tiles whose pixels and options match the previous manifest are kept unless force is set,
+# so a changed region only rebuilds the tiles it touches. Files of the previous manifest that the new one no
+# longer lists (such as tiles past the edge of a smaller grid) are removed.
+def convert_tiled(source, width, height, options=None, output_dir=".", name=None, tile_size=MAP_SIZE,
+                  jobs=None, force=False):
+    options = options or ConvertOptions()
+    timings = {}
+    img = source if isinstance(source, Image.Image) else Image.open(source)  # Decoded on the first crop
+    width, height = target_size(img.size, width, height)
+    if not isinstance(source, Image.Image):
+        draft_image(img, width, height, options.crop)
+    if name is None:
+        file_name = "image" if isinstance(source, Image.Image) else os.path.splitext(os.path.basename(source))[0]
+        name = f"{file_name}_{width}x{height}_pixelart"
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, name + "_manifest.json")
+    previous = {} if force else read_manifest(manifest_path)
+    previous_files = manifest_files(manifest_path)
+    rows, cols = resample_tables(img.size, width, height, options.crop)
+    if options.use_lut:
+        load_lut(options_palette(options), metric=options.metric)  # Build once so workers only map it
+
+    with span("tiles", timings, width=width, height=height, tile_size=tile_size) as run:
+        jobs = jobs or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        pending = {}  # Future -> manifest entry waiting for its file names
+        tiles = []
+        result = TiledResult(manifest_path=manifest_path, tiles=tiles, timings=timings)
+
+        try:
+            for y in range(0, height, tile_size):
+                strip = read_strip(img, rows[y:y + tile_size], cols, options.fill_color)  # One row of tiles
+                for x in range(0, width, tile_size):
+                    tile = strip[:, x:x + tile_size]
+                    row, col = y // tile_size, x // tile_size
+                    entry = {"row": row, "col": col, "x": x, "y": y, "width": tile.shape[1],
+                             "height": tile.shape[0], "hash": tile_hash(tile, x, y, options)}
+                    tiles.append(entry)
+                    old = previous.get((row, col))
+                    if old is not None and old["hash"] == entry["hash"] and all(
+                            old[key] is None or os.path.exists(os.path.join(output_dir, old[key]))
+                            for key in OUTPUT_KEYS):
+                        entry.update((key, old[key]) for key in OUTPUT_KEYS)
+                        result.reused += 1
+                        continue
+
+                    result.rendered += 1
+                    stem = tile_name(name, row, col)
+                    if pool is None:
+                        _record_outputs(entry, render_tile(tile, x, y, options, output_dir, stem))
+                        continue
+                    pending[pool.submit(render_tile, tile, x, y, options, output_dir, stem)] = entry
+                    if len(pending) >= 4 * jobs:  # Bound the tiles queued in memory
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            _record_outputs(pending.pop(future), future.result())
+            for future in list(pending):
+                _record_outputs(pending.pop(future), future.result())
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        run.update(rendered=result.rendered, reused=result.reused)
+
+    write_manifest(manifest_path, {
+        "version": MANIFEST_VERSION,
+        "source": None if isinstance(source, Image.Image) else os.path.abspath(source),
+        "width": width,
+        "height": height,
+        "tile_size": tile_size,
+        "columns": -(-width // tile_size),
+        "rows": -(-height // tile_size),
+        "palette": "extended_colors" if options.shade else "base_colors",
+        "include_blocks": options.include_blocks and list(options.include_blocks),
+        "exclude_blocks": list(options.exclude_blocks or ()),
+        "metric": options.metric,
+        "dither": options.dither,
+        "tiles": tiles,  # x, y: offset of the tile's top-left block (image column/row = world x/z)
+    })
+    for file_name in previous_files - manifest_files(manifest_path):
+        try:
+            os.remove(os.path.join(output_dir, file_name))
+        except FileNotFoundError:
+            pass
+    return result
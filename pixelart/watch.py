@@ -0,0 +1,275 @@
+import ctypes  # For inotify on Linux (no extra package needed)
+import ctypes.util
+import dataclasses  # For sidecar settings on top of the default options
+import hashlib  # For fingerprinting the settings of a conversion
+import json  # For sidecar settings and the manifest
+import os  # OS-related functions (path handling, etc.)
+import select  # For waiting on the inotify descriptor with a timeout
+import signal  # Workers leave Ctrl+C to the daemon
+import struct  # For decoding inotify events
+import sys
+import time  # For debouncing and timing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from .convert import ConvertOptions
+from .dither import DITHER_METHODS
+from .filters import allowed_base_colors
+from .quantize import METRICS
+from .tiles import write_manifest
+
+WATCH_VERSION = 1  # Version of the watch manifest
+MANIFEST_NAME = "pixelart_watch.json"  # Written to the output folder
+SIDECAR_SUFFIX = ".json"  # Settings for photo.jpg are read from photo.jpg.json
+DEFAULT_SETTLE = 2.0  # Seconds a file must stay unchanged before it is converted
+POLL_INTERVAL = 1.0  # Seconds between scans when polling
+SIDECAR_KEYS = ("width", "height", "crop", "fill", "shade", "metric", "dither", "only", "exclude", "mcfunction",
+                "schematic", "frames", "layered")
+
+# inotify event flags (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, length of the name that follows
+
+
+# Change notifications for one folder through Linux inotify. changes(timeout) returns the names of the
+# files written, created or moved in, or None when events were lost and the folder must be scanned again.
+class InotifyWatcher:
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"Cannot watch {directory}")
+
+    def changes(self, timeout):
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        names = set()
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return names
+            pos = 0
+            while pos < len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, pos)
+                pos += EVENT_HEADER.size
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                names.add(os.fsdecode(data[pos:pos + length].rstrip(b"\0")))
+                pos += length
+
+    def close(self):
+        os.close(self.fd)
+
+
+# Change notifications by comparing the folder's file sizes and modification times every interval seconds
+# (for systems without inotify, and network shares whose remote writes inotify does not see)
+class PollingWatcher:
+    def __init__(self, directory, interval=POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.states = self.scan()
+
+    def scan(self):
+        states = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        states[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue  # Removed meanwhile
+        return states
+
+    def changes(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        states = self.scan()
+        names = {name for name, state in states.items() if self.states.get(name) != state}
+        self.states = states
+        return names
+
+    def close(self):
+        pass
+
+
+# Worker process setup: Ctrl+C reaches the whole process group, but only the daemon should handle it
+def ignore_interrupts():
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+# inotify where available, polling otherwise (or always with poll=True)
+def open_watcher(directory, poll=False):
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except OSError:
+            pass
+    return PollingWatcher(directory)
+
+
+# (size, modification time in ns) of a file, or None if it is gone
+def file_state(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+# Width, height, options, frames and layered for one image: the defaults, overridden by the keys of its
+# sidecar JSON file (photo.jpg.json next to photo.jpg) if there is one
+def image_settings(path, width, height, defaults, frames=False, layered=False):
+    try:
+        with open(path + SIDECAR_SUFFIX, encoding="utf-8") as f:
+            sidecar = json.load(f)
+    except FileNotFoundError:
+        return width, height, defaults, frames, layered
+    if not isinstance(sidecar, dict):
+        raise ValueError(f"{path + SIDECAR_SUFFIX} must hold a JSON object")
+    unknown = set(sidecar) - set(SIDECAR_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown settings {', '.join(sorted(unknown))} in {path + SIDECAR_SUFFIX}, "
+                         f"expected {', '.join(SIDECAR_KEYS)}")
+    for key in ("width", "height"):
+        if sidecar.get(key) is not None and (not isinstance(sidecar[key], int) or sidecar[key] < 1):
+            raise ValueError(f"{key} must be a positive whole number of blocks in {path + SIDECAR_SUFFIX}")
+    if sidecar.get("metric", defaults.metric) not in METRICS:
+        raise ValueError(f"Unknown color metric {sidecar['metric']!r} in {path + SIDECAR_SUFFIX}")
+    if sidecar.get("dither", defaults.dither) not in DITHER_METHODS:
+        raise ValueError(f"Unknown dithering method {sidecar['dither']!r} in {path + SIDECAR_SUFFIX}")
+    include = sidecar.get("only", defaults.include_blocks)
+    exclude = sidecar.get("exclude", defaults.exclude_blocks)
+    include, exclude = ([names] if isinstance(names, str) else names for names in (include, exclude))
+    allowed_base_colors(include, exclude)  # Unknown block names raise ValueError
+    options = dataclasses.replace(
+        defaults, crop=bool(sidecar.get("crop", defaults.crop)), fill_color=sidecar.get("fill", defaults.fill_color),
+        shade=bool(sidecar.get("shade", defaults.shade)), metric=sidecar.get("metric", defaults.metric),
+        dither=sidecar.get("dither", defaults.dither), include_blocks=include and tuple(include),
+        exclude_blocks=tuple(exclude or ()), schematic=bool(sidecar.get("schematic", defaults.schematic)),
+        mcfunction=bool(sidecar.get("mcfunction", defaults.mcfunction)))
+    return (sidecar.get("width", width), sidecar.get("height", height), options,
+            bool(sidecar.get("frames", frames)), bool(sidecar.get("layered", layered)))
+
+
+# Fingerprint of everything a conversion's outputs depend on besides the source file
+def settings_hash(width, height, options, frames, layered):
+    settings = json.dumps([WATCH_VERSION, width, height, dataclasses.asdict(options), frames, layered],
+                          sort_keys=True, default=list)
+    return hashlib.sha256(settings.encode()).hexdigest()[:16]
+
+
+# Watch input_dir and convert every image that appears or changes into output_dir, with the defaults
+# (width, height, options, frames, layered as in the CLI) or the image's sidecar settings. A file is only
+# converted once its size and modification time have not changed for settle seconds, so half-copied files
+# are left alone; outputs appear atomically. {output_dir}/pixelart_watch.json records what every output
+# was made from, so files whose outputs are up to date (also after a restart) are skipped. Conversions
+# run on jobs worker processes (None = all cores). Runs until interrupted, stop() returns True, or, with
+# once=True, until the files already there are converted. log(message) receives one line per event.
+def watch_folder(input_dir, output_dir, width=None, height=None, options=None, frames=False, layered=False,
+                 jobs=None, settle=DEFAULT_SETTLE, poll=False, once=False, results=None, log=print, stop=None):
+    from .cli import IMAGE_EXTENSIONS, convert_file  # Imported here: pixelart.cli builds on this module
+
+    options = options or ConvertOptions()
+    os.makedirs(output_dir, exist_ok=True)
+    if os.path.samefile(input_dir, output_dir):
+        raise ValueError("The output folder must differ from the watched folder (outputs would be converted again)")
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        done = manifest["files"] if manifest.get("version") == WATCH_VERSION else {}
+    except (OSError, ValueError, KeyError):
+        done = {}  # File name -> {"state", "settings", "outputs"} of its last conversion
+
+    def is_image(name):
+        return name.lower().endswith(IMAGE_EXTENSIONS) and not name.startswith(".")
+
+    def image_of(name):  # Image a changed file belongs to (a sidecar's image), or None
+        if name.endswith(SIDECAR_SUFFIX) and is_image(name[:-len(SIDECAR_SUFFIX)]):
+            return name[:-len(SIDECAR_SUFFIX)]
+        return name if is_image(name) else None
+
+    jobs = jobs or os.cpu_count() or 1
+    settle = 0.0 if once else settle  # Files already there are complete
+    watcher = None if once else open_watcher(input_dir, poll)
+    pool = ProcessPoolExecutor(max_workers=jobs, initializer=ignore_interrupts)
+    pending = {}  # File name -> (state when last seen, time it was first seen in that state)
+    running = {}  # Future -> (file name, source state, settings hash)
+    now = time.monotonic()
+    for name in os.listdir(input_dir):
+        if is_image(name):
+            pending[name] = (file_state(os.path.join(input_dir, name)), now)
+    mode = type(watcher).__name__ if watcher else "once"
+    log(f"Watching {input_dir} ({mode}, {jobs} worker{'s' if jobs > 1 else ''}) -> {output_dir}")
+
+    try:
+        while not (stop and stop()):
+            if watcher is not None:
+                changed = watcher.changes(min(settle / 4, POLL_INTERVAL) if pending or running else POLL_INTERVAL)
+                for name in (os.listdir(input_dir) if changed is None else changed):
+                    name = image_of(name)
+                    if name is not None and name not in pending:
+                        pending[name] = (None, time.monotonic())  # Checked again below until it settles
+
+            now = time.monotonic()
+            busy = {name for name, _, _ in running.values()}
+            for name, (state, since) in list(pending.items()):
+                path = os.path.join(input_dir, name)
+                current = file_state(path)
+                if current is None:
+                    del pending[name]  # Deleted (or renamed away) before it settled
+                elif current != state:
+                    pending[name] = (current, now)  # Still being written
+                elif now - since >= settle and name not in busy:
+                    del pending[name]
+                    try:
+                        settings = image_settings(path, width, height, options, frames, layered)
+                    except (OSError, ValueError) as e:
+                        log(f"FAILED {path}: {e}")
+                        continue
+                    key = settings_hash(*settings)
+                    entry = done.get(name)
+                    if (entry is not None and entry["state"] == list(current) and entry["settings"] == key
+                            and all(os.path.exists(os.path.join(output_dir, p)) for p in entry["outputs"])):
+                        continue  # Outputs are up to date
+                    w, h, file_options, file_frames, file_layered = settings
+                    future = pool.submit(convert_file, path, output_dir, w, h, file_options, file_frames,
+                                         file_layered, results)
+                    running[future] = (name, current, key)
+
+            if running:
+                finished, _ = wait(running, timeout=0 if watcher is not None or pending else None,
+                                   return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, state, key = running.pop(future)
+                    path, outputs, seconds, _, _, error = future.result()
+                    if error:
+                        log(f"FAILED {path} ({seconds:.2f}s): {error}")
+                        continue
+                    done[name] = {"state": list(state), "settings": key,
+                                  "outputs": [os.path.relpath(p, output_dir) for p in outputs]}
+                    write_manifest(manifest_path, {"version": WATCH_VERSION, "input": os.path.abspath(input_dir),
+                                                   "files": done})
+                    log(f"{path} ({seconds:.2f}s) -> {', '.join(outputs)}")
+            elif once and not pending:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if watcher is not None:
+            watcher.close()
+        pool.shutdown(cancel_futures=True)
+    return 0
@@ -0,0 +1,40 @@
+import os  # OS-related functions (path handling, etc.)
+import numpy as np  # Import NumPy for array and numerical calculations
+import pytest
+from PIL import Image  # Import library for image processing
+from pixelart import ConversionCancelled, ConvertOptions, convert_animation
+
+OPTIONS = ConvertOptions(use_lut=False, mcfunction=True)
+
+
+# Four-frame animated GIF with a moving square
+def animated_gif(path):
+    frames = []
+    for n in range(4):
+        rgb = np.full((24, 32, 3), 40, dtype=np.uint8)
+        rgb[4:12, 4 + 5 * n:12 + 5 * n] = (220, 30, 30)
+        frames.append(Image.fromarray(rgb))
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0)
+    return str(path)
+
+
+def test_animation_writes_every_frame_and_manifest(tmp_path):
+    source = animated_gif(tmp_path / "anim.gif")
+    result = convert_animation(source, 32, None, OPTIONS, str(tmp_path / "out"))
+    assert len(result.frames) == 4
+    listed = {entry[kind] for entry in result.frames for kind in ("png", "schematic", "mcfunction")}
+    assert set(os.listdir(tmp_path / "out")) == listed | {os.path.basename(result.manifest_path)}
+
+
+# Cancelling partway (progress raises) or failing on a frame leaves no frame files without a manifest
+@pytest.mark.parametrize("error", [ConversionCancelled, OSError])
+def test_stopped_animation_removes_written_frames(tmp_path, error):
+    source = animated_gif(tmp_path / "anim.gif")
+
+    def progress(fraction):
+        if fraction >= 0.5:
+            raise error()
+
+    with pytest.raises(error):
+        convert_animation(source, 32, None, OPTIONS, str(tmp_path / "out"), progress=progress)
+    assert os.listdir(tmp_path / "out") == []
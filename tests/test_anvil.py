@@ -0,0 +1,92 @@
+import os  # OS-related functions (path handling, etc.)
+import numpy as np  # Import NumPy for array and numerical calculations
+from pixelart import base_colors, compile_palette, write_to_world
+from pixelart.anvil import (REGION_CHUNKS, SECTION_SIZE, _state_key, block_state, decode_chunk, read_region,
+                            unpack_states, write_region)
+
+PALETTE = compile_palette(base_colors)
+REGION_BLOCKS = SECTION_SIZE * REGION_CHUNKS
+DATA_VERSION = 3465
+
+
+# World folder holding one freshly generated, empty region file
+def empty_world(tmp_path):
+    region_dir = tmp_path / "region"
+    region_dir.mkdir()
+    write_region(str(region_dir / "r.0.0.mca"), [None] * REGION_CHUNKS ** 2, np.zeros(REGION_CHUNKS ** 2))
+    return str(tmp_path)
+
+
+# Seeded index grid of visible blocks, with about a third of the pixels air (index 0)
+def random_grid(seed, width, height):
+    rng = np.random.default_rng(seed)
+    solid = np.flatnonzero(PALETTE.block != 0)  # Palette indices that place a block
+    idx = rng.choice(solid, (height, width)).astype(np.uint8)
+    idx[rng.random((height, width)) < 1 / 3] = 0
+    return idx
+
+
+# Block state key at world position (x, y, z), read back from the region files (None for missing chunks)
+def block_at(world_dir, x, y, z):
+    records, _ = read_region(os.path.join(world_dir, "region",
+                                          f"r.{x // REGION_BLOCKS}.{z // REGION_BLOCKS}.mca"))
+    cx, cz = x // SECTION_SIZE, z // SECTION_SIZE
+    record = records[(cx % REGION_CHUNKS) + (cz % REGION_CHUNKS) * REGION_CHUNKS]
+    if record is None:
+        return None
+    chunk = decode_chunk(record)
+    assert (chunk["xPos"][1], chunk["zPos"][1]) == (cx, cz)
+    section = next(s for s in chunk["sections"][1][1] if s["Y"][1] == y >> 4)
+    states = section["block_states"][1]
+    palette = states["palette"][1][1]
+    values = unpack_states(states.get("data", (None, None))[1], len(palette))
+    cell = (y & 15) * SECTION_SIZE * SECTION_SIZE + (z % SECTION_SIZE) * SECTION_SIZE + x % SECTION_SIZE
+    return _state_key(palette[values[cell]])
+
+
+def expected_state(index):
+    return _state_key(block_state(PALETTE.blocks[PALETTE.block[index]]))
+
+
+AIR = _state_key(block_state("minecraft:air"))
+
+
+# Every pixel of the grid lands at (x0 + column, y, z0 + row), across chunk and region borders
+def check_layer(world_dir, idx, origin, previous=None):
+    x0, y, z0 = origin
+    for row in range(idx.shape[0]):
+        for col in range(idx.shape[1]):
+            found = block_at(world_dir, x0 + col, y, z0 + row)
+            if idx[row, col] != 0:
+                assert found == expected_state(idx[row, col])
+            elif previous is not None and previous[row, col] != 0:
+                assert found == expected_state(previous[row, col])  # Air keeps the existing block
+            else:
+                assert found in (None, AIR)
+
+
+def test_write_layer_across_chunk_and_region_borders(tmp_path):
+    world_dir = empty_world(tmp_path)
+    origin = (REGION_BLOCKS - 21, 70, -13)  # The grid spans regions (-1..0, -1..0) and many chunk borders
+    idx = random_grid(0, 45, 38)
+    stats = write_to_world(idx, world_dir, origin, data_version=DATA_VERSION)
+
+    assert sorted(os.listdir(os.path.join(world_dir, "region"))) == ["r.0.-1.mca", "r.0.0.mca", "r.1.-1.mca",
+                                                                     "r.1.0.mca"]
+    assert stats.regions == 4
+    assert stats.blocks == np.count_nonzero(idx)
+    assert stats.created_chunks == stats.chunks
+    check_layer(world_dir, idx, origin)
+    assert block_at(world_dir, origin[0], origin[1] + 1, origin[2]) == AIR  # Other layers stay empty
+
+
+def test_overwrite_keeps_existing_blocks_under_air(tmp_path):
+    world_dir = empty_world(tmp_path)
+    origin = (-7, -60, REGION_BLOCKS - 5)
+    first, second = random_grid(1, 30, 20), random_grid(2, 30, 20)
+    write_to_world(first, world_dir, origin, data_version=DATA_VERSION)
+    stats = write_to_world(second, world_dir, origin, data_version=DATA_VERSION)
+
+    assert stats.created_chunks == 0  # The first grid already created every chunk under the second
+    assert stats.blocks == np.count_nonzero(second)
+    check_layer(world_dir, second, origin, previous=first)
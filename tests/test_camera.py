@@ -0,0 +1,30 @@
+import time  # For letting the live pipeline run
+from pixelart.camera import LIVE_QUEUE_FRAMES, CameraSession, LiveConverter, MockPiCamera
+from pixelart.convert import ConvertOptions
+
+
+# Live capture and conversion against the synthetic camera: frames are converted, every captured frame is
+# converted, dropped or still waiting, and stop() ends both threads
+def test_live_converter_with_mock_camera():
+    seen = []
+    with CameraSession(resolution=(160, 120), camera_factory=MockPiCamera, warmup=0) as session:
+        live = LiveConverter(session, 32, options=ConvertOptions(use_lut=False), on_frame=seen.append)
+        live.start()
+        deadline = time.monotonic() + 10
+        while live.converted < 3 and live.error is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        live.stop()
+
+    assert live.error is None
+    assert not live.running
+    assert live.converted >= 3
+    assert len(seen) == live.converted
+    waiting = live._frames.qsize()
+    assert waiting <= LIVE_QUEUE_FRAMES
+    assert live.captured == live.converted + live.dropped + waiting
+    frame = live.latest
+    assert frame is seen[-1]
+    assert 1 <= frame.number <= live.captured
+    assert frame.rgb.shape == (120, 160, 3)
+    assert frame.result.idx.shape == (24, 32)
+    assert frame.preview.size == (32, 24)
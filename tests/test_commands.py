@@ -0,0 +1,97 @@
+import numpy as np  # Import NumPy for array and numerical calculations
+import pytest
+from pixelart import base_colors, extended_colors
+from pixelart.commands import FILL_LIMIT, write_mcfunction
+from pixelart.compiled import compile_palette
+
+AIR = "minecraft:air"
+
+
+# Block name of every cell of an index array (indices past the palette are air)
+def block_grid(idx, palette):
+    palette = compile_palette(palette)
+    names = np.array(palette.blocks, dtype=object)
+    blocks = np.zeros(idx.shape, dtype=np.int64)
+    inside = idx < len(palette)
+    blocks[inside] = palette.block[idx[inside]]
+    return names[blocks]
+
+
+# Run the commands of a .mcfunction on a grid (None = never written); every command may only touch cells
+# no earlier command touched and at most FILL_LIMIT blocks
+def replay(path, grid):
+    grid = grid.copy()
+    touched = np.zeros(grid.shape, dtype=bool)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            words = line.split()
+            coords = [int(word[1:]) for word in words[1:-1] if word != "~"]
+            if words[0] == "setblock":
+                x0, z0 = x1, z1 = coords
+            else:
+                assert words[0] == "fill"
+                x0, z0, x1, z1 = coords
+            assert x0 <= x1 and z0 <= z1
+            assert (x1 - x0 + 1) * (z1 - z0 + 1) <= FILL_LIMIT
+            area = np.s_[z0:z1 + 1, x0:x1 + 1]
+            assert not touched[area].any()
+            touched[area] = True
+            grid[area] = words[-1]
+    return grid, touched
+
+
+# Random index grid: a large single-color area (split into several /fill commands), noise and air
+def random_idx(seed, palette, shape=(260, 300)):
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(palette), shape)
+    idx[rng.random(shape) < 0.2] = 0
+    idx[10:250, 20:200] = 5
+    idx[0, :] = len(palette) + 1  # Past the palette: air
+    return idx.astype(np.uint16)
+
+
+# The commands place exactly the non-air cells, each with its own block
+@pytest.mark.parametrize("palette", [base_colors, extended_colors])
+def test_commands_build_the_art(tmp_path, palette):
+    idx = random_idx(0, palette)
+    stats = write_mcfunction(idx, str(tmp_path / "art.mcfunction"), palette)
+    expected = block_grid(idx, palette)
+    grid, touched = replay(str(tmp_path / "art.mcfunction"), np.full(idx.shape, None, dtype=object))
+    np.testing.assert_array_equal(touched, expected != AIR)
+    np.testing.assert_array_equal(grid[touched], expected[touched])
+    assert stats.blocks == touched.sum() and stats.fills > 0 and stats.setblocks > 0
+
+
+# A single row longer than FILL_LIMIT is split into several commands
+def test_long_row_is_split(tmp_path):
+    idx = np.full((2, FILL_LIMIT + 1000), 7, dtype=np.uint8)
+    stats = write_mcfunction(idx, str(tmp_path / "row.mcfunction"))
+    grid, touched = replay(str(tmp_path / "row.mcfunction"), np.full(idx.shape, None, dtype=object))
+    assert touched.all() and (grid == block_grid(idx, base_colors)).all()
+    assert stats.fills > 1
+
+
+# A delta on top of previous art turns it into the new art: air where blocks disappear, nothing written
+# where the block stays the same (including different shades of one color)
+@pytest.mark.parametrize("palette", [base_colors, extended_colors])
+def test_delta_turns_previous_into_new(tmp_path, palette):
+    previous = random_idx(1, palette)
+    idx = previous.copy()
+    rng = np.random.default_rng(2)
+    changed = rng.random(idx.shape) < 0.1
+    idx[changed] = rng.integers(0, len(palette), int(changed.sum()))
+    idx[100:140, 50:90] = 0  # Cleared area
+    old, new = block_grid(previous, palette), block_grid(idx, palette)
+    assert (new == AIR).sum() > (old == AIR).sum()
+    stats = write_mcfunction(idx, str(tmp_path / "delta.mcfunction"), palette, previous=previous)
+    grid, touched = replay(str(tmp_path / "delta.mcfunction"), old)
+    np.testing.assert_array_equal(grid, new)
+    np.testing.assert_array_equal(touched, old != new)
+    assert stats.blocks == touched.sum()
+
+
+# Nothing changed: an empty delta
+def test_unchanged_delta_is_empty(tmp_path):
+    idx = random_idx(3, base_colors)
+    stats = write_mcfunction(idx, str(tmp_path / "same.mcfunction"), previous=idx.copy())
+    assert stats.commands == 0 and open(tmp_path / "same.mcfunction").read() == ""
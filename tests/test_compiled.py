@@ -0,0 +1,52 @@
+from collections import Counter
+import numpy as np  # Import NumPy for array and numerical calculations
+from pixelart import base_colors, extended_colors
+from pixelart.blocks import get_block_mapping
+from pixelart.compiled import compile_palette
+from pixelart.palettes import SHADED_BASE_COLORS
+from pixelart.schematic import build_block_palette
+
+
+# Base color index of extended_colors[i]: four shades of each of the first SHADED_BASE_COLORS colors,
+# then the remaining base colors once
+def extended_base(i):
+    return i // 4 if i < 4 * SHADED_BASE_COLORS else SHADED_BASE_COLORS + i - 4 * SHADED_BASE_COLORS
+
+
+def test_base_indices_map_to_their_block():
+    palette = compile_palette(base_colors)
+    mapping = get_block_mapping()
+    assert [palette.blocks[b] for b in palette.block] == [mapping[i] for i in range(len(base_colors))]
+
+
+# Every shade places its base color's block (the placeholders of index 0 stay air)
+def test_shaded_indices_map_to_their_base_block():
+    palette = compile_palette(extended_colors)
+    mapping = get_block_mapping()
+    for i in range(len(extended_colors)):
+        assert palette.blocks[palette.block[i]] == mapping[extended_base(i)], i
+    np.testing.assert_array_equal(palette.base, [extended_base(i) for i in range(len(extended_colors))])
+
+
+# A palette of only some colors (as filter_palette makes) still finds each color's block
+def test_subset_palette_keeps_blocks():
+    mapping = get_block_mapping()
+    indices = list(range(0, len(extended_colors), 7))
+    palette = compile_palette([extended_colors[i] for i in indices])
+    for j, i in enumerate(indices):
+        assert palette.blocks[palette.block[j]] == mapping[extended_base(i)]
+
+
+# Base colors sharing a block get a single entry in the block list and a single schematic palette id
+def test_duplicate_blocks_share_one_id():
+    mapping = get_block_mapping()
+    duplicates = [name for name, count in Counter(mapping.values()).items() if count > 1]
+    assert duplicates  # The custom pinks and the two orange terracottas
+    for colors in (base_colors, extended_colors):
+        palette = compile_palette(colors)
+        assert len(set(palette.blocks)) == len(palette.blocks)
+        names, remap = build_block_palette(np.ones(len(palette), dtype=np.int64), palette)
+        assert len(set(names)) == len(names)
+        for name in duplicates:
+            ids = {remap[i] for i in range(len(palette)) if palette.blocks[palette.block[i]] == name}
+            assert len(ids) == 1 and names[ids.pop()] == name
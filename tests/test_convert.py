@@ -0,0 +1,78 @@
+import os  # OS-related functions (path handling, etc.)
+import numpy as np  # Import NumPy for array and numerical calculations
+import pytest
+from PIL import Image  # Import library for image processing
+from pixelart import ConversionCancelled, ConvertOptions, base_colors, convert, extended_colors
+from pixelart.convert import render_image, render_view
+
+OUTPUT_EXTENSIONS = (".png", ".schem", ".mcfunction")
+VIEW_ZOOMS = (1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32)  # The result viewer's zoom levels
+
+
+# Small random RGB test image
+def random_image(seed, size=(40, 30)):
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8))
+
+
+# Cancelling while the .mcfunction is written leaves no output at all, in memory and in streaming mode
+@pytest.mark.parametrize("streaming", [False, True])
+def test_cancel_during_commands_leaves_no_outputs(tmp_path, streaming):
+    options = ConvertOptions(use_lut=False, mcfunction=True, streaming=streaming)
+
+    def progress(stage, fraction):
+        if stage == "commands":
+            raise ConversionCancelled()
+
+    with pytest.raises(ConversionCancelled):
+        convert(random_image(0), 32, None, options, str(tmp_path / "out.png"), "out", progress=progress)
+    assert os.listdir(tmp_path) == []
+
+
+# A failed conversion keeps the outputs of the previous one as they were, not a mix of both
+@pytest.mark.parametrize("streaming", [False, True])
+def test_cancel_keeps_existing_outputs(tmp_path, streaming):
+    options = ConvertOptions(use_lut=False, mcfunction=True, streaming=streaming)
+    first = convert(random_image(1), 32, None, options, str(tmp_path / "out.png"), "out")
+    paths = [first.png_path, first.schematic_path, first.function_path]
+    assert sorted(os.path.splitext(path)[1] for path in paths) == sorted(OUTPUT_EXTENSIONS)
+    before = {path: open(path, "rb").read() for path in paths}
+
+    def progress(stage, fraction):
+        if stage == "commands":
+            raise ConversionCancelled()
+
+    with pytest.raises(ConversionCancelled):
+        convert(random_image(2), 32, None, options, str(tmp_path / "out.png"), "out", progress=progress)
+    assert {path: open(path, "rb").read() for path in paths} == before
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in paths)
+
+
+# The screen pixels of a view: render_image scaled up with NEAREST (or every n-th block when zoomed out),
+# then cropped to the view (slicing clips it to the zoomed image)
+def reference_view(idx, palette, left, top, width, height, zoom):
+    full = render_image(idx, palette)
+    if zoom >= 1:
+        zoomed = np.asarray(full.resize((full.width * zoom, full.height * zoom), Image.Resampling.NEAREST))
+    else:
+        step = round(1 / zoom)
+        zoomed = np.asarray(full)[::step, ::step]
+    return zoomed[top:top + height, left:left + width]
+
+
+# render_view shows exactly the part of the scaled result under the view, for views inside the image, past
+# its right and bottom edges or entirely outside it, zoomed in and out
+@pytest.mark.parametrize("palette", [base_colors, extended_colors])
+def test_render_view_matches_scaled_image(palette):
+    rng = np.random.default_rng(3)
+    for _ in range(450):
+        height, width = rng.integers(1, 60, 2)
+        idx = rng.integers(0, len(palette), (height, width)).astype(np.uint8)
+        zoom = VIEW_ZOOMS[rng.integers(len(VIEW_ZOOMS))]
+        zoomed_w, zoomed_h = int(np.ceil(width * zoom)), int(np.ceil(height * zoom))
+        left, top = (int(rng.integers(0, size + 10)) for size in (zoomed_w, zoomed_h))
+        view_w, view_h = (int(rng.integers(0, size + 20)) for size in (zoomed_w, zoomed_h))
+        view = np.asarray(render_view(idx, palette, left, top, view_w, view_h, zoom))
+        expected = reference_view(idx, palette, left, top, view_w, view_h, zoom)
+        assert view.shape == expected.shape, (width, height, left, top, view_w, view_h, zoom)
+        np.testing.assert_array_equal(view, expected)
@@ -0,0 +1,59 @@
+import numpy as np  # Import NumPy for array and numerical calculations
+import pytest
+from pixelart import base_colors, extended_colors
+from pixelart.compiled import compile_palette
+from pixelart.dither import DIFFUSION_KERNELS, ORDERED_METHODS, dither_image, dither_pixels
+
+PALETTES = {"base_colors": base_colors, "extended_colors": extended_colors}
+
+
+# Seeded random RGBA image with about a quarter of its pixels fully transparent
+def random_rgba(seed, width=29, height=23):
+    rng = np.random.default_rng(seed)
+    rgba = rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+    rgba[..., 3] = np.where(rng.random((height, width)) < 0.25, 0, 255)
+    return rgba
+
+
+# Plain scanline error diffusion, one pixel at a time: transparent pixels are air and pass no error on,
+# error sent past the edges is dropped
+def reference_diffusion(rgba, palette, method):
+    offsets, divisor = DIFFUSION_KERNELS[method]
+    palette = compile_palette(palette)
+    matcher = palette.matcher()
+    h, w = rgba.shape[:2]
+    error = np.zeros((h, w, 3))
+    idx = np.zeros((h, w), dtype=np.int64)
+    for y in range(h):
+        for x in range(w):
+            if rgba[y, x, 3] == 0:
+                continue
+            color = rgba[y, x, :3] + error[y, x]
+            nearest = int(matcher.nearest(np.clip(np.rint(color), 0, 255).astype(np.uint8)[None])[0])
+            idx[y, x] = nearest
+            for dx, dy, weight in offsets:
+                if 0 <= x + dx < w and y + dy < h:
+                    error[y + dy, x + dx] += (color - palette.rgb[nearest]) * weight / divisor
+    return idx
+
+
+@pytest.mark.parametrize("name", PALETTES)
+@pytest.mark.parametrize("method", DIFFUSION_KERNELS)
+@pytest.mark.parametrize("seed", [0, 1])
+def test_wavefront_diffusion_matches_scanline(name, method, seed):
+    rgba = random_rgba(seed)
+    np.testing.assert_array_equal(dither_image(rgba, PALETTES[name], method),
+                                  reference_diffusion(rgba, PALETTES[name], method))
+
+
+# Ordered dithering gives the same indices on every run and for every strip split, and dither_pixels
+# agrees with it pixel by pixel
+@pytest.mark.parametrize("method", ORDERED_METHODS)
+def test_ordered_dither_is_deterministic(method):
+    rgba = random_rgba(2, 70, 45)
+    first = dither_image(rgba, extended_colors, method)
+    np.testing.assert_array_equal(dither_image(rgba.copy(), extended_colors, method), first)
+    strips = [dither_image(rgba[y0:y0 + 16], extended_colors, method, origin=(0, y0)) for y0 in range(0, 45, 16)]
+    np.testing.assert_array_equal(np.vstack(strips), first)
+    ys, xs = np.nonzero(rgba[..., 3])
+    np.testing.assert_array_equal(dither_pixels(rgba[ys, xs], ys, xs, extended_colors, method), first[ys, xs])
@@ -0,0 +1,81 @@
+import numpy as np  # Import NumPy for array and numerical calculations
+import pytest
+from pixelart import BLOCK_CATEGORIES, base_colors, extended_colors, filter_palette, quantize_image
+from pixelart.blocks import get_block_mapping
+from pixelart.cli import main
+from pixelart.compiled import compile_palette
+from pixelart.filters import PLACEHOLDER, allowed_base_colors
+
+PALETTES = {"base_colors": base_colors, "extended_colors": extended_colors}
+
+
+# Blocks of a set of base color indices
+def blocks_of(indices):
+    mapping = get_block_mapping()
+    return {mapping[k] for k in indices}
+
+
+def test_include_category():
+    assert blocks_of(allowed_base_colors(["wool"])) == set(BLOCK_CATEGORIES["wool"])
+
+
+# Exclusions take categories, full block ids and ids without the minecraft: prefix
+def test_exclude_categories_and_blocks():
+    allowed = allowed_base_colors(None, ["precious", "minecraft:tnt", "Sand"])
+    every_block = set(get_block_mapping().values()) - {"minecraft:air"}
+    assert blocks_of(allowed) == every_block - set(BLOCK_CATEGORIES["precious"]) - {"minecraft:tnt", "minecraft:sand"}
+
+
+def test_include_and_exclude():
+    allowed = allowed_base_colors(["terracotta", "sand", "wool"], ["wool", "orange_terracotta"])
+    expected = set(BLOCK_CATEGORIES["terracotta"]) - {"minecraft:orange_terracotta"} | {"minecraft:sand"}
+    assert blocks_of(allowed) == expected
+
+
+@pytest.mark.parametrize("include, exclude", [(["sandd"], ()), (None, ["wool", "minecraft:nope"]), (["woolen"], ())])
+def test_unknown_name_raises(include, exclude):
+    with pytest.raises(ValueError, match="Unknown block or category"):
+        allowed_base_colors(include, exclude)
+    with pytest.raises(ValueError, match="Unknown block or category"):
+        filter_palette(base_colors, include, exclude)
+
+
+# The command line reports an unknown block before converting anything
+def test_cli_rejects_unknown_block(capsys):
+    assert main(["--exclude", "sandd", "missing.png"]) == 2
+    assert "Unknown block or category 'sandd'" in capsys.readouterr().err
+
+
+def test_filter_leaving_nothing_raises():
+    with pytest.raises(ValueError, match="no colors"):
+        filter_palette(base_colors, ["sand"], ["gravity"])
+
+
+# Filtered palettes keep the indices of the remaining colors and replace the others by placeholders;
+# the same filter gives the same list object
+@pytest.mark.parametrize("name", PALETTES)
+def test_filter_keeps_indices(name):
+    palette = PALETTES[name]
+    filtered = filter_palette(palette, None, ["wool", "nether"])
+    assert filter_palette(palette, None, ["wool", "nether"]) is filtered
+    assert filter_palette(palette) is palette
+    compiled = compile_palette(palette)
+    allowed = allowed_base_colors(None, ["wool", "nether"])
+    for i, color in enumerate(palette):
+        kept = compiled.valid[i] and compiled.base[i] in allowed
+        assert filtered[i] == (tuple(color) if kept else PLACEHOLDER)
+
+
+# Quantizing against a filtered palette never places an excluded block
+@pytest.mark.parametrize("name", PALETTES)
+@pytest.mark.parametrize("include, exclude", [(None, ["wool", "terracotta", "precious"]), (["wool", "stone"], ())])
+def test_quantize_never_uses_excluded_blocks(name, include, exclude):
+    palette = filter_palette(PALETTES[name], include, exclude)
+    allowed = blocks_of(allowed_base_colors(include, exclude)) | {"minecraft:air"}
+    rgba = np.random.default_rng(0).integers(0, 256, (60, 80, 4), dtype=np.uint8)
+    rgba[..., 3] = 255
+    idx = quantize_image(rgba, palette)
+    compiled = compile_palette(palette)
+    used = {compiled.blocks[b] for b in compiled.block[np.unique(idx)]}
+    assert used <= allowed and len(used) > 1
+    assert not np.isin(np.unique(idx), np.flatnonzero(~compiled.valid)).any()  # No placeholder is matched
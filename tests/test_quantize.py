@@ -0,0 +1,54 @@
+import numpy as np  # Import NumPy for array and numerical calculations
+import pytest
+from PIL import Image  # Import library for image processing
+from scipy.spatial import KDTree
+from pixelart import base_colors, extended_colors, quantize_image
+from pixelart.lut import load_lut
+
+PALETTES = {"base_colors": base_colors, "extended_colors": extended_colors}
+
+# The reference loop reads pixels exactly as the original code did, through Image.getdata
+pytestmark = pytest.mark.filterwarnings("ignore:Image.Image.getdata is deprecated:DeprecationWarning")
+
+
+# Seeded random RGBA image with about a quarter of its pixels fully transparent
+def random_image(seed, width=67, height=41):
+    rng = np.random.default_rng(seed)
+    rgba = rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+    rgba[..., 3] = np.where(rng.random((height, width)) < 0.25, 0, rgba[..., 3] | 1)
+    return Image.fromarray(rgba, "RGBA")
+
+
+# The original per-pixel loop: one KDTree query per visible pixel, air (0) for fully transparent ones
+def reference_indices(img, palette):
+    tree = KDTree(np.array(palette))
+    idx_array = []
+    for r, g, b, a in img.getdata():
+        if a == 0:
+            idx_array.append(0)
+        else:
+            _, idx = tree.query((r, g, b))
+            idx_array.append(int(idx))
+    return np.array(idx_array).reshape(img.height, img.width)
+
+
+# Lookup tables are built once for the module, away from the user's cache
+@pytest.fixture(scope="module")
+def cache_dir(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("luts"))
+
+
+@pytest.mark.parametrize("name", PALETTES)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_quantize_matches_per_pixel_kdtree(name, seed):
+    img = random_image(seed)
+    np.testing.assert_array_equal(quantize_image(img, PALETTES[name]), reference_indices(img, PALETTES[name]))
+
+
+@pytest.mark.parametrize("name", PALETTES)
+def test_lut_matches_per_pixel_kdtree(name, cache_dir):
+    palette = PALETTES[name]
+    lut = load_lut(palette, cache_dir)
+    for seed in (3, 4):
+        img = random_image(seed)
+        np.testing.assert_array_equal(quantize_image(img, palette, lut=lut), reference_indices(img, palette))
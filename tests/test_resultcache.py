@@ -0,0 +1,84 @@
+import os  # OS-related functions (path handling, etc.)
+import numpy as np  # Import NumPy for array and numerical calculations
+from PIL import Image  # Import library for image processing
+from pixelart import ConvertOptions, ResultCache, convert
+
+OPTIONS = ConvertOptions(use_lut=False, mcfunction=True)
+
+
+# Seeded random RGB image saved as a PNG
+def save_image(path, seed, size=(40, 30)):
+    rng = np.random.default_rng(seed)
+    Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)).save(path)
+    return str(path)
+
+
+# Convert source through cache into out_dir; returns the result
+def cached_convert(cache, source, out_dir, options=OPTIONS):
+    os.makedirs(out_dir, exist_ok=True)
+    return convert(source, 32, None, options, os.path.join(out_dir, "art.png"), "art", results=cache)
+
+
+def test_hit_after_miss(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    source = save_image(tmp_path / "a.png", 0)
+    first = cached_convert(cache, source, tmp_path / "first")
+    assert (cache.hits, cache.misses) == (0, 1)
+    second = cached_convert(cache, source, tmp_path / "second")
+    assert (cache.hits, cache.misses) == (1, 1)
+    np.testing.assert_array_equal(np.asarray(second.idx), first.idx)
+    for path in ("png_path", "schematic_path", "function_path"):
+        assert open(getattr(second, path), "rb").read() == open(getattr(first, path), "rb").read()
+    assert second.command_stats == first.command_stats
+
+
+# Other options or other pixels under the same file name are new conversions
+def test_miss_when_options_or_pixels_change(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    source = save_image(tmp_path / "a.png", 0)
+    cached_convert(cache, source, tmp_path / "out")
+    cached_convert(cache, source, tmp_path / "out", ConvertOptions(use_lut=False, mcfunction=True, dither="bayer4"))
+    assert (cache.hits, cache.misses) == (0, 2)
+    save_image(tmp_path / "a.png", 1)
+    cached_convert(cache, source, tmp_path / "out")
+    assert (cache.hits, cache.misses) == (0, 3)
+    cached_convert(cache, source, tmp_path / "out", ConvertOptions(use_lut=False, mcfunction=True, memory_limit=1))
+    assert (cache.hits, cache.misses) == (1, 3)  # memory_limit does not change the output
+    assert len(cache.entries()) == 3
+
+
+# A cached file changed after it was stored (such as through a hard-linked output) is never returned
+def test_modified_cached_file_is_rejected(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    source = save_image(tmp_path / "a.png", 0)
+    first = cached_convert(cache, source, tmp_path / "first")
+    converted = open(first.png_path, "rb").read()
+    (entry,) = cache.entries()
+    with open(os.path.join(entry.path, "image.png"), "ab") as f:
+        f.write(b"changed")
+    second = cached_convert(cache, source, tmp_path / "second")
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert open(second.png_path, "rb").read() == converted  # Converted again
+    assert len(cache.entries()) == 1  # The changed entry was replaced by the new conversion
+
+
+# Least recently used entries go first once the cache is larger than its limit
+def test_eviction_under_max_bytes(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    sources = [save_image(tmp_path / f"{n}.png", n) for n in range(3)]
+    for n, source in enumerate(sources):
+        cached_convert(cache, source, tmp_path / "out")
+        (entry,) = [entry for entry in cache.entries() if entry.source == source]
+        os.utime(os.path.join(entry.path, "meta.json"), (1000 + n, 1000 + n))  # Stored in this order
+    cached_convert(cache, sources[0], tmp_path / "out")  # A hit makes the oldest entry the newest
+    assert cache.hits == 1
+    entries = cache.entries()
+    assert [entry.source for entry in entries] == [sources[1], sources[2], sources[0]]
+
+    total = cache.total_size()
+    assert cache.evict(total - entries[0].size) == 1
+    assert [entry.source for entry in cache.entries()] == [sources[2], sources[0]]
+
+    small = ResultCache(str(tmp_path / "cache"), max_bytes=entries[0].size * 3 // 2)
+    cached_convert(small, save_image(tmp_path / "3.png", 3), tmp_path / "out")  # Storing evicts down to the limit
+    assert len(small.entries()) == 1 and small.entries()[0].source == str(tmp_path / "3.png")
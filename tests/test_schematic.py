@@ -0,0 +1,85 @@
+import numpy as np  # Import NumPy for array and numerical calculations
+import nbtlib  # Reads the written schematics back
+import pytest
+from pixelart import base_colors, extended_colors
+from pixelart.compiled import compile_palette
+from pixelart.schematic import build_block_palette, create_schematic_from_idx_matrix, encode_varints
+
+PALETTES = {"base": base_colors, "shaded": extended_colors}
+
+
+# Plain one-value-at-a-time varint encoder the vectorized one must match
+def reference_varints(values):
+    out = bytearray()
+    for value in values:
+        while True:
+            byte = value & 0x7F
+            value >>= 7
+            out.append(byte | (0x80 if value else 0))
+            if not value:
+                break
+    return bytes(out)
+
+
+# Decode a BlockData varint byte string back to ids
+def decode_varints(data):
+    values, value, shift = [], 0, 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            values.append(value)
+            value, shift = 0, 0
+    return values
+
+
+# Block id of every cell of a single-layer schematic as a (length, width) array of names
+def schematic_blocks(path):
+    schematic = nbtlib.load(path)
+    assert int(schematic["Height"]) == 1
+    names = {int(block_id): str(name) for name, block_id in schematic["Palette"].items()}
+    ids = decode_varints(np.asarray(schematic["BlockData"], dtype=np.int8).view(np.uint8))
+    width, length = int(schematic["Width"]), int(schematic["Length"])
+    return np.array([names[i] for i in ids], dtype=object).reshape(length, width), set(names.values())
+
+
+@pytest.mark.parametrize("values", [
+    [0, 1, 127],
+    [0, 127, 128, 255, 300, 16383, 16384, 2097151, 2097152, 268435455, 268435456, 2 ** 31 - 1],
+    list(np.random.default_rng(0).integers(0, 1 << 20, 1000)),
+])
+def test_encode_varints_matches_reference(values):
+    encoded = encode_varints(values).tobytes()
+    assert encoded == reference_varints(int(v) for v in values)
+    assert decode_varints(encoded) == [int(v) for v in values]
+
+
+# Shades of one color share an id, air is id 0 and only counted indices get a palette entry
+@pytest.mark.parametrize("name", PALETTES)
+def test_build_block_palette(name):
+    palette = compile_palette(PALETTES[name])
+    counts = np.zeros(len(palette) + 3, dtype=np.int64)  # Indices past the palette count as air
+    counts[1:len(palette):3] = 1
+    counts[-1] = 1
+    names, remap = build_block_palette(counts, palette)
+    assert names[0] == "minecraft:air" and len(set(names)) == len(names)
+    for i in np.flatnonzero(counts):
+        block = palette.blocks[palette.block[i]] if i < len(palette) else "minecraft:air"
+        assert names[remap[i]] == block
+
+
+# The native writer and the original mcschematic writer place the same block in every cell; the output is
+# wider than 128 blocks
+@pytest.mark.parametrize("name", PALETTES)
+def test_native_writer_matches_mcschematic(tmp_path, name):
+    pytest.importorskip("mcschematic")
+    palette = PALETTES[name]
+    idx = np.random.default_rng(1).integers(0, len(palette), (37, 150)).astype(np.uint8)
+    output_path = str(tmp_path / "art.png")
+    native = create_schematic_from_idx_matrix(idx, output_path, "native", "native", palette=palette)
+    original = create_schematic_from_idx_matrix(idx, output_path, "original", "mcschematic", palette=palette)
+    native_blocks, native_names = schematic_blocks(native)
+    original_blocks, original_names = schematic_blocks(original)
+    assert native_names == original_names and len(native_names) > 1
+    assert native_blocks.shape == (37, 150)
+    assert (native_blocks == original_blocks).all()
@@ -0,0 +1,113 @@
+import http.client  # For talking to the server over localhost
+import io
+import json  # For the metrics endpoint
+import threading  # The server runs on its own thread
+import zipfile  # For reading zip responses
+import numpy as np  # Import NumPy for array and numerical calculations
+import pytest
+from PIL import Image  # Import library for image processing
+from pixelart import ConversionServer, ConvertOptions
+from pixelart.server import request_options
+
+
+# Server on a free localhost port with one worker and no queue, so one more conversion is rejected
+@pytest.fixture(scope="module")
+def server():
+    server = ConversionServer(("127.0.0.1", 0), jobs=1, queue_size=0, defaults=ConvertOptions(use_lut=False))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+# Small PNG upload
+def png_bytes():
+    rgba = np.random.default_rng(0).integers(0, 256, (12, 16, 4), dtype=np.uint8)
+    rgba[..., 3] = 255
+    buffer = io.BytesIO()
+    Image.fromarray(rgba, "RGBA").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+# (status, headers, body) of one request
+def request(server, method, path, body=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=60)
+    try:
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def test_convert_every_format(server):
+    upload = png_bytes()
+    status, headers, body = request(server, "POST", "/convert?width=8&format=zip&mcfunction=1", upload)
+    assert status == 200 and headers["Content-Type"] == "application/zip"
+    names = zipfile.ZipFile(io.BytesIO(body)).namelist()
+    assert sorted(name.rsplit(".", 1)[1] for name in names) == ["mcfunction", "png", "schem"]
+
+    status, headers, body = request(server, "POST", "/convert?width=8&format=png", upload)
+    assert status == 200 and headers["Content-Type"] == "image/png"
+    assert Image.open(io.BytesIO(body)).size == (8, 6)
+
+    status, _, body = request(server, "POST", "/convert?width=8&format=schematic", upload)
+    assert status == 200 and body[:2] == b"\x1f\x8b"  # gzip-compressed NBT
+
+    status, _, body = request(server, "POST", "/convert?width=8&format=mcfunction", upload)
+    assert status == 200 and b"fill" in body
+
+
+# The zip holds a schematic unless the server's defaults or the request turn it off, like the .mcfunction
+def test_zip_follows_schematic_option():
+    for defaults, params, expected in ((ConvertOptions(), {}, True), (ConvertOptions(schematic=False), {}, False),
+                                       (ConvertOptions(), {"schematic": ["0"]}, False),
+                                       (ConvertOptions(schematic=False), {"schematic": ["1"]}, True)):
+        assert request_options({"format": ["zip"], **params}, defaults)[2].schematic is expected
+    schematic_only = request_options({"format": ["schematic"]}, ConvertOptions(schematic=False))[2]
+    assert schematic_only.schematic and not schematic_only.mcfunction
+    assert not request_options({"format": ["png"]}, ConvertOptions())[2].schematic
+
+
+def test_zip_without_schematic(server):
+    status, _, body = request(server, "POST", "/convert?width=8&schematic=0", png_bytes())
+    assert status == 200
+    assert [name.rsplit(".", 1)[1] for name in zipfile.ZipFile(io.BytesIO(body)).namelist()] == ["png"]
+
+
+def test_non_image_is_rejected(server):
+    status, _, body = request(server, "POST", "/convert?width=8", b"not an image")
+    assert status == 400
+    assert "not an image" in json.loads(body)["error"]
+
+
+# With every worker and queue place taken, uploads are turned away with an estimate of when to retry
+def test_full_queue_answers_429(server):
+    taken = 0
+    while server.admit():
+        taken += 1
+    try:
+        status, headers, _ = request(server, "POST", "/convert?width=8", png_bytes())
+    finally:
+        for _ in range(taken):
+            server.release()
+    assert status == 429
+    assert int(headers["Retry-After"]) >= 1
+
+
+def test_metrics(server):
+    before = json.loads(request(server, "GET", "/metrics")[2])["requests"]
+    request(server, "POST", "/convert?width=8&format=png", png_bytes())
+    request(server, "POST", "/convert?width=8", b"not an image")
+    status, headers, body = request(server, "GET", "/metrics")
+    assert status == 200 and headers["Content-Type"].startswith("application/json")
+    metrics = json.loads(body)
+    after = metrics["requests"]
+    assert after["accepted"] - before["accepted"] == 1  # The invalid upload is only counted as invalid
+    assert after["completed"] - before["completed"] == 1
+    assert after["invalid"] - before["invalid"] == 1
+    assert after["accepted"] == after["completed"] + after["failed"]
+    assert metrics["workers"] == 1 and metrics["queued"] == 0
+    assert {"queue", "request", "quantize"} <= set(metrics["stages"])
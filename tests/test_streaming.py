@@ -0,0 +1,46 @@
+import numpy as np  # Import NumPy for array and numerical calculations
+import pytest
+from PIL import Image  # Import library for image processing
+from pixelart import ConvertOptions, convert, convert_streaming
+from pixelart.convert import resize_box
+from pixelart.streaming import nearest_indices, strip_rows
+
+MEMORY_LIMIT = 30000  # Small enough for strips of a few rows
+
+
+# Odd-sized seeded RGBA source image with random transparency, saved as a PNG
+@pytest.fixture(scope="module")
+def source(tmp_path_factory):
+    rgba = np.random.default_rng(0).integers(0, 256, (77, 101, 4), dtype=np.uint8)
+    path = str(tmp_path_factory.mktemp("source") / "source.png")
+    Image.fromarray(rgba, "RGBA").save(path)
+    return path
+
+
+# The resampling tables pick the same source pixel as PIL's NEAREST resize, with and without a crop box
+@pytest.mark.parametrize("size", [(101, 77), (37, 29), (250, 13), (1, 1)])
+@pytest.mark.parametrize("crop", [False, True])
+def test_nearest_indices_match_pil(size, crop):
+    src_w, src_h = 101, 77
+    coords = np.indices((src_h, src_w))
+    img = Image.fromarray((coords[0] * 256 + coords[1]).astype(np.int32), "I")  # Pixel value = its position
+    box = resize_box((src_w, src_h), *size, crop)
+    resized = np.asarray(img.resize(size, Image.Resampling.NEAREST, box=box))
+    rows = nearest_indices(src_h, size[1], box[1], box[3])
+    cols = nearest_indices(src_w, size[0], box[0], box[2])
+    np.testing.assert_array_equal(resized, rows[:, None] * 256 + cols[None, :])
+
+
+# Strip by strip conversion gives the same indices and PNG file as the in-memory conversion
+@pytest.mark.parametrize("crop", [False, True])
+@pytest.mark.parametrize("dither", ["none", "bayer4"])
+@pytest.mark.parametrize("width, height", [(37, 29), (55, None), (150, 47)])
+def test_streaming_matches_convert(tmp_path, source, crop, dither, width, height):
+    options = ConvertOptions(use_lut=False, crop=crop, dither=dither, schematic=False)
+    expected = convert(source, width, height, options, str(tmp_path / "memory.png"))
+    out_h, out_w = expected.idx.shape
+    assert strip_rows((101, 77), out_w, out_h, MEMORY_LIMIT) * 2 < out_h  # Several strips
+    options.memory_limit = MEMORY_LIMIT
+    result = convert_streaming(source, width, height, options, str(tmp_path / "streamed.png"))
+    np.testing.assert_array_equal(np.asarray(result.idx), expected.idx)
+    assert open(result.png_path, "rb").read() == open(expected.png_path, "rb").read()
@@ -0,0 +1,75 @@
+import json  # For reading the manifest
+import os  # OS-related functions (path handling, etc.)
+import numpy as np  # Import NumPy for array and numerical calculations
+from PIL import Image  # Import library for image processing
+from pixelart import ConvertOptions, convert_tiled
+from pixelart.tiles import OUTPUT_KEYS, tile_hash
+
+OPTIONS = ConvertOptions(use_lut=False, mcfunction=True)
+
+
+# Seeded random RGB image saved as a PNG
+def save_image(path, seed=0, size=(90, 70)):
+    rgb = np.random.default_rng(seed).integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    Image.fromarray(rgb).save(path)
+    return str(path)
+
+
+# Output files listed in a manifest
+def listed_files(manifest_path):
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    return {tile[key] for tile in manifest["tiles"] for key in OUTPUT_KEYS if tile[key]}
+
+
+def test_tile_hash():
+    rgba = np.random.default_rng(0).integers(0, 256, (16, 16, 4), dtype=np.uint8)
+    first = tile_hash(rgba, 16, 32, OPTIONS)
+    assert tile_hash(rgba.copy(), 16, 32, ConvertOptions(use_lut=False, mcfunction=True)) == first
+    assert tile_hash(rgba, 16, 32, ConvertOptions(use_lut=True, mcfunction=True)) == first  # Same output
+    changed = rgba.copy()
+    changed[3, 4, 0] ^= 1
+    assert tile_hash(changed, 16, 32, OPTIONS) != first
+    assert tile_hash(rgba, 32, 32, OPTIONS) != first  # Ordered dithering depends on the position
+    assert tile_hash(rgba, 16, 32, ConvertOptions(use_lut=False, dither="bayer4", mcfunction=True)) != first
+    assert tile_hash(rgba, 16, 32, ConvertOptions(use_lut=False, exclude_blocks=("wool",),
+                                                  mcfunction=True)) != first
+
+
+# Unchanged tiles are kept as they are, a changed region only rebuilds the tiles it touches
+def test_unchanged_tiles_are_reused(tmp_path):
+    source = save_image(tmp_path / "a.png")
+    out = str(tmp_path / "tiles")
+    first = convert_tiled(source, None, None, OPTIONS, out, "art", tile_size=32, jobs=1)
+    assert (first.rendered, first.reused) == (9, 0)
+    times = {name: os.stat(os.path.join(out, name)).st_mtime_ns for name in listed_files(first.manifest_path)}
+
+    second = convert_tiled(source, None, None, OPTIONS, out, "art", tile_size=32, jobs=1)
+    assert (second.rendered, second.reused) == (0, 9)
+    assert second.tiles == first.tiles
+    assert {name: os.stat(os.path.join(out, name)).st_mtime_ns for name in times} == times
+
+    rgb = np.asarray(Image.open(source)).copy()
+    rgb[40:50, 70:80] = 255 - rgb[40:50, 70:80]  # Inside the tile at row 1, column 2
+    Image.fromarray(rgb).save(source)
+    third = convert_tiled(source, None, None, OPTIONS, out, "art", tile_size=32, jobs=1)
+    assert (third.rendered, third.reused) == (1, 8)
+    changed = [(a["row"], a["col"]) for a, b in zip(first.tiles, third.tiles) if a["hash"] != b["hash"]]
+    assert changed == [(1, 2)]
+
+    forced = convert_tiled(source, None, None, OPTIONS, out, "art", tile_size=32, jobs=1, force=True)
+    assert (forced.rendered, forced.reused) == (9, 0)
+
+
+# Rendering a smaller grid into the same folder leaves only the tiles of the new manifest
+def test_smaller_grid_removes_old_tiles(tmp_path):
+    source = save_image(tmp_path / "a.png")
+    out = str(tmp_path / "tiles")
+    first = convert_tiled(source, None, None, OPTIONS, out, "art", tile_size=32, jobs=1)
+    assert len(os.listdir(out)) == 9 * 3 + 1
+    (tmp_path / "tiles" / "notes.txt").write_text("kept")  # Files the manifest never listed stay
+
+    second = convert_tiled(source, 40, None, OPTIONS, out, "art", tile_size=32, jobs=1)
+    assert len(second.tiles) == 2 and second.reused == 0
+    expected = listed_files(second.manifest_path) | {os.path.basename(first.manifest_path), "notes.txt"}
+    assert set(os.listdir(out)) == expected